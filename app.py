@@ -1,57 +1,288 @@
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, Response
+from flask import (Blueprint, Flask, Request, abort, current_app, g, render_template, request, jsonify, flash,
+                   redirect, url_for, Response, stream_with_context)
 from werkzeug.utils import secure_filename
 import os
+import logging
+import metrics
 from interview_system import InterviewSystem
+from job_queue import JobQueue, WorkerPool
+from meeting_pool import MeetingPool, MeetingProvisioner
+from batch_analysis import BatchAnalysis, RESUME_EXTENSIONS
+from slot_events import SlotEventRelay, SlotStreamServer
+from leader import LeaderElection
+from scheduler import Scheduler
+from campaigns import CampaignEngine, default_campaigns
+from booking_pipeline import (BOOKING_JOB, booking_hold_seconds, enqueue_booking, enqueue_teardown,
+                              make_booking_handlers, booking_status, stage_resume, discard_resume)
 from config import *
 import threading
 import time
 from datetime import datetime
 import json
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, Optional, Union
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = SECRET_KEY
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+logger = logging.getLogger(__name__)
 
-# Ensure upload folder exists
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+class UploadRequest(Request):
+    """Request whose body limit is raised for cohort uploads to /analyze_batch."""
 
-# Initialize interview system
-interview_system = InterviewSystem()
+    @property
+    def max_content_length(self) -> Optional[int]:
+        if self.endpoint == 'main.analyze_batch':
+            return BATCH_MAX_BYTES
+        return super().max_content_length
 
-# Background task for checking cancellations
-def check_cancellations_background():
-    while True:
-        try:
-            interview_system.check_cancellations()
-            time.sleep(30)
-        except Exception as e:
-            print(f"Error in cancellation checker: {e}")
-            time.sleep(30)
+class AppServices:
+    """
+    The subsystems behind the web app, each built on first use.
+
+    Nothing is constructed when the app is created, so a test or script
+    that never touches bookings never opens a database or starts a thread.
+    start() is what a serving worker calls: it starts the booking job
+    workers and enters the election for background services, whose winner
+    runs start_background_services().
+
+    Attributes:
+        started (bool): Whether start() has run
+        job_workers (WorkerPool): Booking pipeline workers, once started
+        leader_election (LeaderElection): Election for background services, once started
+        slot_event_relay (SlotEventRelay): Feed of every worker's slot changes to the elected worker's stream, or None
+        slot_stream (SlotStreamServer): SSE server of the elected worker, or None
+        cancellation_listener (CancellationListener): IMAP listener of the elected worker, or None
+        meeting_provisioner (MeetingProvisioner): Meeting pool refiller of the elected worker, or None
+    """
+
+    def __init__(self):
+        self.started = False
+        self.job_workers = None
+        self.leader_election = None
+        self.slot_event_relay = None
+        self.slot_stream = None
+        self.cancellation_listener = None
+        self.meeting_provisioner = None
+        self._instances = {}
+        self._lock = threading.RLock()
+
+    def _get(self, name: str, factory: Callable[[], object]):
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._instances[name] = factory()
+        return instance
+
+    @property
+    def meeting_pool(self) -> Optional[MeetingPool]:
+        if not MEETING_POOL_ENABLED:
+            return None
+        return self._get('meeting_pool', lambda: MeetingPool(BOOKINGS_DB))
+
+    @property
+    def interview_system(self) -> InterviewSystem:
+        return self._get('interview_system', lambda: InterviewSystem(meeting_pool=self.meeting_pool))
+
+    @property
+    def job_queue(self) -> JobQueue:
+        return self._get('job_queue', lambda: JobQueue(JOBS_DB))
+
+    @property
+    def scheduler(self) -> Scheduler:
+        # Periodic jobs; the elected worker runs them and each job's lease row keeps it single-run
+        return self._get('scheduler', lambda: Scheduler(JOBS_DB, tick=SCHEDULER_TICK_SECONDS))
+
+    def start(self) -> None:
+        """Start the booking workers and the leader election. Safe to call more than once."""
+        with self._lock:
+            if self.started:
+                return
+            self.started = True
+        interview_system = self.interview_system
+        # Fork the PDF sandbox processes before any background thread starts
+        interview_system.pdf_extractor.start()
+
+        if METRICS_DIR:
+            metrics.start_exporter(METRICS_DIR, METRICS_EXPORT_SECONDS)
+
+        # Worker pool running the post-booking pipeline off the request thread
+        booking_handlers, booking_give_up = make_booking_handlers(
+            interview_system, hold_seconds=booking_hold_seconds(self.job_queue))
+        self.job_workers = WorkerPool(self.job_queue, booking_handlers, on_give_up=booking_give_up,
+                                      workers=JOB_WORKERS)
+        self.job_workers.start()
+
+        # Services below must run once however many web workers serve the app
+        self.leader_election = LeaderElection(LEADER_LOCK_FILE, self.start_background_services,
+                                              retry_seconds=LEADER_RETRY_SECONDS)
+        self.leader_election.start()
+
+    def start_background_services(self) -> None:
+        """
+        Start the slot stream and the scheduled jobs; runs in the elected worker only.
+
+        If it raises, the election calls it again later, so services that
+        already started are kept rather than started twice.
+        """
+        # Only the elected worker talks IMAP, so only it imports imaplib
+        from cancellation_listener import CancellationListener
+
+        interview_system = self.interview_system
+        scheduler = self.scheduler
+
+        # Slot changes from every worker, relayed to the stream below (or to /slots/stream on the dev server)
+        if self.slot_event_relay is None:
+            relay = SlotEventRelay(interview_system.store, interview_system.slot_events,
+                                   poll_seconds=SLOT_EVENT_POLL_SECONDS)
+            relay.start()
+            self.slot_event_relay = relay
+
+        # Live slot updates for open pages; idle streams cost a coroutine, not a request thread
+        if SLOT_STREAM_PORT and self.slot_stream is None:
+            self.slot_stream = SlotStreamServer(
+                interview_system.slot_events,
+                port=SLOT_STREAM_PORT,
+                allow_origin=SLOT_STREAM_ALLOW_ORIGIN,
+                max_clients=SLOT_STREAM_MAX_CLIENTS
+            )
+            try:
+                self.slot_stream.start()
+            except OSError as e:
+                logger.error(f"Slot stream server not started: {e}")
+                self.slot_stream = None
+            else:
+                # Safety net for changes no worker logged, e.g. holds that lapsed unreleased
+                scheduler.add('availability_resync', interview_system.availability.open_seats,
+                              interval=AVAILABILITY_RESYNC_SECONDS, jitter=1)
+
+        # Cancellation emails (IMAP IDLE, polling fallback); a pass waits in IDLE for new mail
+        self.cancellation_listener = CancellationListener(interview_system)
+        scheduler.add('cancellations', lambda: self.cancellation_listener.run_once(scheduler.stop_event),
+                      interval=IMAP_POLL_MIN_SECONDS, jitter=1, max_backoff=IMAP_POLL_MAX_SECONDS,
+                      lease_seconds=IMAP_IDLE_SECONDS + 60)
+
+        # Keep Zoom meetings ready for open slots so booking doesn't wait on Zoom
+        if self.meeting_pool is not None:
+            self.meeting_provisioner = MeetingProvisioner(interview_system, self.meeting_pool)
+            scheduler.add('meeting_pool', lambda: self.meeting_provisioner.run_once(scheduler.stop_event),
+                          interval=MEETING_POOL_REFILL_SECONDS, jitter=30, max_backoff=SCHEDULER_MAX_BACKOFF_SECONDS)
+
+        # Abandoned holds are otherwise only cleared when their date is next booked
+        scheduler.add('expired_holds', interview_system.store.purge_expired_holds, interval=HOLD_PURGE_SECONDS,
+                      jitter=30, max_backoff=SCHEDULER_MAX_BACKOFF_SECONDS)
 
-# Start cancellation checker in background
-cancellation_thread = threading.Thread(target=check_cancellations_background, daemon=True)
-cancellation_thread.start()
+        # Keeps the live bookings table to upcoming interviews; history moves to the archive
+        scheduler.add('archive_bookings', interview_system.archive_past_bookings,
+                      interval=ARCHIVE_INTERVAL_SECONDS, jitter=60, max_backoff=SCHEDULER_MAX_BACKOFF_SECONDS)
 
-@app.route('/')
+        # Interview reminders and follow-ups, each sent once per booking
+        campaign_engine = CampaignEngine(
+            interview_system.store, interview_system.mail,
+            default_campaigns(interview_system.messages, REMINDER_HOURS, FOLLOW_UP_AFTER_HOURS, ARCHIVE_AFTER_HOURS),
+            per_minute=MAIL_PER_MINUTE, batch_size=SMTP_BATCH_SIZE
+        )
+        scheduler.add('campaigns', lambda: campaign_engine.run_once(scheduler.stop_event),
+                      interval=CAMPAIGN_INTERVAL_SECONDS, jitter=30, max_backoff=SCHEDULER_MAX_BACKOFF_SECONDS,
+                      lease_seconds=3600)
+
+        scheduler.start()
+
+bp = Blueprint('main', __name__)
+
+def create_app(start_services: bool = True, dev_server: bool = False) -> Flask:
+    """
+    Build the web app.
+
+    Args:
+        start_services: Start the booking workers and join the election for
+            background services; tests and scripts that only need the routes
+            pass False
+        dev_server: Running under the Flask development server, which may
+            serve /slots/stream itself when SLOT_STREAM_PORT is 0; under
+            gunicorn that route would hold a request thread per open page
+
+    Returns:
+        Flask: The app; its subsystems are in app.extensions['services']
+    """
+    app = Flask(__name__)
+    app.request_class = UploadRequest
+    app.config['SECRET_KEY'] = SECRET_KEY
+    app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+    # Bodies beyond the resume limit (plus room for the form fields) are refused unread
+    app.config['MAX_CONTENT_LENGTH'] = MAX_RESUME_BYTES + 64 * 1024
+    app.config['SLOT_STREAM_FROM_FLASK'] = dev_server and not SLOT_STREAM_PORT
+
+    # Ensure upload folder exists
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+    app.extensions['services'] = AppServices()
+    app.register_blueprint(bp)
+    if start_services:
+        app.extensions['services'].start()
+    return app
+
+def services() -> AppServices:
+    """Subsystems of the app handling the current request."""
+    return current_app.extensions['services']
+
+def slot_stream_url() -> Optional[str]:
+    """Where the page connects for live slot updates, or None when nothing serves them."""
+    if SLOT_STREAM_URL:
+        return SLOT_STREAM_URL
+    if SLOT_STREAM_PORT:
+        # Same host as the page; [::1]:5001 keeps its brackets
+        host = request.host if request.host.endswith(']') else request.host.rsplit(':', 1)[0]
+        return f"{request.scheme}://{host}:{SLOT_STREAM_PORT}{SlotStreamServer.PATH}"
+    if current_app.config['SLOT_STREAM_FROM_FLASK']:
+        return url_for('main.slots_stream')
+    return None
+
+@bp.route('/')
 def index() -> str:
     """Render the interview scheduling page."""
+    interview_system = services().interview_system
     # Get available dates from interview system
     available_dates = interview_system._get_available_dates()
     return render_template('index.html', 
                          banks=BANKS,
                          coverage_areas=COVERAGE_AREAS,
                          interview_types=INTERVIEW_TYPES,
-                         available_dates=available_dates)
+                         available_dates=available_dates,
+                         time_slots=interview_system.slot_model.time_slots,
+                         slot_capacity=interview_system.slot_model.capacity,
+                         slot_stream_url=slot_stream_url(),
+                         job_id=request.args.get('job'))
+
+@bp.before_app_request
+def start_request_timer() -> None:
+    g.request_started = time.perf_counter()
+
+@bp.after_app_request
+def record_request(response: Response) -> Response:
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.endpoint or 'unmatched'
+        metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+        metrics.HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    return response
 
-@app.route('/schedule', methods=['POST'])
+@bp.route('/schedule', methods=['POST'])
 def schedule() -> Union[str, tuple]:
     """
     Handle interview scheduling form submission.
     
+    The request is one trace span; the booking job it queues continues
+    the same trace when tracing is enabled.
+    
     Returns:
         Union[str, tuple]: Redirect response or error message
     """
+    with metrics.span('schedule'):
+        return _schedule()
+
+def _schedule() -> Union[str, tuple]:
+    if request.content_length and request.content_length > current_app.config['MAX_CONTENT_LENGTH']:
+        return resume_too_large(None)
+
     try:
         # Get form data
         email = request.form['email']
@@ -59,139 +290,270 @@ def schedule() -> Union[str, tuple]:
         coverage = request.form['coverage']
         interview_type = request.form['interview_type']
         date = request.form['interview_date']
-        time = request.form['interview_time']
+        time_slot = request.form['interview_time']
         
         # Validate required fields
-        if not all([email, bank, coverage, interview_type, date, time]):
+        if not all([email, bank, coverage, interview_type, date, time_slot]):
             flash('All fields are required')
-            return redirect(url_for('index'))
+            return redirect(url_for('main.index'))
         
         # Handle resume upload
         if 'resume' not in request.files or request.files['resume'].filename == '':
             flash('Resume file is required')
-            return redirect(url_for('index'))
+            return redirect(url_for('main.index'))
             
         resume_file = request.files['resume']
         if not resume_file.filename.lower().endswith(('.pdf', '.txt')):
             flash('Invalid file type. Please upload a PDF or TXT file.')
-            return redirect(url_for('index'))
+            return redirect(url_for('main.index'))
         
-        # Save and process resume
-        filename = secure_filename(resume_file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        # Small resumes ride along in the job; larger ones spool to a unique file the job deletes
+        resume = stage_resume(resume_file.stream, secure_filename(resume_file.filename),
+                              current_app.config['UPLOAD_FOLDER'], RESUME_SPOOL_BYTES)
         
+        hold_token = None
         try:
-            resume_file.save(filepath)
-            
-            # Unified error handling block for the entire process
-            try:
-                # Analyze resume
-                resume_feedback = interview_system.analyze_resume(filepath, bank, coverage)
-                
-                # Schedule interview
-                interview_date, interview_time, zoom_details = interview_system.schedule_interview(
+            # Hold the slot, then hand Zoom, resume analysis and email to the workers
+            with metrics.stage('reserve_slot'):
+                hold_token = services().interview_system.reserve_slot(
                     email=email,
                     date=date,
-                    time=time,
-                    bank=bank,
-                    coverage=coverage,
-                    interview_type=interview_type
-                )
-                
-                # Generate topics
-                interview_topics = interview_system.generate_topics(bank, coverage, interview_type)
-                
-                # Send email
-                interview_system.send_interview_details(
-                    recipient_email=email,
+                    time=time_slot,
                     bank=bank,
                     coverage=coverage,
                     interview_type=interview_type,
-                    resume_feedback=resume_feedback,
-                    interview_topics=interview_topics,
-                    interview_date=interview_date,
-                    interview_time=interview_time,
-                    zoom_details=zoom_details
+                    hold_seconds=booking_hold_seconds(services().job_queue)
                 )
+            job_id = enqueue_booking(
+                services().job_queue,
+                hold_token,
+                email=email,
+                date=date,
+                time=time_slot,
+                bank=bank,
+                coverage=coverage,
+                interview_type=interview_type,
+                resume=resume
+            )
+            
+            flash('Your slot is reserved! We are setting up your Zoom meeting and confirmation email.', 'success')
+            return redirect(url_for('main.index', job=job_id))
+            
+        except Exception as process_error:
+            if hold_token:
+                services().interview_system.release_slot(hold_token)
+            discard_resume(resume)
+            
+            error_message = str(process_error)
+            if "already booked" in error_message.lower():
+                flash('This time slot is already booked. Please select another time.')
+            else:
+                flash(f'Error scheduling interview: {error_message}')
                 
-                flash('Interview scheduled successfully! Check your email for details.', 'success')
-                
-            except Exception as process_error:
-                error_message = str(process_error)
-                
-                # Handle specific errors with more user-friendly messages
-                if "already booked" in error_message.lower():
-                    flash('This time slot is already booked. Please select another time.')
-                elif "zoom meeting" in error_message.lower():
-                    flash(f'Error creating Zoom meeting: {error_message}')
-                    if "zoom_details" in locals():
-                        flash(f'Your Zoom link is: {zoom_details["url"]}', 'warning')
-                elif "email" in error_message.lower():
-                    flash(f'Interview scheduled but email failed: {error_message}')
-                    if "zoom_details" in locals():
-                        flash(f'Your Zoom link is: {zoom_details["url"]}', 'warning')
-                else:
-                    flash(f'Error scheduling interview: {error_message}')
-                    
-                print(f"Error details: {error_message}")  # Log the error
-                    
-            return redirect(url_for('index'))
-                
-        finally:
-            # Clean up uploaded file
-            if os.path.exists(filepath):
-                os.remove(filepath)
+            logger.warning(f"Could not schedule interview: {error_message}")
+            return redirect(url_for('main.index'))
             
     except Exception as e:
-        print(f"General error: {str(e)}")  # Log the error
+        logger.error(f"Error handling scheduling request: {e}")
         flash(f'Error: {str(e)}')
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
+
+@bp.app_errorhandler(413)
+def resume_too_large(error):
+    if request.endpoint == 'main.analyze_batch':
+        return jsonify({'error': f'Upload is larger than {BATCH_MAX_BYTES // (1024 * 1024)} MB'}), 413
+    flash(f'Resume is too large. Please upload a file under {MAX_RESUME_BYTES // (1024 * 1024)} MB.')
+    return redirect(url_for('main.index'))
+
+@bp.route('/jobs/<job_id>')
+def job_status(job_id: str):
+    """Return the progress of a booking job so the page can poll for completion."""
+    job = services().job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job['kind'] == BOOKING_JOB:
+        return jsonify(booking_status(job))
+    return jsonify({
+        'status': job['status'],
+        'attempts': job['attempts'],
+        'error': job['last_error'],
+        'progress': job['progress']
+    })
+
+def _bookings_query(args) -> Dict:
+    """
+    Read the bookings filters and page cursor from query parameters.
+
+    archived=1 selects the archive of past bookings instead of the live store.
+
+    Raises:
+        ValueError: If a date or the page size is malformed
+    """
+    query = {}
+    for name in ('start_date', 'end_date'):
+        value = args.get(name, '').strip()
+        if value:
+            try:
+                query[name] = datetime.strptime(value, '%Y-%m-%d').date().isoformat()
+            except ValueError:
+                raise ValueError(f"Invalid {name.replace('_', ' ')}: use YYYY-MM-DD")
+    for name in ('email', 'bank', 'cursor'):
+        value = args.get(name, '').strip()
+        if value:
+            query[name] = value
+    query['archived'] = args.get('archived') == '1'
+    try:
+        limit = int(args.get('limit', BOOKINGS_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("Invalid page size")
+    query['limit'] = max(1, min(limit, BOOKINGS_PAGE_MAX))
+    return query
 
-@app.route('/view_bookings')
+def _query_page(query: Dict):
+    query = dict(query)
+    if query.pop('archived'):
+        return services().interview_system.store.query_archive(**query)
+    return services().interview_system.store.query_bookings(**query)
+
+@bp.route('/view_bookings')
 def view_bookings():
-    # Debug print to see what's in the bookings
-    print("Current bookings:", interview_system.bookings)
-    return render_template('bookings.html', bookings=interview_system.bookings)
+    try:
+        query = _bookings_query(request.args)
+        page = _query_page(query)
+    except ValueError as e:
+        flash(str(e))
+        return redirect(url_for('main.view_bookings'))
 
-@app.route('/delete_all_meetings', methods=['POST'])
-def delete_all_meetings():
-    interview_system.delete_all_meetings()
-    flash('All meetings have been deleted.')
-    return redirect(url_for('view_bookings'))
+    # The page arrives in slot order; group it by day and format each date once
+    days = []
+    for date, time_slot, booking in page.bookings:
+        if not days or days[-1]['date'] != date:
+            label = datetime.strptime(date, '%Y-%m-%d').strftime('%A, %B %d, %Y')
+            days.append({'date': date, 'label': label, 'slots': []})
+        days[-1]['slots'].append((time_slot, booking))
+
+    filters = {k: v for k, v in query.items() if k in ('start_date', 'end_date', 'email', 'bank')}
+    if query['archived']:
+        filters['archived'] = '1'
+    return render_template('bookings.html', days=days, filters=filters, banks=BANKS,
+                           next_cursor=page.next_cursor, paged='cursor' in query,
+                           archived=query['archived'])
+
+@bp.route('/api/bookings')
+def query_bookings():
+    """
+    Page through bookings as JSON.
 
-@app.route('/get_booked_slots')
-def get_booked_slots() -> jsonify:
-    """Return list of booked interview slots."""
+    Accepts start_date, end_date, email, bank, archived, cursor and limit
+    query parameters; pass next_cursor back as cursor to get the following page.
+    """
     try:
-        # Get bookings from the interview system
-        bookings = interview_system.bookings
-        
-        # Format the bookings into a list of date/time slots
-        booked_slots = []
-        for date_str, times in bookings.items():
-            for time_str in times.keys():
-                booked_slots.append({
-                    'date': date_str,  # Format: "2025-03-14"
-                    'time': time_str   # Format: "3:00 PM ET"
-                })
-        
-        return jsonify(booked_slots)
-    except Exception as e:
-        print(f"Error getting booked slots: {str(e)}")
-        return jsonify([])  # Return empty list on error
+        page = _query_page(_bookings_query(request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'bookings': [{'date': date, 'time': time_slot, **booking} for date, time_slot, booking in page.bookings],
+        'next_cursor': page.next_cursor
+    })
+
+@bp.route('/delete_all_meetings', methods=['POST'])
+def delete_all_meetings():
+    # Runs on the workers: hundreds of Zoom deletes would outlive the request timeout
+    job_id = enqueue_teardown(services().job_queue)
+    flash(f'Deleting all meetings in the background (job {job_id}). Refresh to see progress.')
+    return redirect(url_for('main.view_bookings'))
+
+@bp.route('/analyze_batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze a cohort of resumes for one bank and coverage area.
+
+    Expects multipart form fields bank and coverage plus any number of
+    resumes files. Streams one JSON line per resume as it finishes, then a
+    final {"summary": ...} line with counts and throughput.
+    """
+    bank = request.form.get('bank')
+    coverage = request.form.get('coverage')
+    if bank not in BANKS or coverage not in COVERAGE_AREAS:
+        return jsonify({'error': 'A valid bank and coverage are required'}), 400
+    files = [f for f in request.files.getlist('resumes') if f.filename]
+    if not files:
+        return jsonify({'error': 'No resumes uploaded'}), 400
+    invalid = [f.filename for f in files if not f.filename.lower().endswith(RESUME_EXTENSIONS)]
+    if invalid:
+        return jsonify({'error': 'Only PDF and TXT resumes are supported', 'files': invalid}), 400
+
+    batch = BatchAnalysis(services().interview_system, bank, coverage, workers=BATCH_WORKERS)
+
+    def generate():
+        for result in batch.run((secure_filename(f.filename), f.stream) for f in files):
+            yield json.dumps(result) + '\n'
+        yield json.dumps({'summary': batch.summary()}) + '\n'
 
-@app.template_filter('datetime_format')
-def datetime_format(value):
-    date = datetime.strptime(value, '%Y-%m-%d')
-    return date.strftime('%A, %B %d, %Y')
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@bp.route('/resume_cache_stats')
+def resume_cache_stats():
+    """Hit/miss counters of the resume analysis cache."""
+    return jsonify(services().interview_system.resume_cache.stats())
+
+@bp.route('/scheduler_stats')
+def scheduler_stats():
+    """Runs, durations, lag and errors of the scheduled jobs in this worker."""
+    app_services = services()
+    election = app_services.leader_election
+    return jsonify({'leader': bool(election and election.is_leader), 'jobs': app_services.scheduler.metrics()})
+
+@bp.route('/metrics')
+def prometheus_metrics() -> Response:
+    """Metrics in the Prometheus text format, summed over all workers when METRICS_DIR is set."""
+    return Response(metrics.render(METRICS_DIR), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@bp.route('/get_booked_slots')
+def get_booked_slots() -> Response:
+    """
+    Return free and booked slots of the bookable window, keyed by date.
+
+    The body and its ETag come precomputed from the availability index, so
+    a poll whose If-None-Match still matches is answered 304 without any
+    storage access or serialization.
+    """
+    body, etag = services().interview_system.availability.snapshot()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = AVAILABILITY_MAX_AGE_SECONDS
+    return response
+
+@bp.route('/slots/stream')
+def slots_stream() -> Response:
+    """
+    Server-Sent Events feed of slots being booked and released.
+
+    Development server only: it holds a request thread per client, and only
+    sees bookings made by this process. Production streams from the asyncio
+    server on SLOT_STREAM_PORT.
+    """
+    if not current_app.config['SLOT_STREAM_FROM_FLASK']:
+        abort(404)
+    stream = services().interview_system.slot_events.stream(request.headers.get('Last-Event-ID'))
+    return Response(stream, mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
-@app.template_filter('strptime')
-def strptime_filter(date_str, format):
-    return datetime.strptime(date_str, format)
+def __getattr__(name: str):
+    # `gunicorn app:app` and `from app import app` keep working; the app is built on first access
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-@app.template_filter('strftime')
-def strftime_filter(date_obj, format):
-    return date_obj.strftime(format)
+def main() -> None:
+    """Run the development server; production runs under gunicorn (see gunicorn.conf.py)."""
+    create_app(dev_server=True).run(host=WEB_HOST, port=WEB_PORT, debug=FLASK_DEBUG)
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5001) 
\ No newline at end of file
+    main() 
\ No newline at end of file
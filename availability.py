@@ -0,0 +1,192 @@
+import hashlib
+import json
+import math
+import threading
+import time
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from booking_store import BookingStore
+from slot_model import SlotModel, day_intervals
+from slot_events import BOOKED, RELEASED, RESYNC
+
+logger = logging.getLogger(__name__)
+
+
+class AvailabilityIndex:
+    """
+    Free and booked slots for the bookable window, keyed by date.
+
+    Availability is generated from the slot model: a start time is free while
+    at least one interviewer can still fit the shortest interview type there,
+    taking the length of every booking and live hold into account. The index
+    is loaded from the store once and then kept current by the booking paths
+    (mark_held, mark_confirmed, mark_released, mark_free), each of which
+    reloads only the affected date, so serving it needs no database work.
+    A booking path calls refresh() before it writes, so the index it diffs
+    against is loaded and current.
+    The rendered JSON and its ETag are cached until the next change. Holds
+    that lapse without being confirmed or released are picked up when their
+    expiry passes. A full reload runs when the window moves to a new day and
+    every resync_seconds, which also catches bookings changed by other
+    processes.
+
+    Every slot that turns booked or free is reported to the listener as
+    listener(kind, date, time) with kind 'booked' or 'released'; a new
+    window is reported as 'resync'.
+
+    Attributes:
+        store (BookingStore): Source of truth for booked and held slots
+        slot_model (SlotModel): Grid, capacity, durations and blackout dates
+        resync_seconds (float): Longest time between full reloads
+        listener (callable): Receives slot changes, or None
+    """
+
+    def __init__(self, store: BookingStore, slot_model: SlotModel, resync_seconds: float = 30,
+                 listener: Optional[Callable[[str, Optional[str], Optional[str]], None]] = None):
+        self.store = store
+        self.slot_model = slot_model
+        self.resync_seconds = resync_seconds
+        self.listener = listener
+        self._lock = threading.Lock()
+        self._dates = []
+        self._seats = {}     # date -> {time: interviewers still free}
+        self._expiries = {}  # date -> earliest live hold expiry on it
+        self._holds = {}     # hold token -> date
+        self._synced_at = None
+        self._body = None
+        self._etag = None
+
+    def mark_held(self, token: str, date: str) -> None:
+        with self._lock:
+            if date not in self._seats:
+                return
+            self._holds[token] = date
+            events = self._reload([date])
+        self._notify(events)
+
+    def mark_confirmed(self, token: str) -> None:
+        # A confirmed hold keeps its seat, so availability doesn't change
+        with self._lock:
+            self._holds.pop(token, None)
+
+    def mark_released(self, token: str, date: Optional[str] = None) -> None:
+        """Record that a hold was dropped; date locates holds placed by another process."""
+        with self._lock:
+            date = self._holds.pop(token, None) or date
+            if date not in self._seats:
+                return
+            events = self._reload([date])
+        self._notify(events)
+
+    def mark_free(self, date: str) -> None:
+        """Record that a confirmed booking on date was removed."""
+        with self._lock:
+            if date not in self._seats:
+                return
+            events = self._reload([date])
+        self._notify(events)
+
+    def snapshot(self) -> Tuple[bytes, str]:
+        """
+        Return the JSON body {date: {"free": [...], "booked": [...], "seats": {time: n}}} and its ETag.
+
+        Both are cached between changes, so repeated calls are cheap.
+        """
+        with self._lock:
+            events = self._refresh()
+            if self._body is None:
+                self._render()
+            body, etag = self._body, self._etag
+        self._notify(events)
+        return body, etag
+
+    def refresh(self) -> None:
+        """Load the window if needed and catch up on changes made elsewhere."""
+        with self._lock:
+            events = self._refresh()
+        self._notify(events)
+
+    def open_seats(self) -> Dict[Tuple[str, str], int]:
+        """Interviewers still free per (date, time) slot of the window."""
+        with self._lock:
+            events = self._refresh()
+            seats = {(date, t): n for date, times in self._seats.items() for t, n in times.items()}
+        self._notify(events)
+        return seats
+
+    def _notify(self, events: List[Tuple[str, Optional[str], Optional[str]]]) -> None:
+        if self.listener is None:
+            return
+        for kind, date, time_slot in events:
+            try:
+                self.listener(kind, date, time_slot)
+            except Exception as e:
+                logger.warning(f"Availability listener failed: {e}")
+
+    def _changed(self) -> None:
+        self._body = None
+        self._etag = None
+
+    def _refresh(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        now = time.time()
+        dates = [day.isoformat() for day in self.slot_model.bookable_dates()]
+        if self._synced_at is None or now - self._synced_at >= self.resync_seconds or dates != self._dates:
+            return self._resync(dates, now)
+        # Dates with a lapsed hold; it may have been extended or confirmed elsewhere
+        stale = [date for date in self._dates if self._expiries.get(date, math.inf) < now]
+        return self._reload(stale) if stale else []
+
+    def _resync(self, dates: List[str], now: float) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        if dates != self._dates:
+            events = [(RESYNC, None, None)] if self._synced_at is not None else []
+            self._dates = dates
+            self._seats = {}
+            self._expiries = {}
+            self._changed()
+            self._reload(dates)
+        else:
+            events = self._reload(dates)
+        self._synced_at = now
+        # A hold token stays known only while its date is in the window
+        self._holds = {token: date for token, date in self._holds.items() if date in self._seats}
+        return events
+
+    def _reload(self, dates: Iterable[str]) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        dates = list(dates)
+        uses = defaultdict(list)
+        for use in self.store.slot_usage(dates):
+            uses[use.date].append(use)
+
+        events = []
+        for date in dates:
+            intervals = day_intervals(((u.interviewer, u.starts_at, u.ends_at) for u in uses[date]),
+                                      self.slot_model.capacity)
+            seats = self.slot_model.open_seats(date, intervals)
+            self._expiries[date] = min((u.hold_expires_at for u in uses[date] if u.hold_expires_at is not None),
+                                       default=math.inf)
+            old = self._seats.get(date)
+            if old == seats:
+                continue
+            if old is not None:
+                for time_slot in self.slot_model.time_slots:
+                    if old.get(time_slot, 0) > 0 and seats[time_slot] == 0:
+                        events.append((BOOKED, date, time_slot))
+                    elif old.get(time_slot, 0) == 0 and seats[time_slot] > 0:
+                        events.append((RELEASED, date, time_slot))
+            self._seats[date] = seats
+            self._changed()
+        return events
+
+    def _render(self) -> None:
+        availability = {}
+        for date in self._dates:
+            seats = self._seats[date]
+            availability[date] = {
+                'free': [t for t in self.slot_model.time_slots if seats[t] > 0],
+                'booked': [t for t in self.slot_model.time_slots if seats[t] == 0],
+                'seats': seats
+            }
+        self._body = json.dumps(availability, separators=(',', ':')).encode('utf-8')
+        self._etag = hashlib.sha1(self._body).hexdigest()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Batch resume analysis for whole candidate cohorts.
+
+Analyzes every resume in the given files and folders for one bank and
+coverage area, writes one JSON line per resume as results come in, and
+reports throughput when done.
+
+Usage:
+    python batch_analysis.py --bank "Goldman Sachs" --coverage Technology resumes/ [--workers 8] [--output results.jsonl]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, Iterator, Dict, List, Tuple, Union, BinaryIO
+
+from config import BANKS, COVERAGE_AREAS, BATCH_WORKERS
+
+logger = logging.getLogger(__name__)
+
+RESUME_EXTENSIONS = ('.pdf', '.txt')
+
+Resume = Union[str, bytes, memoryview, BinaryIO]
+
+
+class BatchAnalysis:
+    """
+    Analysis of many resumes against one bank and coverage area.
+
+    Resumes are analyzed concurrently and results are yielded as each one
+    finishes, not in input order. PDF parsing, the expensive step, runs on
+    the interview system's sandboxed extractor processes, and resumes seen
+    before are answered from its resume cache. At most twice `workers`
+    resumes are read at a time, so a cohort of any size streams through in
+    bounded memory.
+
+    Attributes:
+        interview_system (InterviewSystem): Provides the PDF extractor and resume cache
+        bank (str): Target investment bank
+        coverage (str): Coverage area
+        workers (int): Resumes analyzed at once
+        analyzed (int): Resumes analyzed so far
+        failed (int): Resumes that could not be analyzed
+    """
+
+    def __init__(self, interview_system, bank: str, coverage: str, workers: int = 4):
+        self.interview_system = interview_system
+        self.bank = bank
+        self.coverage = coverage
+        self.workers = workers
+        self.analyzed = 0
+        self.failed = 0
+        self._started_at = None
+        self._finished_at = None
+
+    def run(self, resumes: Iterable[Tuple[str, Resume]]) -> Iterator[Dict]:
+        """
+        Analyze (name, resume) pairs, where a resume is a path, a buffer or a binary stream.
+
+        Yields:
+            dict: {'resume': name, 'feedback': str} or {'resume': name, 'error': str}
+        """
+        self._started_at = time.monotonic()
+        items = iter(resumes)
+        pending = {}
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='batch-analysis')
+
+        def submit_more():
+            while len(pending) < self.workers * 2:
+                item = next(items, None)
+                if item is None:
+                    return
+                name, resume = item
+                future = executor.submit(self.interview_system.resume_feedback,
+                                         resume, self.bank, self.coverage, name)
+                pending[future] = name
+
+        try:
+            submit_more()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        result = {'resume': name, 'feedback': future.result()}
+                        self.analyzed += 1
+                    except Exception as e:
+                        logger.warning(f"Could not analyze {name}: {e}")
+                        result = {'resume': name, 'error': str(e)}
+                        self.failed += 1
+                    yield result
+                submit_more()
+        finally:
+            # Also runs when the consumer stops early, e.g. a client disconnecting
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._finished_at = time.monotonic()
+
+    def summary(self) -> Dict:
+        """Counts and throughput of the run so far."""
+        if self._started_at is None:
+            seconds = 0.0
+        else:
+            seconds = (self._finished_at or time.monotonic()) - self._started_at
+        total = self.analyzed + self.failed
+        return {
+            'resumes': total,
+            'analyzed': self.analyzed,
+            'failed': self.failed,
+            'seconds': round(seconds, 3),
+            'resumes_per_second': round(total / seconds, 2) if seconds else 0.0
+        }
+
+
+def collect_resumes(paths: List[str]) -> List[Tuple[str, str]]:
+    """Expand files and folders into (name, path) pairs for every PDF or TXT resume."""
+    resumes = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(RESUME_EXTENSIONS):
+                        file_path = os.path.join(root, name)
+                        resumes.append((file_path, file_path))
+        else:
+            resumes.append((path, path))
+    return resumes
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze a cohort of resumes and stream JSONL results.")
+    parser.add_argument('paths', nargs='+', help="Resume files or folders of resumes")
+    parser.add_argument('--bank', required=True, choices=BANKS)
+    parser.add_argument('--coverage', required=True, choices=COVERAGE_AREAS)
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS,
+                        help="Resumes analyzed at once; also the number of PDF extraction processes")
+    parser.add_argument('--output', default='-', help="JSONL output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    # Imported here so --help stays fast
+    from config import (MAX_RESUME_BYTES, PDF_MAX_PAGES, PDF_MAX_CHARS, PDF_CPU_SECONDS,
+                        PDF_TIMEOUT_SECONDS, PDF_MEMORY_LIMIT_MB)
+    from interview_system import InterviewSystem
+    from pdf_extraction import PDFExtractor
+
+    resumes = collect_resumes(args.paths)
+    extractor = PDFExtractor(
+        workers=args.workers,
+        max_bytes=MAX_RESUME_BYTES,
+        max_pages=PDF_MAX_PAGES,
+        max_chars=PDF_MAX_CHARS,
+        cpu_seconds=PDF_CPU_SECONDS,
+        timeout=PDF_TIMEOUT_SECONDS,
+        memory_limit_mb=PDF_MEMORY_LIMIT_MB
+    )
+    # Fork the extraction processes before any thread exists
+    extractor.start()
+    batch = BatchAnalysis(InterviewSystem(pdf_extractor=extractor), args.bank, args.coverage, args.workers)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        for result in batch.run(resumes):
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        extractor.shutdown()
+
+    summary = batch.summary()
+    print(f"Analyzed {summary['analyzed']} of {summary['resumes']} resumes in {summary['seconds']}s "
+          f"({summary['resumes_per_second']} resumes/sec, {summary['failed']} failed)", file=sys.stderr)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
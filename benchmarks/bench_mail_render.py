@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmark for outgoing message rendering.
+
+Checks that invites and cancellations rendered by mail_templates parse as
+valid MIME, carry one calendar part each, and share the same event UID,
+then reports messages rendered per second against the original
+email.mime-based builders (kept below). Exits non-zero if a check fails.
+
+Usage:
+    python benchmarks/bench_mail_render.py [--seconds 2]
+"""
+
+import argparse
+import email
+import email.policy
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mail_templates import MessageRenderer, event_uid
+
+SENDER = 'interviews@example.com'
+RECIPIENT = 'candidate@example.com'
+DATE = '2026-11-03'
+TIME = '2:00 PM ET'
+ZOOM = {'url': 'https://zoom.us/j/81234567890?pwd=QWxhZGRpbjpvcGVuIHNlc2FtZQ', 'meeting_id': 81234567890,
+        'password': 'x7Kp2Q'}
+FEEDBACK = ("Executive Summary:\nYour profile shows 3 key strengths for Goldman Sachs's Technology group.\n"
+            + "\n".join(f"  • \"built a dcf for a ${n}00 million saas acquisition\"" for n in range(1, 40)))
+TOPICS = "\n".join(f"- Topic {n}: walk me through a DCF, accretion/dilution, LBO returns" for n in range(12))
+DURATIONS = {'Coffee Chat': 30, 'First Round': 60, 'Superday': 60}
+
+
+def legacy_interview_details(recipient_email, bank, coverage, interview_type, resume_feedback,
+                             interview_topics, interview_date, interview_time, zoom_details):
+    """The invite builder from InterviewSystem.send_interview_details before mail_templates, minus sending."""
+    subject = f"Your {interview_type} Interview Details - {bank} {coverage}"
+    body = f"""
+Dear Candidate,
+
+Your interview has been scheduled:
+
+Date: {interview_date.strftime('%A, %B %d, %Y')}
+Time: {interview_time} (Eastern Time)
+
+Zoom Details:
+Join URL: {zoom_details['url']}
+Meeting ID: {zoom_details['meeting_id']}
+Password: {zoom_details['password']}
+
+Resume Feedback:
+{resume_feedback}
+
+Interview Topics to Prepare:
+{interview_topics}
+
+Need to Cancel or Reschedule?
+----------------------------
+To cancel your interview, please send an email to {SENDER} with:
+Subject: CANCEL INTERVIEW
+Date: {interview_date.strftime('%Y-%m-%d')}
+Time: {interview_time}
+
+Best regards,
+IB Interview Prep Team
+"""
+    time_str = interview_time.replace(" ET", "")
+    time_obj = datetime.strptime(time_str, "%I:%M %p").time()
+    start_datetime = datetime.combine(interview_date.date(), time_obj)
+    end_datetime = start_datetime + timedelta(minutes=DURATIONS.get(interview_type, 60))
+    local_tz = ZoneInfo('America/New_York')
+    start = start_datetime.replace(tzinfo=local_tz).strftime("%Y%m%dT%H%M%S")
+    end = end_datetime.replace(tzinfo=local_tz).strftime("%Y%m%dT%H%M%S")
+    dtstamp = datetime.now(local_tz).strftime("%Y%m%dT%H%M%S")
+    uid = f'ibinterview-{interview_date.strftime("%Y%m%d")}-{time_str.replace(" ", "").replace(":", "")}@ibinterviewprep.com'
+    ical_content = f"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//IB Interview System//NONSGML v1.0//EN
+METHOD:REQUEST
+BEGIN:VEVENT
+UID:{uid}
+DTSTAMP:{dtstamp}Z
+DTSTART;TZID=America/New_York:{start}
+DTEND;TZID=America/New_York:{end}
+SUMMARY:IB {interview_type} Interview - {bank} {coverage}
+LOCATION:{zoom_details['url']}
+DESCRIPTION:IB Interview Prep Session\\nBank: {bank}\\nCoverage: {coverage}\\nType: {interview_type}\\n\\nZoom Meeting Details:\\nJoin URL: {zoom_details['url']}\\nMeeting ID: {zoom_details['meeting_id']}\\nPassword: {zoom_details['password']}\\n\\nPlease join 5 minutes early.
+BEGIN:VALARM
+ACTION:DISPLAY
+DESCRIPTION:Reminder: Interview in 30 minutes
+TRIGGER:-PT30M
+END:VALARM
+END:VEVENT
+END:VCALENDAR
+"""
+    msg = MIMEMultipart("mixed")
+    msg["From"] = SENDER
+    msg["To"] = recipient_email
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "plain"))
+    calendar_part = MIMEText(ical_content, "calendar", "utf-8")
+    calendar_part["Content-Class"] = "urn:content-classes:calendarmessage"
+    calendar_part["Content-Type"] = "text/calendar; charset=UTF-8; method=REQUEST"
+    calendar_part["Content-Disposition"] = "attachment; filename=invitation.ics"
+    msg.attach(calendar_part)
+    ics_attachment = MIMEText(ical_content)
+    ics_attachment["Content-Type"] = "text/calendar; name=invite.ics"
+    ics_attachment["Content-Disposition"] = "attachment; filename=invite.ics"
+    msg.attach(ics_attachment)
+    return msg.as_bytes()
+
+
+def calendar_of(data: bytes) -> dict:
+    msg = email.message_from_bytes(data, policy=email.policy.default)
+    calendars = [part for part in msg.walk() if part.get_content_type() == 'text/calendar']
+    if len(calendars) != 1:
+        raise AssertionError(f"expected one calendar part, found {len(calendars)}")
+    fields = {}
+    # Unfold continuation lines before reading properties
+    for line in calendars[0].get_content().replace('\r\n ', '').splitlines():
+        name, _, value = line.partition(':')
+        fields.setdefault(name, value)
+    return fields
+
+
+def check(renderer: MessageRenderer) -> int:
+    failures = 0
+    invite = renderer.interview_details(RECIPIENT, 'Goldman Sachs', 'Technology', 'Coffee Chat',
+                                        FEEDBACK, TOPICS, DATE, TIME, ZOOM)
+    cancel = renderer.cancellation_confirmation(RECIPIENT, DATE, TIME, 'Coffee Chat')
+    invalid = renderer.invalid_cancellation(RECIPIENT, None, None, "Could not find date and time in your email.")
+    try:
+        invite_cal, cancel_cal = calendar_of(invite.data), calendar_of(cancel.data)
+        assert invite_cal['UID'] == cancel_cal['UID'] == event_uid(DATE, TIME, RECIPIENT), "UIDs differ"
+        assert event_uid(DATE, TIME, 'other@example.com') != invite_cal['UID'], "UID shared by slot-mates"
+        assert invite_cal['DTSTART'] == cancel_cal['DTSTART'] == '20261103T190000Z', invite_cal['DTSTART']
+        assert invite_cal['DTEND'] == cancel_cal['DTEND'] == '20261103T193000Z', invite_cal['DTEND']
+        assert int(cancel_cal['SEQUENCE']) > int(invite_cal['SEQUENCE']), "cancel sequence not higher"
+        body = email.message_from_bytes(invite.data, policy=email.policy.default).get_body(('plain',))
+        assert '•' in body.get_content() and 'Tuesday, November 03, 2026' in body.get_content(), "body mismatch"
+        plain = email.message_from_bytes(invalid.data, policy=email.policy.default)
+        assert 'Could not find date' in plain.get_content(), "invalid-cancellation body mismatch"
+        assert all(b'\n' not in line for line in invite.data.split(b'\r\n')), "bare LF in output"
+    except AssertionError as e:
+        print(f"CHECK FAILED: {e}")
+        failures += 1
+    print(f"Rendering checks: {'OK' if not failures else 'FAILED'}")
+    return failures
+
+
+def rate(fn, seconds: float) -> float:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for _ in range(20):
+            fn()
+        count += 20
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--seconds', type=float, default=2, help="Timing window per case")
+    args = parser.parse_args()
+
+    renderer = MessageRenderer(SENDER, lambda t: DURATIONS.get(t, 60))
+    failures = check(renderer)
+
+    interview_date = datetime.strptime(DATE, '%Y-%m-%d').replace(tzinfo=ZoneInfo('America/New_York'))
+    cases = {
+        'invite (legacy MIME)': lambda: legacy_interview_details(
+            RECIPIENT, 'Goldman Sachs', 'Technology', 'First Round', FEEDBACK, TOPICS, interview_date, TIME, ZOOM),
+        'invite (templates)': lambda: renderer.interview_details(
+            RECIPIENT, 'Goldman Sachs', 'Technology', 'First Round', FEEDBACK, TOPICS, DATE, TIME, ZOOM),
+        'cancellation (templates)': lambda: renderer.cancellation_confirmation(RECIPIENT, DATE, TIME, 'First Round'),
+        'invalid cancellation (templates)': lambda: renderer.invalid_cancellation(
+            RECIPIENT, DATE, TIME, "No booking found for this date."),
+    }
+    print(f"{'message':<36}{'msgs/sec':>12}")
+    for name, fn in cases.items():
+        print(f"{name:<36}{rate(fn, args.seconds):>12.0f}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the resume analysis engine.
+
+Checks that resume_analyzer produces byte-identical reports to the original
+multi-scan implementation (kept below as legacy_analyze) for every bank and
+coverage area, then times both on 1-page and 10-page resumes. Exits non-zero
+if any report differs.
+
+Usage:
+    python benchmarks/bench_resume_analysis.py [--resume path/to/resume.pdf] [--repeat 200]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import BANKS, COVERAGE_AREAS, COVERAGE_KEYWORDS
+from resume_analyzer import analyze_text, KEYWORDS
+
+PAGE = """JORDAN TAYLOR +1 (212) 555-{phone} | jordan.taylor{n}@example.com | linkedin.com/in/jordantaylor
+EDUCATION
+UNIVERSITY OF MICHIGAN, ROSS SCHOOL OF BUSINESS Ann Arbor, MI
+Bachelor of Business Administration, Minor in Economics Sep 20{y1} - May 20{y2}
+GPA 3.{gpa} | Relevant Coursework: Corporate Finance, Financial Accounting, Valuation
+EXPERIENCE
+MERIDIAN CAPITAL PARTNERS New York, NY
+Investment Banking Summer Analyst Jun 20{y2} - Aug 20{y2}
+Built a three-statement model and DCF for a ${deal} million SaaS acquisition in the Cloud sector
+Analyzed comps and precedent transaction multiples for a ${deal2}B merger of two Fintech lenders
+Increased pitch book throughput by {pct}% by automating Capital IQ and Bloomberg data pulls in Excel
+Managed diligence for a Biotech carve-out; led a team of {team} analysts across 3 time zones
+NORTHSTAR ADVISORY Chicago, IL
+Financial Analyst Intern May 20{y1} - Aug 20{y1}
+Reduced monthly close time by {days} days through an LBO returns template in PowerPoint and Excel
+Grew coverage of Healthcare IT and Medical devices clients from {c1} to {c2} accounts
+Delivered market research and industry analysis on Cybersecurity and E-commerce platforms
+Raised ${raised}k for a student investment fund; oversaw $1.{aum} million in Asset management mandates
+LEADERSHIP
+Finance Club President: grew membership by {members}% and organized {events} recruiting events
+SKILLS
+Technical Skills: Excel, PowerPoint, Bloomberg, Capital IQ, Python, SQL, Tableau
+Interests: marathon running, chess, Italian cooking, Enterprise software, AI/ML research
+"""
+
+
+def make_resume(pages: int, seed: int = 7) -> str:
+    rnd = random.Random(seed)
+    return "\n".join(
+        PAGE.format(
+            phone=rnd.randint(1000, 9999), n=page, y1=rnd.randint(10, 19), y2=rnd.randint(20, 24),
+            gpa=rnd.randint(10, 99), deal=rnd.randint(50, 900), deal2=rnd.randint(1, 9),
+            pct=rnd.randint(5, 60), team=rnd.randint(2, 9), days=rnd.randint(2, 6),
+            c1=rnd.randint(3, 9), c2=rnd.randint(10, 30), raised=rnd.randint(10, 99), aum=rnd.randint(1, 9),
+            members=rnd.randint(10, 80), events=rnd.randint(3, 20)
+        )
+        for page in range(pages)
+    )
+
+
+def legacy_analyze(text: str, bank: str, coverage: str) -> str:
+    """The analysis from InterviewSystem.analyze_resume before the single-pass engine, verbatim."""
+    text = text.lower()  # Convert to lowercase for analysis
+
+    feedback = []
+    improvements = []  # Define improvements list at the beginning
+
+    # 1. Format and Presentation
+    words = text.split()
+    word_count = len(words)
+    feedback.append("Format and Presentation:")
+    if word_count < 200:
+        feedback.append(f"- Resume is quite brief at approximately {word_count} words. Consider adding more detail about your experiences.")
+    elif word_count > 1000:
+        feedback.append(f"- Resume is lengthy at {word_count} words. Consider condensing to highlight key achievements.")
+
+    # Extract and analyze sections
+    sections_found = []
+    if "education" in text:
+        sections_found.append("Education")
+        # Look for key education elements
+        education_keywords = ["gpa", "major", "university", "college", "bachelor", "master", "mba"]
+        missing_edu = [k for k in education_keywords if k not in text]
+        if missing_edu:
+            feedback.append(f"- Consider adding these to your Education section: {', '.join(missing_edu)}")
+
+        # Check education details (moved here to combine with other education checks)
+        if "gpa" not in text:
+            improvements.append("Add GPA if above 3.5")
+        if not any(course in text for course in ["finance", "accounting", "economics"]):
+            improvements.append("Include relevant coursework")
+
+    if "experience" in text:
+        sections_found.append("Experience")
+        # Check for action verbs
+        action_verbs = ["led", "managed", "developed", "created", "analyzed", "implemented"]
+        if not any(verb in text for verb in action_verbs):
+            feedback.append("- Use more action verbs to describe your experiences")
+
+    if "skills" in text or "technical skills" in text:
+        sections_found.append("Skills")
+
+    missing_sections = [s for s in ["Education", "Experience", "Skills"] if s not in sections_found]
+    if missing_sections:
+        feedback.append(f"- Add these key sections: {', '.join(missing_sections)}")
+
+    # 2. Technical Skills for Coverage Area
+    feedback.append(f"\nTechnical Skills (Relevant to {coverage}):")
+    industry_keywords = COVERAGE_KEYWORDS.get(coverage, [])
+    found_keywords = [word for word in industry_keywords if word.lower() in text]
+
+    if found_keywords:
+        feedback.append(f"- Strong alignment with {coverage}: {', '.join(found_keywords)}")
+        # Extract context around keywords
+        for keyword in found_keywords[:2]:  # Show context for top 2 matches
+            idx = text.find(keyword.lower())
+            if idx != -1:
+                context = text[max(0, idx-50):min(len(text), idx+50)].strip()
+                feedback.append(f"  • Context: \"...{context}...\"")
+    else:
+        feedback.append(f"- Limited {coverage}-specific experience shown")
+        feedback.append(f"- Consider adding these keywords: {', '.join(industry_keywords[:3])}")
+
+    # 3. Banking Experience
+    feedback.append("\nBanking Experience:")
+    banking_terms = {
+        "deal experience": ["transaction", "deal", "m&a", "merger", "acquisition"],
+        "financial modeling": ["model", "valuation", "dcf", "lbo", "comps"],
+        "market analysis": ["market research", "industry analysis", "competitor analysis"],
+        "technical skills": ["excel", "powerpoint", "bloomberg", "capital iq"]
+    }
+
+    for category, terms in banking_terms.items():
+        found_terms = [term for term in terms if term in text]
+        if found_terms:
+            feedback.append(f"- Strong {category}: {', '.join(found_terms)}")
+        else:
+            feedback.append(f"- Consider adding {category} examples")
+
+    # 4. Quantitative Achievements
+    feedback.append("\nQuantitative Achievements:")
+    # Updated regex to better match actual metrics and exclude contact info
+    quant_matches = re.finditer(
+        r'(?:(?:\$|USD|EUR)?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?(?:\s*(?:million|billion|k|m|b|%))|'
+        r'(?:increased|decreased|improved|reduced|grew|raised|managed|led|oversaw)(?:\s+\w+){0,5}\s+'
+        r'(?:by\s+)?(?:\$|USD|EUR)?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?(?:\s*(?:million|billion|k|m|b|%))?)',
+        text,
+        re.IGNORECASE
+    )
+
+    matches_found = []
+    contact_patterns = ['@', 'phone', 'tel', '+1', 'linkedin', '.com', '.net', '.org']
+    achievement_words = ['increased', 'decreased', 'improved', 'reduced', 'grew',
+                       'raised', 'managed', 'led', 'oversaw', 'achieved', 'delivered']
+
+    for match in quant_matches:
+        # Skip if it looks like contact info (phone numbers, emails, etc.)
+        if any(pattern in match.group().lower() for pattern in contact_patterns):
+            continue
+
+        # Get surrounding context
+        start = max(0, match.start() - 30)
+        end = min(len(text), match.end() + 30)
+        context = text[start:end].strip()
+
+        # Skip if context suggests it's not an achievement
+        if not any(word in context.lower() for word in achievement_words):
+            continue
+
+        matches_found.append(context)
+
+    if matches_found:
+        feedback.append("- Good use of metrics:")
+        for context in matches_found[:3]:  # Show top 3 metrics
+            feedback.append(f"  • \"{context}\"")
+    else:
+        feedback.append("- Add specific metrics to quantify your achievements")
+        feedback.append("- Example: deal sizes, percentage improvements, team size")
+
+    # Check formatting
+    if not re.search(r'\d{4}', text):  # Look for years
+        improvements.append("Add dates to experiences")
+    if not re.search(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}', text):
+        improvements.append("Include contact information")
+
+    if improvements:
+        feedback.append("Additional improvements:")
+        for improvement in improvements:
+            feedback.append(f"- {improvement}")
+
+    # 6. Bank-Specific Recommendations
+    feedback.append(f"\nRecommendations for {bank}'s {coverage} group:")
+    feedback.append(f"- Research recent {bank} deals in {coverage}")
+    feedback.append("- Network with alumni at the bank")
+    feedback.append(f"- Focus on {coverage}-specific technical skills")
+    feedback.append("- Prepare deal discussions relevant to the group")
+
+    # Create tailored summary
+    strengths = []
+    if found_keywords:
+        strengths.append(f"{coverage} experience")
+    if matches_found:
+        strengths.append("quantitative achievements")
+    if any(term in text for term in banking_terms["deal experience"]):
+        strengths.append("deal experience")
+
+    summary = f"Your profile shows {len(strengths)} key strengths for {bank}'s {coverage} group: "
+    summary += ", ".join(strengths) if strengths else "potential for development"
+    summary += ". Focus on " + (improvements[0].lower() if improvements else "gaining relevant experience") + "."
+
+    return f"Executive Summary:\n{summary}\n\nDetailed Feedback:\n" + "\n".join(feedback)
+
+
+def fuzz_texts(count: int, seed: int = 11) -> list:
+    """Random soup of keywords, metrics, overlapping fragments and case-folding edge cases."""
+    rnd = random.Random(seed)
+    vocab = KEYWORDS.keywords + [
+        'skilled', 'modeled', 'dealt', 'USD', 'EUR', '$', '%', 'million', 'billion', 'k', 'm', 'b', 'by',
+        '1,250', '3.5', '42', '2023', '+1', '@', '.com', 'phone', 'Increaſed', 'raıſed', 'İstanbul',
+        'ΣΑΣ', 'led to', 'grew by', 'x@y.io', '\n', '\t', '  ', 'Technical Skills', 'M&A', 'AI/ML'
+    ]
+    texts = []
+    for _ in range(count):
+        words = [rnd.choice(vocab) for _ in range(rnd.randint(0, 400))]
+        texts.append(''.join(word + rnd.choice(['', ' ', ' ', ', ', '\n']) for word in words))
+    return texts
+
+
+def load_resume(path: str) -> str:
+    if path.lower().endswith('.pdf'):
+        import PyPDF2
+        with open(path, 'rb') as file:
+            return ' '.join(page.extract_text() for page in PyPDF2.PdfReader(file).pages)
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def check_identical(texts: list) -> int:
+    mismatches = 0
+    for text in texts:
+        for bank in BANKS:
+            for coverage in COVERAGE_AREAS + ['Consumer Retail']:
+                if analyze_text(text, bank, coverage) != legacy_analyze(text, bank, coverage):
+                    mismatches += 1
+                    if mismatches <= 3:
+                        print(f"MISMATCH for {bank}/{coverage} on text starting {text[:60]!r}")
+    return mismatches
+
+
+def time_call(fn, text: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(text, 'Goldman Sachs', 'Technology')
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--resume', help="Also benchmark this .pdf or .txt resume")
+    parser.add_argument('--repeat', type=int, default=200, help="Calls per timing round (1-page)")
+    parser.add_argument('--fuzz', type=int, default=300, help="Random texts checked for identical output")
+    args = parser.parse_args()
+
+    samples = {'1 page': make_resume(1), '10 pages': make_resume(10)}
+    if args.resume:
+        samples[os.path.basename(args.resume)] = load_resume(args.resume)
+
+    mismatches = check_identical(list(samples.values()) + fuzz_texts(args.fuzz))
+    print(f"Identical output check: {'OK' if not mismatches else f'{mismatches} mismatches'}")
+
+    print(f"{'resume':<24}{'chars':>8}{'legacy ms':>12}{'engine ms':>12}{'speedup':>9}")
+    for name, text in samples.items():
+        repeat = max(1, args.repeat * 2000 // max(len(text), 2000))
+        legacy = time_call(legacy_analyze, text, repeat)
+        engine = time_call(analyze_text, text, repeat)
+        print(f"{name:<24}{len(text):>8}{legacy * 1000:>12.3f}{engine * 1000:>12.3f}{legacy / engine:>8.1f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark and import budgets for the web app.
+
+Starts fresh interpreters that import app, build it with create_app() and
+answer a first request through the test client, and reports the time from
+interpreter launch to that first response (median of --runs), both for a
+routes-only app and for a serving worker that starts its job workers and
+background services. It then times `python -X importtime -c "import app"`
+and checks the budgets below: modules a worker must not load until they are
+used, and the cumulative import time of the app's own modules. Exits
+non-zero if a budget is broken.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--scale 1.0]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded only by the code that needs them: PDF workers, the Zoom client and the IMAP listener
+DEFERRED_MODULES = ('PyPDF2', 'requests', 'imaplib')
+
+# Cumulative import time in ms (best of --runs); 'app (own)' excludes Flask itself
+IMPORT_BUDGETS_MS = {
+    'interview_system': 120,
+    'app (own)': 150,
+}
+
+CHILD = r"""
+import json, os, sys, time
+launched = float(sys.argv[1])
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import app as app_module
+t1 = time.perf_counter()
+app = app_module.create_app(start_services={serving})
+t2 = time.perf_counter()
+response = app.test_client().get('/get_booked_slots')
+t3 = time.perf_counter()
+report = {{
+    'status': response.status_code,
+    'import_ms': (t1 - t0) * 1000,
+    'create_ms': (t2 - t1) * 1000,
+    'request_ms': (t3 - t2) * 1000,
+    'first_response_ms': (time.time() - launched) * 1000,
+    'deferred_loaded': [m for m in {deferred!r} if m in sys.modules],
+}}
+print(json.dumps(report), flush=True)
+services = app.extensions['services']
+if services.started:
+    services.scheduler.stop(timeout=1)
+    services.interview_system.pdf_extractor.shutdown()
+os._exit(0)
+"""
+
+
+def child_env(workdir: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        'SECRET_KEY': 'bench',
+        'BOOKINGS_DB': os.path.join(workdir, 'bookings.db'),
+        'JOBS_DB': os.path.join(workdir, 'jobs.db'),
+        'LEADER_LOCK_FILE': os.path.join(workdir, 'background.lock'),
+        'MEETING_POOL_ENABLED': 'false',
+        'SLOT_STREAM_PORT': '0',
+        # Nothing listens here, so the cancellation job fails fast instead of reaching Gmail
+        'IMAP_HOST': '127.0.0.1',
+        'IMAP_PORT': '9',
+    })
+    return env
+
+
+def first_request(workdir: str, serving: bool) -> dict:
+    code = CHILD.format(root=ROOT, serving=serving, deferred=DEFERRED_MODULES)
+    # Fresh databases each run, so every run pays the schema setup a new deployment would
+    for name in os.listdir(workdir):
+        os.remove(os.path.join(workdir, name))
+    result = subprocess.run([sys.executable, '-c', code, repr(time.time())], cwd=workdir,
+                            env=child_env(workdir), capture_output=True, text=True, timeout=60)
+    lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+    if not lines:
+        raise RuntimeError(f"startup run failed:\n{result.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def import_times(workdir: str) -> dict:
+    """Cumulative import time in ms per module for `import app`."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import sys; sys.path.insert(0, {ROOT!r}); "
+                             "import app"], cwd=workdir, env=child_env(workdir), capture_output=True, text=True,
+                            timeout=60)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times.setdefault(name.strip(), int(cumulative) / 1000)
+    if 'app' not in times:
+        raise RuntimeError(f"importing app failed:\n{result.stderr[-2000:]}")
+    times['app (own)'] = times['app'] - times.get('flask', 0)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--runs', type=int, default=5, help="Interpreter launches per measurement")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply the import budgets, for slow machines")
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'app':<10}{'import':>10}{'create':>10}{'request':>10}{'first response':>16}")
+        for label, serving in (('routes', False), ('serving', True)):
+            runs = [first_request(workdir, serving) for _ in range(args.runs)]
+            median = {key: statistics.median(run[key] for run in runs)
+                      for key in ('import_ms', 'create_ms', 'request_ms', 'first_response_ms')}
+            print(f"{label:<10}{median['import_ms']:>8.0f}ms{median['create_ms']:>8.0f}ms"
+                  f"{median['request_ms']:>8.0f}ms{median['first_response_ms']:>14.0f}ms")
+            for run in runs:
+                if run['status'] != 200:
+                    print(f"CHECK FAILED: first request answered {run['status']} ({label})")
+                    failures += 1
+                    break
+            loaded = sorted({module for run in runs for module in run['deferred_loaded']})
+            # A lone serving worker wins the election, and its cancellation listener needs imaplib
+            if loaded and not serving:
+                print(f"CHECK FAILED: {', '.join(loaded)} loaded before first use ({label})")
+                failures += 1
+
+        best = {}
+        for _ in range(args.runs):
+            for module, ms in import_times(workdir).items():
+                best[module] = min(ms, best.get(module, ms))
+    print(f"\n{'module':<20}{'import':>10}{'budget':>10}")
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        budget *= args.scale
+        spent = best.get(module)
+        over = spent is not None and spent > budget
+        print(f"{module:<20}{spent or 0:>8.1f}ms{budget:>8.0f}ms{'  OVER BUDGET' if over else ''}")
+        failures += over
+    for module in DEFERRED_MODULES:
+        if module in best:
+            print(f"CHECK FAILED: `import app` loads {module}")
+            failures += 1
+
+    print(f"\nStartup checks: {'OK' if not failures else 'FAILED'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+In-process fake Zoom, SMTP and IMAP servers for benchmarks and load tests.
+
+Each server listens on 127.0.0.1, speaks just enough of its protocol for
+zoom_client, mail_transport and cancellation_listener, and records what it
+received. A FaultPlan adds latency to every request or command and fails a
+share of them: Zoom answers 429 or 503, SMTP rejects the message with 451,
+IMAP answers NO. Run directly to serve all three and print the environment
+that points the app at them.
+
+Usage:
+    python benchmarks/fakes.py [--latency 0.05] [--error-rate 0.0]
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import select
+import socketserver
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional
+
+
+class FaultPlan:
+    """
+    Latency and failures a fake server injects.
+
+    Attributes:
+        latency (float): Seconds added to every request or command
+        jitter (float): Up to this many random seconds added on top
+        error_rate (float): Share of requests or commands that fail, 0 to 1
+        injected (int): Failures injected so far
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.injected = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> None:
+        with self._lock:
+            extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+        if self.latency + extra > 0:
+            time.sleep(self.latency + extra)
+
+    def should_fail(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            self.injected += failed
+        return failed
+
+    def choice(self, options):
+        with self._lock:
+            return self._random.choice(options)
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _FakeServer:
+    """Runs a socketserver on a background thread; use as a context manager."""
+
+    def __init__(self, server):
+        self.server = server
+        self.host, self.port = server.server_address[:2]
+        self._thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.1},
+                                        name=type(self).__name__, daemon=True)
+
+    def start(self) -> '_FakeServer':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FakeZoomServer(_FakeServer):
+    """
+    Zoom REST API stand-in: OAuth tokens and meeting create, update and delete.
+
+    Attributes:
+        faults (FaultPlan): Latency and failures; failed calls answer 429 or 503
+        live (set): Ids of meetings created and not deleted
+        calls (dict): Requests received per operation
+    """
+
+    def __init__(self, faults: Optional[FaultPlan] = None, port: int = 0):
+        self.faults = faults or FaultPlan()
+        self.live = set()
+        self.calls = defaultdict(int)
+        self._ids = itertools.count(81000000000)
+        self._tokens = set()
+        self._lock = threading.Lock()
+        server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        server.daemon_threads = True
+        super().__init__(server)
+
+    @property
+    def api_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v2"
+
+    @property
+    def oauth_url(self) -> str:
+        return f"http://{self.host}:{self.port}/oauth/token"
+
+    def _handler(self):
+        zoom = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like api.zoom.us
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: Optional[Dict] = None, headers: Optional[Dict] = None):
+                data = json.dumps(body).encode() if body is not None else b''
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if data:
+                    self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self, method: str):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                path = self.path.split('?', 1)[0]
+                operation = zoom._operation(method, path)
+                with zoom._lock:
+                    zoom.calls[operation] += 1
+                zoom.faults.delay()
+                if operation == 'unknown':
+                    return self._reply(404, {'code': 404, 'message': 'Not found'})
+                if zoom.faults.should_fail():
+                    if zoom.faults.choice((True, False)):
+                        return self._reply(429, {'code': 429, 'message': 'Too many requests'},
+                                           {'Retry-After': '1'})
+                    return self._reply(503, {'code': 503, 'message': 'Injected failure'})
+                if operation == 'oauth_token':
+                    token = f"fake-{next(zoom._ids)}"
+                    with zoom._lock:
+                        zoom._tokens.add(token)
+                    return self._reply(200, {'access_token': token, 'token_type': 'bearer', 'expires_in': 3600})
+                token = self.headers.get('Authorization', '').replace('Bearer ', '', 1)
+                with zoom._lock:
+                    authorized = token in zoom._tokens
+                if not authorized:
+                    return self._reply(401, {'code': 124, 'message': 'Invalid access token.'})
+                return zoom._meeting_call(self, operation, path)
+
+            def do_POST(self):
+                self._handle('POST')
+
+            def do_PATCH(self):
+                self._handle('PATCH')
+
+            def do_DELETE(self):
+                self._handle('DELETE')
+
+        return Handler
+
+    @staticmethod
+    def _operation(method: str, path: str) -> str:
+        if method == 'POST' and path == '/oauth/token':
+            return 'oauth_token'
+        if method == 'POST' and re.fullmatch(r'/v2/users/[^/]+/meetings', path):
+            return 'create_meeting'
+        if method in ('PATCH', 'DELETE') and re.fullmatch(r'/v2/meetings/\d+', path):
+            return 'update_meeting' if method == 'PATCH' else 'delete_meeting'
+        return 'unknown'
+
+    def _meeting_call(self, handler, operation: str, path: str) -> None:
+        if operation == 'create_meeting':
+            meeting_id = next(self._ids)
+            with self._lock:
+                self.live.add(str(meeting_id))
+            return handler._reply(201, {'id': meeting_id, 'password': 'fake',
+                                        'join_url': f"https://zoom.invalid/j/{meeting_id}"})
+        meeting_id = path.rsplit('/', 1)[1]
+        with self._lock:
+            known = meeting_id in self.live
+            if operation == 'delete_meeting':
+                self.live.discard(meeting_id)
+        handler._reply(204 if known else 404, None if known else {'code': 3001, 'message': 'Meeting not found'})
+
+
+class Delivery(NamedTuple):
+    """A message the fake SMTP server accepted."""
+    received_at: float
+    recipient: str
+    subject: str
+
+
+class FakeSMTPServer(_FakeServer):
+    """
+    SMTP stand-in accepting any AUTH PLAIN login, without TLS.
+
+    Attributes:
+        faults (FaultPlan): Latency and failures; a failed message is refused with 451
+        deliveries (list): Delivery for every accepted message, per recipient
+        sessions (int): Connections opened
+    """
+
+    SUBJECT = re.compile(rb'^Subject: (.*)$', re.MULTILINE | re.IGNORECASE)
+
+    def __init__(self, faults: Optional[FaultPlan] = None, port: int = 0):
+        self.faults = faults or FaultPlan()
+        self.deliveries = []
+        self.sessions = 0
+        self._lock = threading.Lock()
+        super().__init__(_ThreadingTCPServer(('127.0.0.1', port), self._handler()))
+
+    def delivered_to(self, recipient: str) -> List[Delivery]:
+        with self._lock:
+            return [d for d in self.deliveries if d.recipient == recipient]
+
+    def _handler(self):
+        smtp = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str) -> None:
+                self.wfile.write(line.encode() + b'\r\n')
+
+            def handle(self):
+                with smtp._lock:
+                    smtp.sessions += 1
+                self.reply('220 fake.smtp ESMTP ready')
+                recipients = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode('ascii', 'replace').strip()
+                    verb = command.split(' ', 1)[0].upper()
+                    smtp.faults.delay()
+                    if verb == 'EHLO':
+                        self.wfile.write(b'250-fake.smtp\r\n250-8BITMIME\r\n250 AUTH PLAIN\r\n')
+                    elif verb == 'HELO':
+                        self.reply('250 fake.smtp')
+                    elif verb == 'AUTH':
+                        self.reply('235 2.7.0 Authentication successful')
+                    elif verb == 'MAIL':
+                        recipients = []
+                        self.reply('250 2.1.0 OK')
+                    elif verb == 'RCPT':
+                        recipients.append(command.split(':', 1)[1].strip().strip('<>'))
+                        self.reply('250 2.1.5 OK')
+                    elif verb == 'DATA':
+                        self.reply('354 End data with <CR><LF>.<CR><LF>')
+                        data = self._read_data()
+                        if smtp.faults.should_fail():
+                            self.reply('451 4.3.0 Injected failure')
+                        else:
+                            smtp._accept(recipients, data)
+                            self.reply('250 2.0.0 Queued')
+                        recipients = []
+                    elif verb in ('RSET', 'NOOP'):
+                        recipients = [] if verb == 'RSET' else recipients
+                        self.reply('250 2.0.0 OK')
+                    elif verb == 'QUIT':
+                        self.reply('221 2.0.0 Bye')
+                        return
+                    else:
+                        self.reply('502 5.5.2 Command not implemented')
+
+            def _read_data(self) -> bytes:
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line == b'.\r\n':
+                        return b''.join(lines)
+                    lines.append(line[1:] if line.startswith(b'..') else line)
+
+        return Handler
+
+    def _accept(self, recipients: List[str], data: bytes) -> None:
+        now = time.monotonic()
+        match = self.SUBJECT.search(data)
+        subject = match.group(1).strip().decode('utf-8', 'replace') if match else ''
+        with self._lock:
+            self.deliveries.extend(Delivery(now, recipient, subject) for recipient in recipients)
+
+
+class FakeIMAPServer(_FakeServer):
+    """
+    IMAP4rev1 stand-in with one mailbox, UID commands and IDLE.
+
+    Attributes:
+        faults (FaultPlan): Latency and failures; failed SEARCH, FETCH and STORE commands answer NO
+        idle (bool): Whether IDLE is advertised; without it the listener polls
+        commands (dict): Commands received per name
+    """
+
+    UIDVALIDITY = 1
+
+    def __init__(self, faults: Optional[FaultPlan] = None, idle: bool = True, port: int = 0):
+        self.faults = faults or FaultPlan()
+        self.idle = idle
+        self.commands = defaultdict(int)
+        self._messages = []  # [uid, seen, raw]
+        self._changed = threading.Condition()
+        super().__init__(_ThreadingTCPServer(('127.0.0.1', port), self._handler()))
+
+    def deliver(self, raw: bytes) -> int:
+        """Add a message to the mailbox; IDLE sessions hear about it at once. Returns its UID."""
+        with self._changed:
+            uid = len(self._messages) + 1
+            self._messages.append([uid, False, raw])
+            self._changed.notify_all()
+        return uid
+
+    def seen(self) -> int:
+        with self._changed:
+            return sum(1 for _, seen, _ in self._messages if seen)
+
+    def _search(self, start: int, criteria: str) -> List[int]:
+        subject = re.search(r'SUBJECT "([^"]*)"', criteria, re.IGNORECASE)
+        unseen = 'UNSEEN' in criteria.upper()
+        with self._changed:
+            return [uid for uid, seen, raw in self._messages
+                    if uid >= start and not (unseen and seen)
+                    and (subject is None or subject.group(1).encode().lower() in raw.lower())]
+
+    def _handler(self):
+        imap = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def send(self, line) -> None:
+                self.wfile.write((line.encode() if isinstance(line, str) else line) + b'\r\n')
+
+            def handle(self):
+                self.exists = 0  # Mailbox size this session was last told
+                self.send('* OK fake IMAP4rev1 ready')
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    tag, _, rest = line.decode('utf-8', 'replace').strip().partition(' ')
+                    command, _, args = rest.partition(' ')
+                    command = command.upper()
+                    if command == 'UID':
+                        command, _, args = args.partition(' ')
+                        command = f"UID {command.upper()}"
+                    with imap._changed:
+                        imap.commands[command] += 1
+                    imap.faults.delay()
+                    if command in ('UID SEARCH', 'UID FETCH', 'UID STORE') and imap.faults.should_fail():
+                        self.send(f"{tag} NO [UNAVAILABLE] Injected failure")
+                        continue
+                    if command == 'LOGOUT':
+                        self.send('* BYE fake IMAP logging out')
+                        self.send(f"{tag} OK LOGOUT completed")
+                        return
+                    handler = getattr(self, 'cmd_' + command.replace(' ', '_').lower(), None)
+                    if handler is None:
+                        self.send(f"{tag} BAD Unknown command")
+                    else:
+                        handler(tag, args)
+
+            def cmd_capability(self, tag, args):
+                self.send('* CAPABILITY IMAP4rev1 AUTH=PLAIN' + (' IDLE' if imap.idle else ''))
+                self.send(f"{tag} OK CAPABILITY completed")
+
+            def cmd_login(self, tag, args):
+                self.send(f"{tag} OK LOGIN completed")
+
+            def cmd_noop(self, tag, args):
+                self.send(f"{tag} OK NOOP completed")
+
+            def cmd_select(self, tag, args):
+                with imap._changed:
+                    count = self.exists = len(imap._messages)
+                self.send(f"* {count} EXISTS")
+                self.send('* 0 RECENT')
+                self.send(f"* OK [UIDVALIDITY {imap.UIDVALIDITY}] UIDs valid")
+                self.send(f"* OK [UIDNEXT {count + 1}] Predicted next UID")
+                self.send(f"{tag} OK [READ-WRITE] SELECT completed")
+
+            def cmd_uid_search(self, tag, args):
+                start = re.match(r'UID (\d+):\*', args)
+                uids = imap._search(int(start.group(1)) if start else 1, args)
+                self.send('* SEARCH' + ''.join(f" {uid}" for uid in uids))
+                self.send(f"{tag} OK SEARCH completed")
+
+            def cmd_uid_fetch(self, tag, args):
+                wanted = {int(uid) for uid in args.split(' ', 1)[0].split(',') if uid.isdigit()}
+                with imap._changed:
+                    found = [(uid, raw) for uid, _, raw in imap._messages if uid in wanted]
+                for uid, raw in found:
+                    self.send(f"* {uid} FETCH (UID {uid} RFC822 {{{len(raw)}}}".encode() + b'\r\n' + raw + b')')
+                self.send(f"{tag} OK FETCH completed")
+
+            def cmd_uid_store(self, tag, args):
+                wanted = {int(uid) for uid in args.split(' ', 1)[0].split(',') if uid.isdigit()}
+                with imap._changed:
+                    for message in imap._messages:
+                        if message[0] in wanted and '\\SEEN' in args.upper():
+                            message[1] = True
+                self.send(f"{tag} OK STORE completed")
+
+            def cmd_idle(self, tag, args):
+                # Mail that arrived since the session last heard is announced at once, as real servers do
+                self.send('+ idling')
+                while True:
+                    with imap._changed:
+                        imap._changed.wait_for(lambda: len(imap._messages) > self.exists, timeout=0.05)
+                        count = len(imap._messages)
+                    if count > self.exists:
+                        self.send(f"* {count} EXISTS")
+                        self.exists = count
+                    readable, _, _ = select.select([self.connection], [], [], 0)
+                    if readable:
+                        line = self.rfile.readline()
+                        if not line or line.strip().upper() == b'DONE':
+                            self.send(f"{tag} OK IDLE terminated")
+                            return
+
+        return Handler
+
+
+def cancellation_email(sender: str, recipient: str, date: str, time_slot: str) -> bytes:
+    """A "CANCEL INTERVIEW" email as a candidate would send it."""
+    return (f"From: {sender}\r\nTo: {recipient}\r\nSubject: CANCEL INTERVIEW\r\n"
+            f"Content-Type: text/plain; charset=utf-8\r\n\r\n"
+            f"Please cancel my interview.\r\nDate: {date}\r\nTime: {time_slot}\r\n").encode()
+
+
+def app_environment(zoom: FakeZoomServer, smtp: FakeSMTPServer, imap: FakeIMAPServer) -> Dict[str, str]:
+    """Environment variables that point the app's clients at the fakes."""
+    return {
+        'ZOOM_ACCOUNT_ID': 'fake-account',
+        'ZOOM_CLIENT_ID': 'fake-client',
+        'ZOOM_CLIENT_SECRET': 'fake-secret',
+        'ZOOM_USER_ID': 'me',
+        'ZOOM_API_BASE_URL': zoom.api_url,
+        'ZOOM_OAUTH_URL': zoom.oauth_url,
+        'EMAIL_ADDRESS': 'interviews@example.com',
+        'EMAIL_PASSWORD': 'fake-password',
+        'SMTP_HOST': smtp.host,
+        'SMTP_PORT': str(smtp.port),
+        'SMTP_USE_TLS': 'false',
+        'IMAP_HOST': imap.host,
+        'IMAP_PORT': str(imap.port),
+        'IMAP_USE_SSL': 'false',
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds added to every request or command")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests or commands that fail")
+    parser.add_argument('--no-idle', action='store_true', help="Don't advertise IMAP IDLE")
+    args = parser.parse_args()
+
+    def plan():
+        return FaultPlan(args.latency, error_rate=args.error_rate)
+
+    with FakeZoomServer(plan()) as zoom, FakeSMTPServer(plan()) as smtp, \
+            FakeIMAPServer(plan(), idle=not args.no_idle) as imap:
+        for name, value in app_environment(zoom, smtp, imap).items():
+            print(f"export {name}={value}")
+        print("# Serving until interrupted", flush=True)
+        try:
+            while True:
+                time.sleep(5)
+                print(f"# zoom {dict(zoom.calls)} | smtp {len(smtp.deliveries)} delivered | "
+                      f"imap {dict(imap.commands)}", flush=True)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Load test of the production server against fake Zoom, SMTP and IMAP servers.
+
+Starts the fakes from fakes.py in this process and gunicorn (gunicorn.conf.py,
+fresh databases) in a child process pointed at them, then runs each scenario
+open-loop at --rps for --duration seconds:
+
+    schedule        POST /schedule with a fresh candidate and resume
+    booked_slots    GET /get_booked_slots, every other poll revalidating its ETag
+    view_bookings   GET /view_bookings
+    cancellations   "CANCEL INTERVIEW" emails delivered to the IMAP mailbox
+
+Latency counts from when a request was due, not when a client thread got to
+it, so a server that falls behind shows it. Bookings are followed until the
+invite email reaches the fake SMTP server and cancellations until their
+confirmation does; those end-to-end times cover the job workers, Zoom, IMAP
+and SMTP. Reports throughput, p50/p95/p99 and error rates, and exits
+non-zero if a scenario's error rate exceeds --max-error-rate or a booking
+or cancellation never got its email.
+
+Usage:
+    python benchmarks/load_test.py [--scenario schedule booked_slots view_bookings cancellations]
+        [--rps 10] [--duration 10] [--workers 2] [--zoom-latency 0.1] [--smtp-latency 0.02]
+        [--imap-latency 0.005] [--error-rate 0.0] [--json results.json]
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import BOOKING_HORIZON_DAYS, TIME_SLOTS
+from fakes import FakeIMAPServer, FakeSMTPServer, FakeZoomServer, FaultPlan, app_environment, cancellation_email
+
+SCENARIOS = ('schedule', 'booked_slots', 'view_bookings', 'cancellations')
+INVITE_SUBJECT = 'Interview Details'
+CANCELLED_SUBJECT = 'Interview Cancellation Confirmation'
+INTERVIEW_TYPES = ('Coffee Chat', 'First Round', 'Superday')
+RESUME = b"""JORDAN TAYLOR
+EXPERIENCE
+Investment Banking Summer Analyst
+Built a three-statement model and DCF for a $450 million SaaS acquisition
+Analyzed comps and precedent transactions for a $1.2B Fintech merger
+SKILLS: Excel, PowerPoint, Capital IQ, Bloomberg
+"""
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(math.ceil(pct / 100 * len(ordered)) - 1, 0))]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    total = len(latencies) + errors
+    return {
+        'requests': total,
+        'errors': errors,
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'throughput': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        **{f"p{p}_ms": round(percentile(latencies, p) * 1000, 1) if latencies else None for p in (50, 95, 99)}
+    }
+
+
+class Recorder:
+    """Latencies of successful requests and a count of failed ones, per scenario."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, scenario: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.latencies.setdefault(scenario, []).append(latency)
+            else:
+                self.errors[scenario] = self.errors.get(scenario, 0) + 1
+
+
+class HTTPClient:
+    """One keep-alive connection per thread to the server under test."""
+
+    def __init__(self, host: str, port: int, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[Dict] = None) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        for attempt in range(2):
+            conn = getattr(self._local, 'conn', None)
+            if conn is None:
+                conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                return response.status, response.headers, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # A keep-alive connection the server closed; retry once on a new one
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+
+
+def multipart(fields: Dict[str, str], filename: str, content: bytes) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = [f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+             for name, value in fields.items()]
+    parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="resume"; filename="{filename}"\r\n'
+                 f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class Candidates:
+    """Hands out slots with free seats and unique candidate emails, and tracks what was booked."""
+
+    def __init__(self, client: HTTPClient, resume: bytes, resume_name: str):
+        self.client = client
+        self.resume = resume
+        self.resume_name = resume_name
+        status, _, body = client.request('GET', '/get_booked_slots')
+        if status != 200:
+            raise RuntimeError(f"/get_booked_slots answered {status}")
+        seats = [(date, t, n) for date, day in sorted(json.loads(body).items()) for t, n in day['seats'].items()]
+        # Round-robin over slots so concurrent bookings rarely contend for one slot
+        self._slots = iter([(date, t) for round_ in range(max((n for *_, n in seats), default=0))
+                            for date, t, n in seats if n > round_])
+        self._numbers = itertools.count()
+        self._lock = threading.Lock()
+        self.booked = []  # (email, date, time, submitted_at)
+
+    def book(self) -> bool:
+        with self._lock:
+            n = next(self._numbers)
+            date, slot_time = next(self._slots)
+        email = f"load-{n}@example.com"
+        fields = {'email': email, 'bank': 'Goldman Sachs', 'coverage': 'Technology',
+                  'interview_type': INTERVIEW_TYPES[n % len(INTERVIEW_TYPES)],
+                  'interview_date': date, 'interview_time': slot_time}
+        # A unique trailer per upload keeps the resume cache from answering every analysis
+        body, content_type = multipart(fields, self.resume_name, self.resume + f"\n% load test {n}\n".encode())
+        submitted_at = time.monotonic()
+        status, headers, _ = self.client.request('POST', '/schedule', body, {'Content-Type': content_type})
+        ok = status == 302 and 'job=' in headers.get('Location', '')
+        if ok:
+            with self._lock:
+                self.booked.append((email, date, slot_time, submitted_at))
+        return ok
+
+
+def open_loop(name: str, rps: float, duration: float, fire: Callable[[], bool], pool: ThreadPoolExecutor,
+              recorder: Recorder) -> list:
+    """Start fire() rps times a second for duration seconds, on schedule whether or not earlier calls finished."""
+    def run(due: float) -> None:
+        try:
+            ok = fire()
+        except Exception:
+            ok = False
+        recorder.record(name, time.monotonic() - due, ok)
+
+    futures = []
+    started = time.monotonic()
+    for n in range(int(rps * duration)):
+        due = started + n / rps
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        futures.append(pool.submit(run, due))
+    return futures
+
+
+def wait_for_emails(smtp: FakeSMTPServer, expected: Dict[str, Tuple[float, str]], timeout: float) -> Dict:
+    """
+    Wait until every recipient got a message with the expected subject.
+
+    Args:
+        expected: recipient -> (time the work started, subject fragment)
+
+    Returns:
+        dict: 'latencies' for arrived messages, 'missing' and 'duplicates' counts
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        arrived = {}
+        for delivery in list(smtp.deliveries):
+            wanted = expected.get(delivery.recipient)
+            if wanted and wanted[1] in delivery.subject:
+                arrived.setdefault(delivery.recipient, []).append(delivery.received_at)
+        if len(arrived) == len(expected) or time.monotonic() > deadline:
+            break
+        time.sleep(0.2)
+    return {
+        'latencies': [min(times) - expected[recipient][0] for recipient, times in arrived.items()],
+        'missing': len(expected) - len(arrived),
+        'duplicates': sum(len(times) - 1 for times in arrived.values())
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir: str, fakes_env: Dict[str, str], args, capacity: int) -> Tuple[subprocess.Popen, int]:
+    """Start gunicorn on a free port with fresh databases, and wait until it answers."""
+    port = free_port()
+    env = {
+        'IMAP_POLL_MIN_SECONDS': '1',
+        'SLOT_STREAM_PORT': '0',
+        **os.environ,
+        **fakes_env,
+        'SECRET_KEY': 'load-test',
+        'BOOKINGS_DB': os.path.join(workdir, 'bookings.db'),
+        'JOBS_DB': os.path.join(workdir, 'jobs.db'),
+        'LEADER_LOCK_FILE': os.path.join(workdir, 'background.lock'),
+        'METRICS_DIR': os.path.join(workdir, 'metrics'),
+        'WEB_PORT': str(port),
+        'WEB_WORKERS': str(args.workers),
+        'WEB_THREADS': str(args.threads),
+        'SLOT_CAPACITY': str(capacity),
+        'MEETING_POOL_ENABLED': 'true' if args.meeting_pool else 'false',
+    }
+    log = open(args.server_log or os.path.join(workdir, 'server.log'), 'wb')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:create_app()'],
+                              cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    client = HTTPClient('127.0.0.1', port, timeout=5)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            break
+        try:
+            if client.request('GET', '/get_booked_slots')[0] == 200:
+                return server, port
+        except OSError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    with open(log.name, 'rb') as file:
+        raise RuntimeError(f"server did not start:\n{file.read()[-3000:].decode(errors='replace')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--scenario', nargs='+', choices=SCENARIOS, default=list(SCENARIOS),
+                        help="Scenarios to run together")
+    parser.add_argument('--rps', type=float, default=10, help="Target requests per second of each scenario")
+    parser.add_argument('--duration', type=float, default=10, help="Seconds each scenario runs")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument('--threads', type=int, default=8, help="Request threads per worker")
+    parser.add_argument('--concurrency', type=int, default=64, help="Client threads issuing requests")
+    parser.add_argument('--zoom-latency', type=float, default=0.1, help="Seconds per fake Zoom request")
+    parser.add_argument('--smtp-latency', type=float, default=0.02, help="Seconds per fake SMTP command")
+    parser.add_argument('--imap-latency', type=float, default=0.005, help="Seconds per fake IMAP command")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Share of Zoom requests, SMTP messages and IMAP commands that fail")
+    parser.add_argument('--no-idle', action='store_true', help="Make the listener poll IMAP instead of using IDLE")
+    parser.add_argument('--meeting-pool', action='store_true', help="Pre-create Zoom meetings for open slots")
+    parser.add_argument('--resume', help="Resume file to upload (PDF or TXT); defaults to a small text resume")
+    parser.add_argument('--drain-timeout', type=float, default=90,
+                        help="Seconds to wait for outstanding invite and cancellation emails")
+    parser.add_argument('--max-error-rate', type=float, default=0.01, help="Highest acceptable HTTP error rate")
+    parser.add_argument('--seed', type=int, default=1, help="Seed of the injected failures")
+    parser.add_argument('--json', help="Also write the results to this file")
+    parser.add_argument('--server-log', help="Keep the server's output in this file")
+    args = parser.parse_args()
+
+    if args.resume:
+        with open(args.resume, 'rb') as file:
+            resume, resume_name = file.read(), os.path.basename(args.resume)
+    else:
+        resume, resume_name = RESUME, 'resume.txt'
+
+    requests_per_scenario = int(args.rps * args.duration)
+    seeded = requests_per_scenario if 'cancellations' in args.scenario else 0
+    if 'view_bookings' in args.scenario:
+        seeded = max(seeded, 50)  # A full first page
+    bookings = seeded + (requests_per_scenario if 'schedule' in args.scenario else 0)
+
+    zoom = FakeZoomServer(FaultPlan(args.zoom_latency, args.zoom_latency / 2, args.error_rate, args.seed)).start()
+    smtp = FakeSMTPServer(FaultPlan(args.smtp_latency, 0, args.error_rate, args.seed + 1)).start()
+    imap = FakeIMAPServer(FaultPlan(args.imap_latency, 0, args.error_rate, args.seed + 2),
+                          idle=not args.no_idle).start()
+    fakes_env = app_environment(zoom, smtp, imap)
+
+    failures = 0
+    results = {'config': vars(args), 'scenarios': {}, 'end_to_end': {}}
+    with tempfile.TemporaryDirectory() as workdir:
+        # Seats for every booking the run makes, spread over the bookable window
+        capacity = max(1, math.ceil(bookings / (BOOKING_HORIZON_DAYS * len(TIME_SLOTS))) + 1)
+        server, port = start_server(workdir, fakes_env, args, capacity)
+        try:
+            client = HTTPClient('127.0.0.1', port)
+            candidates = Candidates(client, resume, resume_name)
+            recorder = Recorder()
+            print(f"Server: {args.workers} workers x {args.threads} threads, {capacity} interviewers per slot; "
+                  f"fakes: zoom {args.zoom_latency * 1000:.0f}ms, smtp {args.smtp_latency * 1000:.0f}ms, "
+                  f"imap {args.imap_latency * 1000:.0f}ms, {args.error_rate:.0%} failures")
+
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                if seeded:
+                    started = time.monotonic()
+                    wait([pool.submit(candidates.book) for _ in range(seeded)])
+                    seeds = list(candidates.booked)
+                    report = wait_for_emails(smtp, {email: (at, INVITE_SUBJECT) for email, _, _, at in seeds},
+                                             args.drain_timeout)
+                    print(f"Seeded {len(seeds)} of {seeded} bookings in {time.monotonic() - started:.1f}s, "
+                          f"{report['missing']} without an invite")
+                    candidates.booked.clear()
+                else:
+                    seeds = []
+
+                etags = {}
+
+                def booked_slots() -> bool:
+                    n = etags['n'] = etags.get('n', 0) + 1
+                    headers = {'If-None-Match': etags['etag']} if n % 2 and 'etag' in etags else {}
+                    status, response_headers, _ = client.request('GET', '/get_booked_slots', headers=headers)
+                    if response_headers.get('ETag'):
+                        etags['etag'] = response_headers['ETag']
+                    return status in (200, 304)
+
+                def view_bookings() -> bool:
+                    return client.request('GET', '/view_bookings')[0] == 200
+
+                cancellations = {}
+                to_cancel = iter(seeds)
+                cancel_lock = threading.Lock()
+
+                def cancel() -> bool:
+                    with cancel_lock:
+                        email, date, slot_time, _ = next(to_cancel)
+                        cancellations[email] = (time.monotonic(), CANCELLED_SUBJECT)
+                    imap.deliver(cancellation_email(email, fakes_env['EMAIL_ADDRESS'], date, slot_time))
+                    return True
+
+                fire = {'schedule': candidates.book, 'booked_slots': booked_slots,
+                        'view_bookings': view_bookings, 'cancellations': cancel}
+                futures = []
+                started = time.monotonic()
+                drivers = [threading.Thread(target=lambda name=name: futures.extend(
+                    open_loop(name, args.rps, args.duration, fire[name], pool, recorder)))
+                    for name in args.scenario]
+                for driver in drivers:
+                    driver.start()
+                for driver in drivers:
+                    driver.join()
+                wait(futures)
+                elapsed = time.monotonic() - started
+
+            print(f"\n{'scenario':<16}{'requests':>10}{'errors':>9}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}")
+            for name in args.scenario:
+                if name == 'cancellations':
+                    continue  # Nothing to time on delivery; see the end-to-end table
+                summary = summarize(recorder.latencies.get(name, []), recorder.errors.get(name, 0), elapsed)
+                results['scenarios'][name] = summary
+                print(f"{name:<16}{summary['requests']:>10}{summary['error_rate']:>8.1%}{summary['throughput']:>9.1f}"
+                      + ''.join(f"{summary[k]:>8.1f}ms" if summary[k] is not None else f"{'-':>10}"
+                                for k in ('p50_ms', 'p95_ms', 'p99_ms')))
+                if summary['error_rate'] > args.max_error_rate:
+                    print(f"CHECK FAILED: {name} error rate {summary['error_rate']:.1%} is above "
+                          f"{args.max_error_rate:.1%}")
+                    failures += 1
+
+            pipelines = {}
+            if 'schedule' in args.scenario:
+                pipelines['booking -> invite'] = {email: (at, INVITE_SUBJECT)
+                                                  for email, _, _, at in candidates.booked}
+            if 'cancellations' in args.scenario:
+                pipelines['cancel -> confirmation'] = cancellations
+            if pipelines:
+                print(f"\n{'end to end':<24}{'count':>7}{'missing':>9}{'p50':>10}{'p95':>10}{'p99':>10}")
+            for name, expected in pipelines.items():
+                report = wait_for_emails(smtp, expected, args.drain_timeout)
+                summary = summarize(report['latencies'], report['missing'], elapsed)
+                summary['duplicates'] = report['duplicates']
+                results['end_to_end'][name] = summary
+                print(f"{name:<24}{len(expected):>7}{report['missing']:>9}"
+                      + ''.join(f"{summary[k] / 1000:>9.2f}s" if summary[k] is not None else f"{'-':>10}"
+                                for k in ('p50_ms', 'p95_ms', 'p99_ms')))
+                if report['missing'] or report['duplicates']:
+                    print(f"CHECK FAILED: {name}: {report['missing']} emails never arrived, "
+                          f"{report['duplicates']} sent twice")
+                    failures += 1
+
+            results['fakes'] = {
+                'zoom_calls': dict(zoom.calls), 'zoom_failures': zoom.faults.injected,
+                'smtp_sessions': smtp.sessions, 'smtp_messages': len(smtp.deliveries),
+                'smtp_failures': smtp.faults.injected, 'imap_commands': dict(imap.commands),
+                'imap_failures': imap.faults.injected,
+            }
+            print(f"\nZoom: {sum(zoom.calls.values())} requests, {zoom.faults.injected} failed | "
+                  f"SMTP: {len(smtp.deliveries)} messages over {smtp.sessions} sessions, "
+                  f"{smtp.faults.injected} refused | IMAP: {sum(imap.commands.values())} commands, "
+                  f"{imap.faults.injected} failed")
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server.kill()
+            zoom.stop()
+            smtp.stop()
+            imap.stop()
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+    print(f"\nLoad test checks: {'OK' if not failures else 'FAILED'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
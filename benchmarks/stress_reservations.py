@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for slot reservations.
+
+Many threads (and processes) race to book the same slots. Every slot must end
+up with exactly one winner, and no losing attempt may leave a Zoom meeting
+behind. Exits non-zero if either invariant is broken.
+
+Usage:
+    python benchmarks/stress_reservations.py [--threads 32] [--processes 4] [--slots 20]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from booking_store import SQLiteBookingStore
+from interview_system import InterviewSystem
+from config import INTERVIEW_DURATIONS, TIME_SLOTS
+from slot_model import SlotModel
+
+# One interviewer per slot, so every slot has exactly one winner
+SLOT_MODEL = SlotModel(TIME_SLOTS, capacity=1, durations=INTERVIEW_DURATIONS, horizon_days=366)
+
+
+class CountingZoomClient:
+    """Stand-in Zoom client that simulates API latency and counts live meetings."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.live = set()
+        self.next_id = 0
+
+    def create_meeting(self, start_time=None, duration=60):
+        time.sleep(self.latency)
+        with self.lock:
+            self.next_id += 1
+            meeting_id = str(self.next_id)
+            self.live.add(meeting_id)
+        return {'url': f'https://zoom.invalid/{meeting_id}', 'meeting_id': meeting_id, 'password': ''}
+
+    def delete_meeting(self, meeting_id):
+        with self.lock:
+            self.live.discard(meeting_id)
+
+
+def make_slots(count: int):
+    # Only offered dates can be booked; bookable_dates() skips weekends and blackout dates
+    slots = []
+    for day in SLOT_MODEL.bookable_dates():
+        slots.extend((day.isoformat(), t) for t in TIME_SLOTS)
+        if len(slots) >= count:
+            break
+    return slots[:count]
+
+
+def thread_race(db_path: str, threads: int, slots, latency: float) -> bool:
+    system = InterviewSystem(store=SQLiteBookingStore(db_path), slot_model=SLOT_MODEL)
+    system.zoom_client = CountingZoomClient(latency)
+    wins = Counter()
+
+    def candidate(n: int):
+        order = list(slots)
+        random.shuffle(order)
+        for date, slot_time in order:
+            try:
+                system.schedule_interview(
+                    email=f"candidate{n}@example.com", date=date, time=slot_time,
+                    bank="Goldman Sachs", coverage="Technology", interview_type="First Round"
+                )
+                wins[(date, slot_time)] += 1
+            except Exception as e:
+                if "already booked" not in str(e):
+                    raise
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(candidate, range(threads)))
+    elapsed = time.perf_counter() - started
+
+    stored = Counter(system.store.booked_slots())
+    booked_ids = {b['zoom_link']['meeting_id'] for _, _, b in system.store.iter_bookings()}
+    ok = (all(wins[s] == 1 for s in slots) and all(stored[s] == 1 for s in slots)
+          and system.zoom_client.live == booked_ids)
+    print(f"threads:   {threads} candidates x {len(slots)} slots in {elapsed:.2f}s -> "
+          f"{sum(wins.values())} winners, {len(system.zoom_client.live)} live meetings "
+          f"[{'OK' if ok else 'FAIL'}]")
+    return ok
+
+
+def _process_worker(args):
+    db_path, worker, slots = args
+    store = SQLiteBookingStore(db_path)
+    won = []
+    order = list(slots)
+    random.shuffle(order)
+    for date, slot_time in order:
+        token = store.reserve(date, slot_time, {'email': f"proc{worker}@example.com"}, ttl=60)
+        if token and store.confirm(token, {'meeting_id': f"{worker}-{date}-{slot_time}"}):
+            won.append((date, slot_time))
+    return won
+
+
+def process_race(db_path: str, processes: int, slots) -> bool:
+    started = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(_process_worker, [(db_path, n, slots) for n in range(processes)])
+    elapsed = time.perf_counter() - started
+
+    wins = Counter(slot for won in results for slot in won)
+    ok = all(wins[s] == 1 for s in slots) and len(SQLiteBookingStore(db_path).booked_slots()) == len(slots)
+    print(f"processes: {processes} workers x {len(slots)} slots in {elapsed:.2f}s -> "
+          f"{sum(wins.values())} winners [{'OK' if ok else 'FAIL'}]")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--slots', type=int, default=20)
+    parser.add_argument('--zoom-latency', type=float, default=0.02, help="Simulated Zoom round trip (seconds)")
+    args = parser.parse_args()
+
+    slots = make_slots(args.slots)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # Keep InterviewSystem's legacy bookings.json lookup away from real data
+        ok = thread_race(os.path.join(workdir, 'threads.db'), args.threads, slots, args.zoom_latency)
+        ok = process_race(os.path.join(workdir, 'processes.db'), args.processes, slots) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+import base64
+import os
+import shutil
+import tempfile
+import logging
+from typing import Dict, Tuple, Callable, BinaryIO, Union
+
+import metrics
+from config import SLOT_HOLD_SECONDS, JOB_MAX_ATTEMPTS
+from job_queue import JobQueue, JobContext, PermanentJobError
+
+logger = logging.getLogger(__name__)
+
+BOOKING_JOB = 'booking'
+TEARDOWN_JOB = 'delete_all_meetings'
+
+
+def stage_resume(stream: BinaryIO, filename: str, spool_dir: str, spool_threshold: int) -> Dict:
+    """
+    Prepare an uploaded resume for the booking job without touching disk when possible.
+
+    Resumes up to spool_threshold bytes travel inside the job payload. Larger
+    ones are streamed to a uniquely named file in spool_dir, which the job
+    deletes when it is done.
+
+    Returns:
+        dict: Resume fields to pass to enqueue_booking
+    """
+    head = stream.read(spool_threshold + 1)
+    if len(head) <= spool_threshold:
+        return {'resume_name': filename, 'resume_data': base64.b64encode(head).decode('ascii')}
+
+    fd, path = tempfile.mkstemp(dir=spool_dir, prefix='resume-', suffix=os.path.splitext(filename)[1])
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(head)
+            shutil.copyfileobj(stream, file)
+    except BaseException:
+        os.remove(path)
+        raise
+    return {'resume_name': filename, 'resume_path': path}
+
+
+def discard_resume(resume: Dict) -> None:
+    """Delete the spooled file of a staged resume that will never be enqueued."""
+    _remove_resume(resume.get('resume_path'))
+
+
+def booking_hold_seconds(queue: JobQueue) -> float:
+    """
+    How long a booking job's hold must last from its enqueue or latest claim.
+
+    Covers an attempt running out its lease plus the longest retry backoff.
+    Every claim pushes the expiry out again and give_up releases the hold,
+    so it only lapses if no worker picks the job up for that long.
+    """
+    return SLOT_HOLD_SECONDS + queue.lease_seconds + queue.backoff_max
+
+
+def enqueue_booking(queue: JobQueue, hold_token: str, email: str, date: str, time: str,
+                    bank: str, coverage: str, interview_type: str, resume: Dict) -> str:
+    """
+    Queue the post-booking work (Zoom, resume analysis, email) for a held slot.
+
+    The hold token doubles as the idempotency key, so a booking can never be
+    processed twice. The hold should have been placed for
+    booking_hold_seconds(queue) so it outlasts the wait for a worker. When
+    tracing is on, the current span travels in the payload so the job's
+    spans join the request's trace.
+
+    Args:
+        resume: Resume fields from stage_resume
+
+    Returns:
+        str: Job id to poll via /jobs/<job_id>
+    """
+    payload = {
+        'hold_token': hold_token,
+        'email': email,
+        'date': date,
+        'time': time,
+        'bank': bank,
+        'coverage': coverage,
+        'interview_type': interview_type,
+        **resume
+    }
+    trace = metrics.trace_context()
+    if trace:
+        payload['trace'] = trace
+    return queue.enqueue(BOOKING_JOB, payload, idempotency_key=f"booking:{hold_token}",
+                         max_attempts=JOB_MAX_ATTEMPTS)
+
+
+def make_booking_handlers(interview_system, hold_seconds: float = SLOT_HOLD_SECONDS
+                          ) -> Tuple[Dict[str, Callable], Dict[str, Callable]]:
+    """
+    Build the worker handlers for booking and bulk-teardown jobs.
+
+    Args:
+        hold_seconds: Hold lease renewed by every attempt until the booking
+            is confirmed; see booking_hold_seconds
+
+    Returns:
+        tuple: (handlers, on_give_up) dicts for WorkerPool
+    """
+
+    def run(job: JobContext) -> None:
+        with metrics.span('booking_job', parent=job.payload.get('trace'), attempt=job.attempt):
+            run_stages(job)
+
+    def run_stages(job: JobContext) -> None:
+        p = job.payload
+
+        # Every attempt renews the hold, however long the job waited in the queue or in backoff
+        if not job.progress.get('confirmed'):
+            if not interview_system.store.extend(p['hold_token'], hold_seconds):
+                raise PermanentJobError("This time slot is already booked")
+
+        # 1. Zoom meeting; retries reuse the checkpointed meeting instead of creating another
+        if 'zoom_details' not in job.progress:
+            with metrics.stage('zoom_meeting'):
+                _, _, zoom_details = interview_system.schedule_interview(
+                    email=p['email'],
+                    date=p['date'],
+                    time=p['time'],
+                    bank=p['bank'],
+                    coverage=p['coverage'],
+                    interview_type=p['interview_type'],
+                    hold_token=p['hold_token']
+                )
+            job.checkpoint(zoom_details=zoom_details)
+        zoom_details = job.progress['zoom_details']
+
+        # 2. Confirm the hold; from here on the booking stands even if the email fails
+        if not job.progress.get('confirmed'):
+            try:
+                with metrics.stage('confirm_slot'):
+                    interview_system.confirm_slot(p['hold_token'], zoom_details)
+            except Exception as e:
+                job.checkpoint(zoom_details=None)  # confirm_slot already deleted the meeting
+                raise PermanentJobError(str(e))
+            job.checkpoint(confirmed=True)
+
+        # 3. Resume feedback and email
+        if not job.progress.get('email_sent'):
+            if 'resume_feedback' not in job.progress:
+                job.checkpoint(resume_feedback=interview_system.analyze_resume(
+                    _load_resume(p), p['bank'], p['coverage'], filename=_resume_name(p)
+                ))
+            interview_topics = interview_system.generate_topics(p['bank'], p['coverage'], p['interview_type'])
+            with metrics.stage('send_details'):
+                interview_system.send_interview_details(
+                    recipient_email=p['email'],
+                    bank=p['bank'],
+                    coverage=p['coverage'],
+                    interview_type=p['interview_type'],
+                    resume_feedback=job.progress['resume_feedback'],
+                    interview_topics=interview_topics,
+                    interview_date=p['date'],
+                    interview_time=p['time'],
+                    zoom_details=zoom_details
+                )
+            job.checkpoint(email_sent=True)
+
+        _remove_resume(p.get('resume_path'))
+
+    def give_up(job: JobContext, error: Exception) -> None:
+        if not job.progress.get('confirmed'):
+            metrics.BOOKINGS.inc(outcome='abandoned')
+            interview_system.release_slot(job.payload['hold_token'], job.payload['date'])
+            zoom_details = job.progress.get('zoom_details')
+            if zoom_details:
+                try:
+                    interview_system.zoom_client.delete_meeting(zoom_details['meeting_id'])
+                except Exception as e:
+                    logger.warning(f"Could not delete Zoom meeting for abandoned booking: {e}")
+        _remove_resume(job.payload.get('resume_path'))
+
+    def teardown(job: JobContext) -> None:
+        # Deleted bookings leave the store, so each retry only sees what is left
+        report = interview_system.delete_all_meetings()
+        job.checkpoint(
+            deleted=job.progress.get('deleted', 0) + report['deleted'],
+            failed=[r for r in report['results'] if r['status'] == 'failed']
+        )
+        if report['failed']:
+            raise Exception(f"{report['failed']} Zoom meetings could not be deleted")
+
+    return {BOOKING_JOB: run, TEARDOWN_JOB: teardown}, {BOOKING_JOB: give_up}
+
+
+def enqueue_teardown(queue: JobQueue) -> str:
+    """
+    Queue deletion of every booking's Zoom meeting; failed meetings are retried.
+
+    While a teardown is queued or running, further requests return its job id
+    instead of queuing a second sweep over the same meetings.
+    """
+    return queue.enqueue(TEARDOWN_JOB, {}, idempotency_key=TEARDOWN_JOB, max_attempts=JOB_MAX_ATTEMPTS,
+                         only_while_pending=True)
+
+
+def booking_status(job: Dict) -> Dict:
+    """Reduce a booking job record to what the scheduling page needs to show."""
+    progress = job['progress']
+    status = {
+        'status': job['status'],
+        'attempts': job['attempts'],
+        'confirmed': bool(progress.get('confirmed')),
+        'email_sent': bool(progress.get('email_sent')),
+        'error': job['last_error']
+    }
+    if progress.get('confirmed'):
+        status['zoom_url'] = progress['zoom_details']['url']
+    return status
+
+
+def _load_resume(payload: Dict) -> Union[bytes, str]:
+    """Resume content carried in the payload, or the path of its spooled file."""
+    if 'resume_data' in payload:
+        return base64.b64decode(payload['resume_data'])
+    return payload['resume_path']
+
+
+def _resume_name(payload: Dict) -> str:
+    # Jobs queued before resumes were staged only carry resume_path
+    return payload.get('resume_name') or payload['resume_path']
+
+
+def _remove_resume(path: str) -> None:
+    if path and os.path.exists(path):
+        os.remove(path)
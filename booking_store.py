@@ -0,0 +1,778 @@
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time as _time
+import uuid
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Iterable, Iterator, Tuple, NamedTuple
+
+from slot_model import SLOT_TIMEZONE, DEFAULT_DURATION_MINUTES, slot_starts_at, day_intervals
+
+logger = logging.getLogger(__name__)
+
+
+class SlotUse(NamedTuple):
+    """One booked or held interviewer seat, as returned by BookingStore.slot_usage()."""
+    date: str
+    time: str
+    interviewer: int
+    starts_at: Optional[str]
+    ends_at: Optional[str]
+    hold_expires_at: Optional[float]
+
+
+class BookingPage(NamedTuple):
+    """One page of BookingStore.query_bookings() results."""
+    bookings: List[Tuple[str, str, Dict]]
+    next_cursor: Optional[str]  # Pass back to fetch the following page; None on the last page
+
+
+class BookingStore(ABC):
+    """
+    Storage backend interface for interview bookings.
+
+    Bookings are addressed by their (date, time) slot key, matching the keys
+    the rest of the system has always used. A slot holds up to `capacity`
+    bookings, each on its own interviewer seat (booking['interviewer']), and
+    a booking occupies its seat for `duration` minutes from the slot start.
+    Each booking is a dict holding at least 'email' and 'zoom_link'.
+    Unconfirmed holds are only visible through booked_slots() and
+    slot_usage(); every other read sees confirmed bookings only.
+    """
+
+    @abstractmethod
+    def get(self, date: str, time: str, email: Optional[str] = None) -> Optional[Dict]:
+        """Return a booking in the slot (the given candidate's, if email is set), or None."""
+
+    @abstractmethod
+    def add(self, date: str, time: str, booking: Dict,
+            duration: int = DEFAULT_DURATION_MINUTES, capacity: int = 1) -> bool:
+        """Insert a booking on a free interviewer. Returns False if none is free."""
+
+    @abstractmethod
+    def remove(self, date: str, time: str, email: Optional[str] = None) -> Optional[Dict]:
+        """Delete a booking in the slot (the given candidate's, if email is set) and return it."""
+
+    @abstractmethod
+    def import_bookings(self, bookings: Iterable[Tuple[str, str, Dict]]) -> int:
+        """Insert many bookings in one transaction, skipping taken slots."""
+
+    @abstractmethod
+    def reserve(self, date: str, time: str, booking: Dict, ttl: float,
+                duration: int = DEFAULT_DURATION_MINUTES, capacity: int = 1) -> Optional[str]:
+        """
+        Atomically place a hold on the first interviewer free for the whole interview.
+
+        Args:
+            date: Slot date (YYYY-MM-DD)
+            time: Slot time (HH:MM AM/PM ET)
+            booking: Booking details to keep with the hold
+            ttl: Seconds before an unconfirmed hold may be displaced
+            duration: Interview length in minutes
+            capacity: Interviewers available for the slot
+
+        Returns:
+            Optional[str]: Hold token, or None if every interviewer is booked or held
+        """
+
+    @abstractmethod
+    def confirm(self, token: str, zoom_link: Optional[Dict] = None) -> bool:
+        """Turn a hold into a booking. Returns False if the hold was lost."""
+
+    @abstractmethod
+    def release(self, token: str) -> bool:
+        """Drop a hold. Returns False if there was no such hold."""
+
+    @abstractmethod
+    def extend(self, token: str, ttl: float) -> bool:
+        """Push a hold's expiry ttl seconds out. Returns False if the hold was lost."""
+
+    @abstractmethod
+    def purge_expired_holds(self) -> int:
+        """Delete holds whose lease ran out. Returns the number deleted."""
+
+    @abstractmethod
+    def booked_on(self, date: str) -> bool:
+        """Return True if any slot on the given date is booked."""
+
+    @abstractmethod
+    def iter_bookings(self) -> Iterator[Tuple[str, str, Dict]]:
+        """Yield (date, time, booking) for every booking in slot order."""
+
+    @abstractmethod
+    def query_bookings(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                       email: Optional[str] = None, bank: Optional[str] = None,
+                       cursor: Optional[str] = None, limit: int = 50) -> BookingPage:
+        """
+        Return one page of bookings in slot order, optionally filtered.
+
+        Args:
+            start_date: First date included (YYYY-MM-DD)
+            end_date: Last date included (YYYY-MM-DD)
+            email: Only this candidate's bookings (case-insensitive)
+            bank: Only bookings for this bank
+            cursor: next_cursor of the previous page, or None for the first page
+            limit: Bookings per page
+
+        Returns:
+            BookingPage: (date, time, booking) rows and the cursor of the next page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+
+    @abstractmethod
+    def archive_completed(self, ended_before: datetime, batch_size: int = 500) -> int:
+        """
+        Move confirmed bookings that ended before the given time into the archive.
+
+        Archived bookings leave every other read of the store; query_archive()
+        returns them. Returns the number of bookings moved.
+        """
+
+    @abstractmethod
+    def query_archive(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      email: Optional[str] = None, bank: Optional[str] = None,
+                      cursor: Optional[str] = None, limit: int = 50) -> BookingPage:
+        """Page through archived bookings; takes the same filters as query_bookings()."""
+
+    @abstractmethod
+    def campaign_due(self, campaign: str, field: str, after: datetime, until: datetime,
+                     limit: int = 100) -> List[Tuple[int, str, str, Dict]]:
+        """
+        Return confirmed bookings whose start or end falls in a window and that the campaign hasn't mailed.
+
+        Args:
+            campaign: Campaign name in the sent log
+            field: 'starts_at' or 'ends_at'
+            after: Window start (exclusive)
+            until: Window end (inclusive)
+            limit: Most bookings returned
+
+        Returns:
+            list: (booking id, date, time, booking), earliest first
+        """
+
+    @abstractmethod
+    def claim_sends(self, campaign: str, booking_ids: Iterable[int]) -> List[int]:
+        """Record bookings in the campaign's sent log. Returns the ids not already recorded."""
+
+    @abstractmethod
+    def release_sends(self, campaign: str, booking_ids: Iterable[int]) -> None:
+        """Drop sent-log entries for messages that failed, so the next run retries them."""
+
+    @abstractmethod
+    def booked_slots(self) -> List[Tuple[str, str]]:
+        """Return the (date, time) slot of every booked or held interviewer seat."""
+
+    @abstractmethod
+    def slot_usage(self, dates: Iterable[str]) -> List[SlotUse]:
+        """
+        Return every booked or held interviewer seat on the given dates.
+
+        hold_expires_at is None for confirmed bookings.
+        """
+
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of stored bookings."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete every booking."""
+
+    @abstractmethod
+    def get_meta(self, key: str) -> Optional[str]:
+        """Return a stored bookkeeping value (e.g. the last processed IMAP UID)."""
+
+    @abstractmethod
+    def set_meta(self, key: str, value: str) -> None:
+        """Store a bookkeeping value."""
+
+    @abstractmethod
+    def record_slot_event(self, kind: str, date: Optional[str], time: Optional[str]) -> int:
+        """
+        Append a slot change to the event log shared by every worker.
+
+        The log keeps only its most recent entries. Returns the event's id,
+        which increases with every event.
+        """
+
+    @abstractmethod
+    def slot_events_after(self, after_id: int, limit: int = 500) -> List[Dict]:
+        """Return logged slot changes with an id above after_id, oldest first, as {id, type, date, time} dicts."""
+
+    @abstractmethod
+    def last_slot_event_id(self) -> int:
+        """Return the id of the newest logged slot change, or 0 if there is none."""
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict]]:
+        """Return a {date: {time: booking}} snapshot, the legacy bookings.json shape."""
+        snapshot = {}
+        for date, time, booking in self.iter_bookings():
+            seat = booking.get('interviewer') or 0
+            # Extra interviewers in the same slot get their own key so no booking is hidden
+            snapshot.setdefault(date, {})[time if not seat else f"{time} #{seat + 1}"] = booking
+        return snapshot
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class SQLiteBookingStore(BookingStore):
+    """
+    SQLite booking backend running in WAL mode.
+
+    Every insert and delete touches a single row through the (date, time)
+    unique index, so writes stay O(log n) and are crash-safe instead of
+    rewriting the whole dataset. Connections are opened per thread.
+
+    A row is either 'confirmed' or a short-lived 'held' reservation. Holds
+    occupy their slot in the unique index until they are confirmed, released,
+    or expire and get displaced by the next reservation for the same slot.
+
+    Attributes:
+        path (str): Path to the SQLite database file
+    """
+
+    ORDER_KEY = "IFNULL(starts_at, '')"  # Bookings with an unparseable time sort first on their date
+
+    # Each entry upgrades the schema by one version (tracked in PRAGMA user_version)
+    MIGRATIONS = [
+        [
+            """CREATE TABLE IF NOT EXISTS bookings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL,
+                time TEXT NOT NULL,
+                starts_at TEXT,
+                email TEXT NOT NULL,
+                bank TEXT,
+                coverage TEXT,
+                interview_type TEXT,
+                zoom_link TEXT,
+                created_at TEXT NOT NULL
+            )""",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_bookings_slot ON bookings(date, time)",
+            "CREATE INDEX IF NOT EXISTS idx_bookings_email ON bookings(email COLLATE NOCASE)",
+            "CREATE INDEX IF NOT EXISTS idx_bookings_starts_at ON bookings(starts_at)",
+        ],
+        [
+            "ALTER TABLE bookings ADD COLUMN status TEXT NOT NULL DEFAULT 'confirmed'",
+            "ALTER TABLE bookings ADD COLUMN hold_token TEXT",
+            "ALTER TABLE bookings ADD COLUMN hold_expires_at REAL",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_bookings_hold ON bookings(hold_token) "
+            "WHERE hold_token IS NOT NULL",
+        ],
+        [
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+        ],
+        [
+            # A slot now takes one booking per interviewer seat
+            "ALTER TABLE bookings ADD COLUMN interviewer INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE bookings ADD COLUMN ends_at TEXT",
+            "DROP INDEX IF EXISTS idx_bookings_slot",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_bookings_seat ON bookings(date, time, interviewer)",
+        ],
+        [
+            # Slot order for paging through confirmed bookings without a sort
+            f"CREATE INDEX IF NOT EXISTS idx_bookings_calendar ON bookings(date, {ORDER_KEY}, id) "
+            "WHERE status = 'confirmed'",
+        ],
+        [
+            # Append-only history of completed bookings, keyed by their original id
+            """CREATE TABLE IF NOT EXISTS booking_archive (
+                id INTEGER PRIMARY KEY,
+                date TEXT NOT NULL,
+                time TEXT NOT NULL,
+                starts_at TEXT,
+                ends_at TEXT,
+                interviewer INTEGER NOT NULL DEFAULT 0,
+                email TEXT NOT NULL,
+                bank TEXT,
+                coverage TEXT,
+                interview_type TEXT,
+                zoom_link TEXT,
+                created_at TEXT NOT NULL,
+                archived_at TEXT NOT NULL
+            )""",
+            f"CREATE INDEX IF NOT EXISTS idx_archive_calendar ON booking_archive(date, {ORDER_KEY}, id)",
+            "CREATE INDEX IF NOT EXISTS idx_archive_email ON booking_archive(email COLLATE NOCASE)",
+            "CREATE INDEX IF NOT EXISTS idx_bookings_ends_at ON bookings(ends_at) WHERE status = 'confirmed'",
+        ],
+        [
+            # One row per campaign email sent for a booking; the primary key is the dedupe check
+            """CREATE TABLE IF NOT EXISTS campaign_sends (
+                campaign TEXT NOT NULL,
+                booking_id INTEGER NOT NULL,
+                sent_at TEXT NOT NULL,
+                PRIMARY KEY (campaign, booking_id)
+            ) WITHOUT ROWID""",
+        ],
+        [
+            # Slot changes from every worker, tailed by the one serving live updates
+            """CREATE TABLE IF NOT EXISTS slot_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                type TEXT NOT NULL,
+                date TEXT,
+                time TEXT,
+                created_at REAL NOT NULL
+            )""",
+        ],
+    ]
+
+    COLUMNS = "date, time, email, bank, coverage, interview_type, zoom_link, interviewer"
+    CONFIRMED = "status = 'confirmed'"
+    SLOT_EVENT_LOG_SIZE = 10000  # Slot events kept before the oldest are trimmed
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._migrate()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._connect())
+
+    def _migrate(self) -> None:
+        """Apply any schema migrations this database hasn't seen yet."""
+        for version, statements in enumerate(self.MIGRATIONS, start=1):
+            with self._transaction() as conn:
+                # Re-read inside the write lock so concurrent processes migrate once
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {version}")
+
+    @staticmethod
+    def _row_to_booking(row: sqlite3.Row) -> Dict:
+        booking = {
+            'email': row['email'],
+            'zoom_link': json.loads(row['zoom_link']) if row['zoom_link'] else None,
+            'interviewer': row['interviewer']
+        }
+        for field in ('bank', 'coverage', 'interview_type'):
+            if row[field] is not None:
+                booking[field] = row[field]
+        return booking
+
+    @staticmethod
+    def _booking_params(date: str, time: str, booking: Dict, interviewer: int = 0,
+                        duration: int = DEFAULT_DURATION_MINUTES) -> tuple:
+        starts_at = slot_starts_at(date, time)
+        return (
+            date,
+            time,
+            starts_at.isoformat() if starts_at else None,
+            (starts_at + timedelta(minutes=duration)).isoformat() if starts_at else None,
+            interviewer,
+            booking['email'],
+            booking.get('bank'),
+            booking.get('coverage'),
+            booking.get('interview_type'),
+            json.dumps(booking.get('zoom_link')),
+            datetime.now(timezone.utc).isoformat()
+        )
+
+    _INSERT = """
+        INSERT INTO bookings (date, time, starts_at, ends_at, interviewer, email, bank, coverage,
+                              interview_type, zoom_link, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    _INSERT_HOLD = """
+        INSERT INTO bookings (date, time, starts_at, ends_at, interviewer, email, bank, coverage,
+                              interview_type, zoom_link, created_at,
+                              status, hold_token, hold_expires_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'held', ?, ?)
+    """
+
+    def _find(self, conn: sqlite3.Connection, date: str, time: str, email: Optional[str]) -> Optional[sqlite3.Row]:
+        query = f"SELECT id, {self.COLUMNS} FROM bookings WHERE date = ? AND time = ? AND {self.CONFIRMED}"
+        params = (date, time)
+        if email is not None:
+            query += " AND email = ? COLLATE NOCASE"
+            params += (email,)
+        return conn.execute(query + " ORDER BY interviewer LIMIT 1", params).fetchone()
+
+    def get(self, date: str, time: str, email: Optional[str] = None) -> Optional[Dict]:
+        row = self._find(self._connect(), date, time, email)
+        return self._row_to_booking(row) if row else None
+
+    def _free_interviewer(self, conn: sqlite3.Connection, date: str, time: str,
+                          duration: int, capacity: int) -> Optional[int]:
+        """Pick the seat for a new booking; call inside the write transaction."""
+        starts_at = slot_starts_at(date, time)
+        if starts_at is None:
+            return None
+        conn.execute(
+            "DELETE FROM bookings WHERE date = ? AND status = 'held' AND hold_expires_at < ?",
+            (date, _time.time())
+        )
+        rows = conn.execute(
+            "SELECT interviewer, starts_at, ends_at FROM bookings WHERE date = ?", (date,)
+        ).fetchall()
+        intervals = day_intervals(((r['interviewer'], r['starts_at'], r['ends_at']) for r in rows), capacity)
+        return intervals.free_seat(starts_at, starts_at + timedelta(minutes=duration))
+
+    def add(self, date: str, time: str, booking: Dict,
+            duration: int = DEFAULT_DURATION_MINUTES, capacity: int = 1) -> bool:
+        try:
+            with self._transaction() as conn:
+                seat = self._free_interviewer(conn, date, time, duration, capacity)
+                if seat is None:
+                    return False
+                conn.execute(self._INSERT, self._booking_params(date, time, booking, seat, duration))
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def remove(self, date: str, time: str, email: Optional[str] = None) -> Optional[Dict]:
+        with self._transaction() as conn:
+            row = self._find(conn, date, time, email)
+            if row is None:
+                return None
+            conn.execute("DELETE FROM bookings WHERE id = ?", (row['id'],))
+        return self._row_to_booking(row)
+
+    def import_bookings(self, bookings: Iterable[Tuple[str, str, Dict]]) -> int:
+        imported = 0
+        with self._transaction() as conn:
+            for date, time, booking in bookings:
+                cursor = conn.execute(
+                    self._INSERT.replace("INSERT", "INSERT OR IGNORE", 1),
+                    self._booking_params(date, time, booking)
+                )
+                imported += cursor.rowcount
+        return imported
+
+    def reserve(self, date: str, time: str, booking: Dict, ttl: float,
+                duration: int = DEFAULT_DURATION_MINUTES, capacity: int = 1) -> Optional[str]:
+        token = uuid.uuid4().hex
+        try:
+            with self._transaction() as conn:
+                seat = self._free_interviewer(conn, date, time, duration, capacity)
+                if seat is None:
+                    return None
+                conn.execute(
+                    self._INSERT_HOLD,
+                    self._booking_params(date, time, booking, seat, duration) + (token, _time.time() + ttl)
+                )
+            return token
+        except sqlite3.IntegrityError:
+            return None
+
+    def confirm(self, token: str, zoom_link: Optional[Dict] = None) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE bookings SET status = 'confirmed', zoom_link = ?, "
+                "hold_token = NULL, hold_expires_at = NULL "
+                "WHERE hold_token = ? AND status = 'held'",
+                (json.dumps(zoom_link), token)
+            )
+        return cursor.rowcount == 1
+
+    def release(self, token: str) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM bookings WHERE hold_token = ? AND status = 'held'", (token,)
+            )
+        return cursor.rowcount == 1
+
+    def extend(self, token: str, ttl: float) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE bookings SET hold_expires_at = ? WHERE hold_token = ? AND status = 'held'",
+                (_time.time() + ttl, token)
+            )
+        return cursor.rowcount == 1
+
+    def purge_expired_holds(self) -> int:
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM bookings WHERE status = 'held' AND hold_expires_at < ?",
+                                  (_time.time(),))
+        return cursor.rowcount
+
+    def booked_on(self, date: str) -> bool:
+        row = self._connect().execute(
+            f"SELECT 1 FROM bookings WHERE date = ? AND {self.CONFIRMED} LIMIT 1", (date,)
+        ).fetchone()
+        return row is not None
+
+    def iter_bookings(self) -> Iterator[Tuple[str, str, Dict]]:
+        rows = self._connect().execute(
+            f"SELECT {self.COLUMNS} FROM bookings WHERE {self.CONFIRMED} "
+            "ORDER BY date, starts_at, time, interviewer"
+        )
+        for row in rows:
+            yield row['date'], row['time'], self._row_to_booking(row)
+
+    def query_bookings(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                       email: Optional[str] = None, bank: Optional[str] = None,
+                       cursor: Optional[str] = None, limit: int = 50) -> BookingPage:
+        return self._query_page("bookings", [self.CONFIRMED], start_date, end_date, email, bank, cursor, limit)
+
+    def query_archive(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      email: Optional[str] = None, bank: Optional[str] = None,
+                      cursor: Optional[str] = None, limit: int = 50) -> BookingPage:
+        return self._query_page("booking_archive", [], start_date, end_date, email, bank, cursor, limit)
+
+    def _query_page(self, table: str, conditions: List[str], start_date: Optional[str], end_date: Optional[str],
+                    email: Optional[str], bank: Optional[str], cursor: Optional[str], limit: int) -> BookingPage:
+        conditions = list(conditions)
+        params = []
+        if start_date:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date <= ?")
+            params.append(end_date)
+        if email:
+            conditions.append("email = ? COLLATE NOCASE")
+            params.append(email)
+        if bank:
+            conditions.append("bank = ?")
+            params.append(bank)
+        if cursor:
+            # Keyset pagination: seek past the last row shown instead of counting an OFFSET
+            conditions.append(f"(date, {self.ORDER_KEY}, id) > (?, ?, ?)")
+            params.extend(_decode_cursor(cursor))
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows = self._connect().execute(
+            f"SELECT id, {self.ORDER_KEY} AS order_key, {self.COLUMNS} FROM {table} "
+            f"{where}ORDER BY date, {self.ORDER_KEY}, id LIMIT ?",
+            (*params, limit + 1)
+        ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor(last['date'], last['order_key'], last['id'])
+        return BookingPage([(row['date'], row['time'], self._row_to_booking(row)) for row in rows], next_cursor)
+
+    def archive_completed(self, ended_before: datetime, batch_size: int = 500) -> int:
+        cutoff = _utc_iso(ended_before)
+        cutoff_date = ended_before.astimezone(SLOT_TIMEZONE).date().isoformat()
+        archived_at = datetime.now(timezone.utc).isoformat()
+        moved = 0
+        # Small batches keep each write lock short next to live bookings
+        while True:
+            with self._transaction() as conn:
+                ids = [row['id'] for row in conn.execute(
+                    f"SELECT id FROM bookings WHERE {self.CONFIRMED} "
+                    "AND (ends_at < ? OR (ends_at IS NULL AND date < ?)) LIMIT ?",
+                    (cutoff, cutoff_date, batch_size)
+                )]
+                if not ids:
+                    return moved
+                marks = ', '.join('?' * len(ids))
+                conn.execute(
+                    "INSERT OR IGNORE INTO booking_archive (id, date, time, starts_at, ends_at, interviewer, email, "
+                    "bank, coverage, interview_type, zoom_link, created_at, archived_at) "
+                    "SELECT id, date, time, starts_at, ends_at, interviewer, email, bank, coverage, "
+                    f"interview_type, zoom_link, created_at, ? FROM bookings WHERE id IN ({marks})",
+                    (archived_at, *ids)
+                )
+                conn.execute(f"DELETE FROM bookings WHERE id IN ({marks})", ids)
+                conn.execute(f"DELETE FROM campaign_sends WHERE booking_id IN ({marks})", ids)
+            moved += len(ids)
+
+    def campaign_due(self, campaign: str, field: str, after: datetime, until: datetime,
+                     limit: int = 100) -> List[Tuple[int, str, str, Dict]]:
+        if field not in ('starts_at', 'ends_at'):
+            raise ValueError(f"Unknown booking time field: {field}")
+        # Range scan on the starts_at / ends_at index; the sent log is probed by primary key
+        rows = self._connect().execute(
+            f"SELECT b.id, {self.COLUMNS} FROM bookings b "
+            f"WHERE b.{self.CONFIRMED} AND b.{field} > ? AND b.{field} <= ? "
+            "AND NOT EXISTS (SELECT 1 FROM campaign_sends s WHERE s.campaign = ? AND s.booking_id = b.id) "
+            f"ORDER BY b.{field}, b.id LIMIT ?",
+            (_utc_iso(after), _utc_iso(until), campaign, limit)
+        )
+        return [(row['id'], row['date'], row['time'], self._row_to_booking(row)) for row in rows]
+
+    def claim_sends(self, campaign: str, booking_ids: Iterable[int]) -> List[int]:
+        sent_at = datetime.now(timezone.utc).isoformat()
+        claimed = []
+        with self._transaction() as conn:
+            for booking_id in booking_ids:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO campaign_sends (campaign, booking_id, sent_at) VALUES (?, ?, ?)",
+                    (campaign, booking_id, sent_at)
+                )
+                if cursor.rowcount == 1:
+                    claimed.append(booking_id)
+        return claimed
+
+    def release_sends(self, campaign: str, booking_ids: Iterable[int]) -> None:
+        with self._transaction() as conn:
+            conn.executemany("DELETE FROM campaign_sends WHERE campaign = ? AND booking_id = ?",
+                             [(campaign, booking_id) for booking_id in booking_ids])
+
+    def booked_slots(self) -> List[Tuple[str, str]]:
+        # Live holds count as booked so nobody is offered a slot mid-reservation
+        rows = self._connect().execute(
+            "SELECT date, time FROM bookings "
+            "WHERE status = 'confirmed' OR hold_expires_at >= ? ORDER BY date, starts_at",
+            (_time.time(),)
+        )
+        return [(row['date'], row['time']) for row in rows]
+
+    def slot_usage(self, dates: Iterable[str]) -> List[SlotUse]:
+        dates = list(dates)
+        if not dates:
+            return []
+        rows = self._connect().execute(
+            f"SELECT date, time, interviewer, starts_at, ends_at, hold_expires_at FROM bookings "
+            f"WHERE date IN ({', '.join('?' * len(dates))}) "
+            "AND (status = 'confirmed' OR hold_expires_at >= ?)",
+            (*dates, _time.time())
+        )
+        return [SlotUse(*row) for row in rows]
+
+    def count(self) -> int:
+        return self._connect().execute(
+            f"SELECT COUNT(*) FROM bookings WHERE {self.CONFIRMED}"
+        ).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute(f"DELETE FROM bookings WHERE {self.CONFIRMED}")
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._connect().execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+
+    def record_slot_event(self, kind: str, date: Optional[str], time: Optional[str]) -> int:
+        with self._transaction() as conn:
+            event_id = conn.execute(
+                "INSERT INTO slot_events (type, date, time, created_at) VALUES (?, ?, ?, ?)",
+                (kind, date, time, _time.time())
+            ).lastrowid
+            conn.execute("DELETE FROM slot_events WHERE id <= ?", (event_id - self.SLOT_EVENT_LOG_SIZE,))
+        return event_id
+
+    def slot_events_after(self, after_id: int, limit: int = 500) -> List[Dict]:
+        rows = self._connect().execute(
+            "SELECT id, type, date, time FROM slot_events WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def last_slot_event_id(self) -> int:
+        return self._connect().execute("SELECT IFNULL(MAX(id), 0) FROM slot_events").fetchone()[0]
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _utc_iso(moment: datetime) -> str:
+    """Format an aware datetime like the stored starts_at / ends_at values, so they compare as strings."""
+    return moment.astimezone(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def _encode_cursor(date: str, order_key: str, row_id: int) -> str:
+    raw = json.dumps([date, order_key, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        date, order_key, row_id = json.loads(raw)
+        if isinstance(date, str) and isinstance(order_key, str) and type(row_id) is int:
+            return date, order_key, row_id
+    except (ValueError, TypeError):
+        pass
+    raise ValueError("Invalid page cursor")
+
+
+class _Transaction:
+    """Context manager running a block inside BEGIN IMMEDIATE ... COMMIT."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
+
+
+def migrate_json_bookings(json_path: str, store: BookingStore) -> int:
+    """
+    One-shot import of a legacy bookings.json file into a booking store.
+
+    The import runs in a single transaction; afterwards the JSON file is
+    renamed to '<json_path>.migrated' so it is never imported twice. Every
+    worker calls this at startup: if another one renames the file first, the
+    file counts as migrated, and a second import of the same rows is a no-op
+    because import_bookings() skips taken slots.
+
+    Args:
+        json_path: Path to the legacy {date: {time: booking}} JSON file
+        store: Destination booking store
+
+    Returns:
+        int: Number of bookings imported (0 if there was nothing to migrate)
+    """
+    try:
+        with open(json_path, 'r') as f:
+            legacy = json.load(f)
+    except FileNotFoundError:
+        return 0
+    except json.JSONDecodeError as e:
+        logger.error(f"Not migrating {json_path}: file is not valid JSON ({e})")
+        return 0
+
+    imported = store.import_bookings(
+        (date, time, booking)
+        for date, times in legacy.items()
+        for time, booking in times.items()
+    )
+    try:
+        os.replace(json_path, json_path + '.migrated')
+    except FileNotFoundError:
+        pass  # Another worker migrated the same file concurrently
+    logger.info(f"Migrated {imported} bookings from {json_path}")
+    return imported
+
+
+if __name__ == '__main__':
+    import sys
+    from config import BOOKINGS_FILE, BOOKINGS_DB
+
+    source = sys.argv[1] if len(sys.argv) > 1 else BOOKINGS_FILE
+    target = SQLiteBookingStore(sys.argv[2] if len(sys.argv) > 2 else BOOKINGS_DB)
+    print(f"Imported {migrate_json_bookings(source, target)} bookings into {target.path}")
@@ -0,0 +1,187 @@
+import threading
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from booking_store import BookingStore
+from mail_templates import MessageRenderer
+from mail_transport import MailTransport, RenderedMessage, temporary_failure
+
+logger = logging.getLogger(__name__)
+
+
+class Campaign(NamedTuple):
+    """
+    One kind of scheduled email, sent once per booking.
+
+    A booking is due when its `field` falls in (now + after, now + until].
+
+    Attributes:
+        name (str): Key of the campaign in the sent log
+        field (str): 'starts_at' or 'ends_at'
+        after (timedelta): Window start relative to now (exclusive)
+        until (timedelta): Window end relative to now (inclusive)
+        render (callable): render(recipient, date, time, booking) -> RenderedMessage
+    """
+    name: str
+    field: str
+    after: timedelta
+    until: timedelta
+    render: Callable[[str, str, str, Dict], RenderedMessage]
+
+
+def default_campaigns(renderer: MessageRenderer, reminder_hours: List[int], follow_up_after_hours: int,
+                      follow_up_until_hours: int) -> List[Campaign]:
+    """
+    Reminders before each interview and a follow-up after it.
+
+    Reminder windows don't overlap: with reminder_hours [24, 1] a booking
+    starting in 30 hours gets nothing yet, one starting in 5 hours gets the
+    24-hour reminder and one starting in 40 minutes the 1-hour reminder. A
+    booking made inside a window still gets that window's reminder.
+
+    Args:
+        renderer: Builds the messages
+        reminder_hours: Lead times of the reminders, in hours
+        follow_up_after_hours: Hours after an interview ends before its follow-up
+        follow_up_until_hours: Hours after an interview ends when its follow-up is no longer sent
+
+    Returns:
+        list: Campaign definitions
+    """
+    campaigns = []
+    leads = sorted(set(reminder_hours), reverse=True)
+    for lead, next_lead in zip(leads, leads[1:] + [0]):
+        campaigns.append(Campaign(f"reminder_{lead}h", 'starts_at', timedelta(hours=next_lead),
+                                  timedelta(hours=lead), renderer.reminder))
+    if follow_up_until_hours > follow_up_after_hours:
+        campaigns.append(Campaign('follow_up', 'ends_at', timedelta(hours=-follow_up_until_hours),
+                                  timedelta(hours=-follow_up_after_hours), renderer.follow_up))
+    return campaigns
+
+
+class SendBudget:
+    """
+    Token bucket holding a per-minute allowance of emails.
+
+    A full minute's allowance can go out as one burst, so a batch shares one
+    SMTP session instead of being spaced out message by message; after that
+    sends are paced at per_minute / 60 per second.
+
+    Attributes:
+        per_minute (int): Emails allowed per minute; 0 or less means no limit
+    """
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._tokens = float(max(per_minute, 0))
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, wanted: int, stop_event: Optional[threading.Event] = None) -> int:
+        """
+        Wait until at least one email may go out, then take up to `wanted`.
+
+        Returns:
+            int: Emails that may be sent now; 0 if stop_event was set while waiting
+        """
+        if self.per_minute <= 0:
+            return wanted
+        stop_event = stop_event or threading.Event()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._tokens + (now - self._updated) * self.per_minute / 60, self.per_minute)
+                self._updated = now
+                if self._tokens >= 1:
+                    granted = min(wanted, int(self._tokens))
+                    self._tokens -= granted
+                    return granted
+                wait = (1 - self._tokens) * 60 / self.per_minute
+            if stop_event.wait(wait):
+                return 0
+
+
+class CampaignEngine:
+    """
+    Sends reminder and follow-up emails for confirmed bookings.
+
+    Every pass asks the store for bookings in each campaign's time window
+    that the campaign's sent log doesn't list yet; the query is a range scan
+    on the starts_at / ends_at index, so its cost follows the window, not the
+    size of the table. Bookings are recorded in the sent log before their
+    message goes out, so two passes never mail the same booking twice. A
+    batch goes out over one pooled SMTP session. Messages that fail for now
+    (a lost connection or a 4xx reply) are taken back out of the log and
+    retried on the next pass, while permanent failures, such as a refused
+    address or a 5xx reply, stay recorded so they aren't retried forever. The SendBudget caps the emails sent per minute across
+    all campaigns.
+
+    Attributes:
+        store (BookingStore): Bookings and the sent log
+        mail (MailTransport): Pooled SMTP transport
+        campaigns (list): Campaign definitions
+        budget (SendBudget): Per-minute send allowance
+        batch_size (int): Messages per SMTP session
+        last_sent (dict): Emails sent per campaign by the latest pass
+    """
+
+    def __init__(self, store: BookingStore, mail: MailTransport, campaigns: List[Campaign],
+                 per_minute: int = 60, batch_size: int = 20):
+        self.store = store
+        self.mail = mail
+        self.campaigns = campaigns
+        self.budget = SendBudget(per_minute)
+        self.batch_size = max(batch_size, 1)
+        self.last_sent = {}
+
+    def run_once(self, stop_event: Optional[threading.Event] = None) -> None:
+        """Send everything currently due; the counts sent are kept in last_sent."""
+        stop_event = stop_event or threading.Event()
+        self.last_sent = {}
+        for campaign in self.campaigns:
+            if stop_event.is_set():
+                break
+            self.last_sent[campaign.name] = self._run_campaign(campaign, stop_event)
+        if any(self.last_sent.values()):
+            logger.info("Campaign emails sent: " + ", ".join(f"{name} {n}" for name, n in self.last_sent.items() if n))
+
+    def _run_campaign(self, campaign: Campaign, stop_event: threading.Event) -> int:
+        now = datetime.now(timezone.utc)
+        after, until = now + campaign.after, now + campaign.until
+        sent = 0
+        while not stop_event.is_set():
+            due = self.store.campaign_due(campaign.name, campaign.field, after, until, limit=self.batch_size)
+            if not due:
+                break
+            allowed = self.budget.take(len(due), stop_event)
+            if not allowed:
+                break
+            due = due[:allowed]
+
+            claimed = set(self.store.claim_sends(campaign.name, [booking_id for booking_id, *_ in due]))
+            batch = {}
+            for booking_id, date, time_slot, booking in due:
+                if booking_id not in claimed:
+                    continue  # Another pass got to it first
+                try:
+                    batch[booking_id] = campaign.render(booking['email'], date, time_slot, booking)
+                except ValueError as e:
+                    # Left in the log; it would fail the same way on every pass
+                    logger.warning(f"Skipping {campaign.name} for booking {booking_id}: {e}")
+            if not batch:
+                continue
+
+            failed = self.mail.send_many(list(batch.values()))
+            # Only temporary failures leave the sent log; a permanent one would fail the same way on every pass
+            temporary = {id(msg) for msg, e in failed if temporary_failure(e)}
+            retry = [booking_id for booking_id, msg in batch.items() if id(msg) in temporary]
+            for msg, e in failed:
+                outcome = "will be retried" if id(msg) in temporary else "not retried"
+                logger.warning(f"{campaign.name} to {msg.recipient} failed, {outcome}: {e}")
+            sent += len(batch) - len(failed)
+            if retry:
+                self.store.release_sends(campaign.name, retry)
+                break  # The server is in trouble; the next pass tries again
+        return sent
@@ -0,0 +1,236 @@
+import email
+import imaplib
+import re
+import select
+import ssl
+import threading
+import time
+import logging
+from typing import Optional, List, Tuple
+
+import metrics
+from config import (EMAIL_ADDRESS, EMAIL_PASSWORD, IMAP_HOST, IMAP_PORT, IMAP_USE_SSL,
+                    IMAP_IDLE_SECONDS, IMAP_POLL_MIN_SECONDS, IMAP_POLL_MAX_SECONDS)
+
+logger = logging.getLogger(__name__)
+
+UID_PATTERN = re.compile(rb'UID (\d+)')
+
+
+class CancellationListener:
+    """
+    Long-lived IMAP session that feeds cancellation emails to InterviewSystem.
+
+    The session is opened once and kept. The elected worker's Scheduler
+    calls run_once() over and over; new mail is detected with IMAP IDLE when
+    the server supports it, otherwise by polling with adaptive backoff.
+    Each pass searches only UIDs above the last processed one and fetches all
+    matches in a single UID FETCH. The last UID is persisted in the booking
+    store, so restarts never rescan the inbox.
+
+    Attributes:
+        interview_system (InterviewSystem): Handles each cancellation email
+        mailbox (str): Mailbox to watch
+        supports_idle (bool): Whether the connected server advertised IDLE
+    """
+
+    SEARCH_CRITERIA = '(SUBJECT "CANCEL INTERVIEW" UNSEEN)'
+
+    def __init__(self, interview_system, host: str = IMAP_HOST, port: int = IMAP_PORT,
+                 use_ssl: bool = IMAP_USE_SSL, username: Optional[str] = EMAIL_ADDRESS,
+                 password: Optional[str] = EMAIL_PASSWORD, mailbox: str = 'inbox',
+                 idle_seconds: float = IMAP_IDLE_SECONDS, poll_min: float = IMAP_POLL_MIN_SECONDS,
+                 poll_max: float = IMAP_POLL_MAX_SECONDS):
+        self.interview_system = interview_system
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.username = username
+        # Remove spaces from password if present
+        self.password = password.replace(" ", "") if password else password
+        self.mailbox = mailbox
+        self.idle_seconds = idle_seconds
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.supports_idle = False
+        self._conn = None
+        self._uidvalidity = None
+        self._last_uid = 0
+        self._poll_interval = poll_min
+
+    @property
+    def _state_key(self) -> str:
+        return f"imap_last_uid:{self.username}:{self.mailbox}"
+
+    def _connect(self) -> imaplib.IMAP4:
+        if self._conn is not None:
+            return self._conn
+
+        with metrics.external_call('imap', 'connect'):
+            conn = imaplib.IMAP4_SSL(self.host, self.port) if self.use_ssl else imaplib.IMAP4(self.host, self.port)
+            try:
+                conn.login(self.username, self.password)
+                typ, _ = conn.select(self.mailbox)
+                if typ != 'OK':
+                    raise imaplib.IMAP4.error(f"Could not select {self.mailbox}")
+            except Exception:
+                try:
+                    conn.logout()
+                except Exception:
+                    pass
+                raise
+
+        self.supports_idle = 'IDLE' in conn.capabilities
+        uidvalidity = conn.response('UIDVALIDITY')[1][0]
+        self._uidvalidity = uidvalidity.decode() if uidvalidity else '0'
+
+        # Resume after the last processed UID unless the mailbox was rebuilt
+        saved = self.interview_system.store.get_meta(self._state_key)
+        self._last_uid = 0
+        if saved:
+            validity, _, last_uid = saved.partition(':')
+            if validity == self._uidvalidity:
+                self._last_uid = int(last_uid)
+
+        self._conn = conn
+        logger.info(f"IMAP session open on {self.host} (IDLE {'on' if self.supports_idle else 'off'})")
+        return conn
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.logout()
+        except Exception:
+            pass
+        self._conn = None
+
+    def poll_once(self) -> int:
+        """
+        Process cancellation emails that arrived since the last pass.
+
+        Returns:
+            int: Number of cancellation emails processed
+        """
+        conn = self._connect()
+        with metrics.external_call('imap', 'search'):
+            typ, data = conn.uid('SEARCH', f'UID {self._last_uid + 1}:*', self.SEARCH_CRITERIA)
+            if typ != 'OK':
+                raise imaplib.IMAP4.error(f"UID SEARCH failed: {data}")
+
+        # "n:*" always matches the newest message, even below n
+        uids = sorted(int(uid) for uid in (data[0] or b'').split() if int(uid) > self._last_uid)
+        if not uids:
+            return 0
+
+        uid_set = ','.join(str(uid) for uid in uids)
+        with metrics.external_call('imap', 'fetch'):
+            messages = self._fetch(conn, uid_set)
+        for uid, raw_message in messages:
+            try:
+                self.interview_system.process_cancellation_email(email.message_from_bytes(raw_message))
+            except Exception as e:
+                metrics.CANCELLATIONS.inc(outcome='error')
+                logger.error(f"Error processing cancellation email: {e}")
+
+        # Mark emails as processed and remember where we stopped
+        with metrics.external_call('imap', 'store'):
+            conn.uid('STORE', uid_set, '+FLAGS', '(\\Seen)')
+        self._last_uid = uids[-1]
+        self.interview_system.store.set_meta(self._state_key, f"{self._uidvalidity}:{self._last_uid}")
+        return len(uids)
+
+    @staticmethod
+    def _fetch(conn: imaplib.IMAP4, uid_set: str) -> List[Tuple[int, bytes]]:
+        typ, data = conn.uid('FETCH', uid_set, '(RFC822)')
+        if typ != 'OK':
+            raise imaplib.IMAP4.error(f"UID FETCH failed: {data}")
+        messages = []
+        for item in data:
+            if not isinstance(item, tuple):
+                continue
+            match = UID_PATTERN.search(item[0])
+            if match:
+                messages.append((int(match.group(1)), item[1]))
+        return sorted(messages)
+
+    def wait_for_mail(self, timeout: float, stop_event: Optional[threading.Event] = None) -> None:
+        """
+        Block in IMAP IDLE until the server reports a mailbox change, the
+        timeout passes, or stop_event is set.
+        """
+        conn = self._connect()
+        stop_event = stop_event or threading.Event()
+        tag = conn._new_tag()
+        conn.send(tag + b' IDLE\r\n')
+        line = conn.readline()
+        if not line.startswith(b'+'):
+            raise imaplib.IMAP4.abort(f"IDLE rejected: {line!r}")
+
+        deadline = time.monotonic() + timeout
+        while not stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._readable(conn, min(remaining, 1.0)):
+                # Any untagged update (EXISTS, EXPUNGE, keepalive) ends the IDLE;
+                # a search is cheaper than parsing every kind of update
+                if not conn.readline():
+                    raise imaplib.IMAP4.abort("Connection closed during IDLE")
+                break
+
+        conn.send(b'DONE\r\n')
+        while True:
+            line = conn.readline()
+            if not line:
+                raise imaplib.IMAP4.abort("Connection closed while ending IDLE")
+            if line.startswith(tag):
+                if b' OK' not in line:
+                    raise imaplib.IMAP4.error(f"IDLE failed: {line!r}")
+                return
+
+    @staticmethod
+    def _readable(conn: imaplib.IMAP4, timeout: float) -> bool:
+        sock = conn.sock
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            return True
+        # A line may already sit in imaplib's read buffer where select can't see it
+        original_timeout = sock.gettimeout()
+        try:
+            sock.setblocking(False)
+            if conn.file.peek(1):
+                return True
+        except (BlockingIOError, ssl.SSLWantReadError):
+            pass
+        finally:
+            sock.settimeout(original_timeout)
+        readable, _, _ = select.select([sock], [], [], timeout)
+        return bool(readable)
+
+    def run_once(self, stop_event: Optional[threading.Event] = None) -> float:
+        """
+        One listener pass: process new cancellations, then wait for more.
+
+        With IDLE the wait for new mail happens here, so the next pass can
+        start straight away. Without it, the returned delay polls quickly
+        while cancellations are arriving and backs off when quiet. IMAP
+        errors close the session and are raised.
+
+        Returns:
+            float: Seconds until the next pass
+        """
+        try:
+            found = self.poll_once()
+            if self.supports_idle:
+                try:
+                    self.wait_for_mail(self.idle_seconds, stop_event)
+                except Exception:
+                    # Not timed: an IDLE lasts as long as the mailbox stays quiet
+                    metrics.EXTERNAL_CALL_ERRORS.inc(service='imap', operation='idle')
+                    raise
+                return 0
+        except Exception:
+            self.close()
+            raise
+        self._poll_interval = self.poll_min if found else min(self._poll_interval * 2, self.poll_max)
+        return self._poll_interval
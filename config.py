@@ -17,6 +17,22 @@ COVERAGE_AREAS = [
 
 INTERVIEW_TYPES = ["Coffee Chat", "First Round", "Superday"]
 
+# Interview start times offered for each weekday (Eastern Time)
+TIME_SLOTS = [
+    "9:00 AM ET", "10:00 AM ET", "11:00 AM ET",
+    "1:00 PM ET", "2:00 PM ET", "3:00 PM ET", "4:00 PM ET"
+]
+
+# Slot Grid Configuration
+SLOT_CAPACITY = int(os.getenv('SLOT_CAPACITY', 1))  # Interviewers taking bookings in each slot
+INTERVIEW_DURATIONS = {  # Minutes an interview occupies its interviewer
+    "Coffee Chat": 30,
+    "First Round": 60,
+    "Superday": 60
+}
+BOOKING_HORIZON_DAYS = int(os.getenv('BOOKING_HORIZON_DAYS', 5))  # Weekdays offered, starting tomorrow
+BLACKOUT_DATES = [d.strip() for d in os.getenv('BLACKOUT_DATES', '').split(',') if d.strip()]  # YYYY-MM-DD, comma-separated
+
 INTERVIEW_TOPICS = {
     "Coffee Chat": [
         "Career Goals and Aspirations",
@@ -58,18 +74,91 @@ INTERVIEW_PREP = {
 # Email Configuration
 EMAIL_ADDRESS = os.getenv('EMAIL_ADDRESS')
 EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD')
+SMTP_HOST = os.getenv('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
+SMTP_USE_TLS = os.getenv('SMTP_USE_TLS', 'true').lower() == 'true'
+SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', 2))
+SMTP_BATCH_SIZE = int(os.getenv('SMTP_BATCH_SIZE', 20))  # Messages per session for queued mail
+MAIL_PER_MINUTE = int(os.getenv('MAIL_PER_MINUTE', 60))  # Cap on reminder and follow-up emails; 0 for no cap
+REMINDER_HOURS = [int(h) for h in os.getenv('REMINDER_HOURS', '24,1').split(',') if h.strip()]  # Hours before an interview
+FOLLOW_UP_AFTER_HOURS = int(os.getenv('FOLLOW_UP_AFTER_HOURS', 2))  # Hours after an interview ends
+IMAP_HOST = os.getenv('IMAP_HOST', 'imap.gmail.com')
+IMAP_PORT = int(os.getenv('IMAP_PORT', 993))
+IMAP_USE_SSL = os.getenv('IMAP_USE_SSL', 'true').lower() == 'true'
+IMAP_IDLE_SECONDS = int(os.getenv('IMAP_IDLE_SECONDS', 29 * 60))  # Servers drop IDLE after 30 minutes
+IMAP_POLL_MIN_SECONDS = int(os.getenv('IMAP_POLL_MIN_SECONDS', 5))  # Polling fallback when IDLE is unsupported
+IMAP_POLL_MAX_SECONDS = int(os.getenv('IMAP_POLL_MAX_SECONDS', 120))
 
 # Zoom Configuration
 ZOOM_ACCOUNT_ID = os.getenv('ZOOM_ACCOUNT_ID')
 ZOOM_CLIENT_ID = os.getenv('ZOOM_CLIENT_ID')
 ZOOM_CLIENT_SECRET = os.getenv('ZOOM_CLIENT_SECRET')
 ZOOM_USER_ID = os.getenv('ZOOM_USER_ID')
+ZOOM_API_BASE_URL = os.getenv('ZOOM_API_BASE_URL', 'https://api.zoom.us/v2')
+ZOOM_OAUTH_URL = os.getenv('ZOOM_OAUTH_URL', 'https://zoom.us/oauth/token')
+ZOOM_TIMEOUT_SECONDS = float(os.getenv('ZOOM_TIMEOUT_SECONDS', 15))
+ZOOM_MAX_RETRIES = int(os.getenv('ZOOM_MAX_RETRIES', 4))
+ZOOM_POOL_SIZE = int(os.getenv('ZOOM_POOL_SIZE', 10))  # Keep-alive connections to api.zoom.us
+ZOOM_REQUESTS_PER_SECOND = float(os.getenv('ZOOM_REQUESTS_PER_SECOND', 10))  # 0 disables client-side pacing
+ZOOM_BULK_DELETE_WORKERS = int(os.getenv('ZOOM_BULK_DELETE_WORKERS', 8))
+MEETING_POOL_ENABLED = os.getenv('MEETING_POOL_ENABLED', 'true').lower() == 'true'  # Pre-create meetings for open slots
+MEETING_POOL_REFILL_SECONDS = int(os.getenv('MEETING_POOL_REFILL_SECONDS', 600))
 
 # Flask Configuration
 SECRET_KEY = os.getenv('SECRET_KEY')
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
+FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'false').lower() == 'true'  # Development server only
+
+# Serving Configuration
+WEB_HOST = os.getenv('WEB_HOST', '127.0.0.1')
+WEB_PORT = int(os.getenv('WEB_PORT', 5001))
+WEB_WORKERS = int(os.getenv('WEB_WORKERS', 4))  # gunicorn worker processes
+WEB_THREADS = int(os.getenv('WEB_THREADS', 8))  # Request threads per worker
+WEB_TIMEOUT_SECONDS = int(os.getenv('WEB_TIMEOUT_SECONDS', 60))  # Silent workers are restarted after this
+LEADER_LOCK_FILE = os.getenv('LEADER_LOCK_FILE', 'background.lock')  # Held by the worker running background services
+LEADER_RETRY_SECONDS = float(os.getenv('LEADER_RETRY_SECONDS', 5))  # Standby workers retry the lock this often
+METRICS_DIR = os.getenv('METRICS_DIR')  # Shared snapshot directory so /metrics adds up every worker; unset reports one worker
+METRICS_EXPORT_SECONDS = float(os.getenv('METRICS_EXPORT_SECONDS', 10))  # How often each worker writes its snapshot
+
+# Booking Storage Configuration
+BOOKINGS_DB = os.getenv('BOOKINGS_DB', 'bookings.db')
+BOOKINGS_FILE = 'bookings.json'  # Legacy store, imported into BOOKINGS_DB on startup
+ARCHIVE_AFTER_HOURS = float(os.getenv('ARCHIVE_AFTER_HOURS', 24))  # Completed bookings move to the archive this long after ending
+ARCHIVE_INTERVAL_SECONDS = int(os.getenv('ARCHIVE_INTERVAL_SECONDS', 3600))
+BOOKINGS_PAGE_SIZE = int(os.getenv('BOOKINGS_PAGE_SIZE', 50))  # Bookings per page of the admin view
+BOOKINGS_PAGE_MAX = int(os.getenv('BOOKINGS_PAGE_MAX', 500))  # Largest page a client may ask for
+SLOT_HOLD_SECONDS = int(os.getenv('SLOT_HOLD_SECONDS', 120))  # Lease on a slot while Zoom and email run; booking jobs add their lease and retry backoff
+AVAILABILITY_RESYNC_SECONDS = int(os.getenv('AVAILABILITY_RESYNC_SECONDS', 30))  # Full reload of the slot index
+AVAILABILITY_MAX_AGE_SECONDS = int(os.getenv('AVAILABILITY_MAX_AGE_SECONDS', 5))  # Browser cache of /get_booked_slots
+SLOT_STREAM_PORT = int(os.getenv('SLOT_STREAM_PORT', 5002))  # Async /slots/stream server; 0 turns live updates off (the dev server streams from Flask)
+SLOT_STREAM_URL = os.getenv('SLOT_STREAM_URL')  # Where browsers connect for live slot updates; defaults to SLOT_STREAM_PORT on the page's host
+SLOT_STREAM_ALLOW_ORIGIN = os.getenv('SLOT_STREAM_ALLOW_ORIGIN', '*')
+SLOT_STREAM_MAX_CLIENTS = int(os.getenv('SLOT_STREAM_MAX_CLIENTS', 10000))
+SLOT_STREAM_HISTORY = int(os.getenv('SLOT_STREAM_HISTORY', 256))  # Events replayed to reconnecting clients
+SLOT_EVENT_POLL_SECONDS = float(os.getenv('SLOT_EVENT_POLL_SECONDS', 0.5))  # How often the elected worker reads other workers' slot changes
+
+# Background Job Configuration
+JOBS_DB = os.getenv('JOBS_DB', 'jobs.db')
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+SCHEDULER_TICK_SECONDS = float(os.getenv('SCHEDULER_TICK_SECONDS', 5))  # Longest sleep between scheduler passes
+SCHEDULER_MAX_BACKOFF_SECONDS = int(os.getenv('SCHEDULER_MAX_BACKOFF_SECONDS', 900))  # Cap on retry delay of failing jobs
+HOLD_PURGE_SECONDS = int(os.getenv('HOLD_PURGE_SECONDS', 600))  # How often abandoned slot holds are deleted
+CAMPAIGN_INTERVAL_SECONDS = int(os.getenv('CAMPAIGN_INTERVAL_SECONDS', 300))  # How often reminders and follow-ups go out
 
 # Resume Analysis Configuration
+MAX_RESUME_BYTES = int(os.getenv('MAX_RESUME_BYTES', 5 * 1024 * 1024))  # Larger uploads are rejected unread
+RESUME_SPOOL_BYTES = int(os.getenv('RESUME_SPOOL_BYTES', 512 * 1024))  # Larger uploads are spooled to UPLOAD_FOLDER
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', 2))  # Sandboxed extraction processes; 0 parses in-process
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 10))
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', 100000))  # Extraction stops once this much text is collected
+PDF_CPU_SECONDS = int(os.getenv('PDF_CPU_SECONDS', 5))
+PDF_TIMEOUT_SECONDS = int(os.getenv('PDF_TIMEOUT_SECONDS', 10))
+PDF_MEMORY_LIMIT_MB = int(os.getenv('PDF_MEMORY_LIMIT_MB', 256))
+RESUME_CACHE_SIZE = int(os.getenv('RESUME_CACHE_SIZE', 256))  # Analyzed resumes kept in memory
+RESUME_CACHE_DIR = os.getenv('RESUME_CACHE_DIR')  # Optional on-disk tier; unset keeps the cache in memory
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', 4))  # Resumes analyzed at once by batch analysis
+BATCH_MAX_BYTES = int(os.getenv('BATCH_MAX_BYTES', 200 * 1024 * 1024))  # Largest /analyze_batch upload
 RESUME_ANALYSIS_CRITERIA = {
     "Format and Presentation": [
         "Clear section headers",
@@ -0,0 +1,31 @@
+"""
+gunicorn settings for production.
+
+Usage:
+    gunicorn -c gunicorn.conf.py 'app:create_app()'
+"""
+
+from config import WEB_PORT, WEB_WORKERS, WEB_THREADS, WEB_TIMEOUT_SECONDS, METRICS_DIR
+
+bind = f"0.0.0.0:{WEB_PORT}"
+workers = WEB_WORKERS
+# Threaded workers: Zoom calls and /slots/stream hold a request thread, not a whole process
+worker_class = 'gthread'
+threads = WEB_THREADS
+timeout = WEB_TIMEOUT_SECONDS
+graceful_timeout = 30
+keepalive = 5
+
+# Each worker builds the app itself. Preloading would fork the PDF sandbox
+# and the leader lock into the master, and every worker would share them.
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    # Counters restart with the server; snapshots of the previous run's workers would inflate them
+    if METRICS_DIR:
+        from metrics import clear_snapshots
+        clear_snapshots(METRICS_DIR)
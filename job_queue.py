@@ -0,0 +1,340 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from typing import Optional, Dict, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class JobContext:
+    """
+    Handle passed to a job handler for one attempt.
+
+    Attributes:
+        job_id (str): Queue identifier of the job
+        payload (dict): Arguments the job was enqueued with
+        progress (dict): Step results persisted across retries via checkpoint()
+        attempt (int): 1-based attempt number
+    """
+
+    def __init__(self, queue: 'JobQueue', job_id: str, payload: Dict, progress: Dict, attempt: int):
+        self._queue = queue
+        self.job_id = job_id
+        self.payload = payload
+        self.progress = progress
+        self.attempt = attempt
+
+    def checkpoint(self, **updates) -> None:
+        """
+        Record finished steps so a retry can skip them.
+
+        Raises:
+            LeaseLostError: If another worker has taken the job over
+        """
+        self.progress.update(updates)
+        self._queue._save_progress(self.job_id, self.attempt, self.progress)
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job can't succeed."""
+
+
+class LeaseLostError(Exception):
+    """Raised when a job's lease ran out and another worker claimed it (or it no longer exists)."""
+
+
+class JobQueue:
+    """
+    Persistent job queue backed by SQLite.
+
+    Jobs survive restarts: a job whose worker died is picked up again once its
+    lease runs out. Failed attempts are retried with exponential backoff and
+    jitter until max_attempts is reached. Every claim bumps the job's attempt
+    count, which doubles as the lease token: complete(), fail() and
+    checkpoints from a worker whose lease was taken over are refused with
+    LeaseLostError. Each job may carry an idempotency
+    key; enqueuing the same key twice returns the existing job, or, for keys
+    enqueued with only_while_pending, the existing job until it finishes.
+
+    Attributes:
+        path (str): Path to the SQLite database file
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            idempotency_key TEXT UNIQUE,
+            payload TEXT NOT NULL,
+            progress TEXT NOT NULL DEFAULT '{}',
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            run_after REAL NOT NULL,
+            lease_expires_at REAL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, run_after);
+    """
+
+    # Matches a job only while the given attempt still holds its lease
+    _LEASED = "WHERE id = ? AND status = 'running' AND attempts = ?"
+
+    def __init__(self, path: str, lease_seconds: float = 300,
+                 backoff_base: float = 2.0, backoff_max: float = 300.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._connect().executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, kind: str, payload: Dict, idempotency_key: Optional[str] = None,
+                max_attempts: int = 5, only_while_pending: bool = False) -> str:
+        """
+        Add a job to the queue.
+
+        Args:
+            kind: Handler name the job is dispatched to
+            payload: JSON-serializable job arguments
+            idempotency_key: Optional key; an existing job with this key is reused
+            max_attempts: Attempts before the job is marked failed
+            only_while_pending: Reuse the keyed job only while it is queued or running;
+                once it has succeeded or failed, the key moves to a new job
+
+        Returns:
+            str: Job id
+        """
+        conn = self._connect()
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if idempotency_key is not None:
+                row = conn.execute(
+                    "SELECT id, status FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+                ).fetchone()
+                if row is not None and only_while_pending and row['status'] in ('succeeded', 'failed'):
+                    conn.execute("UPDATE jobs SET idempotency_key = NULL WHERE id = ?", (row['id'],))
+                elif row is not None:
+                    conn.execute("COMMIT")
+                    return row['id']
+            conn.execute(
+                "INSERT INTO jobs (id, kind, idempotency_key, payload, status, max_attempts, "
+                "run_after, created_at, updated_at) VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?)",
+                (job_id, kind, idempotency_key, json.dumps(payload), max_attempts, now, now, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._wakeup.set()
+        return job_id
+
+    def claim(self) -> Optional[sqlite3.Row]:
+        """
+        Lease the next runnable job, or return None if nothing is due.
+
+        The returned row's 'attempts' is the lease token to pass to complete() and fail().
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE (status = 'queued' AND run_after <= ?) "
+                "OR (status = 'running' AND lease_expires_at < ?) "
+                "ORDER BY run_after LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                    "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    (now + self.lease_seconds, now, row['id'])
+                )
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone()
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def complete(self, job_id: str, attempt: int) -> None:
+        """
+        Mark a claimed job as succeeded.
+
+        Raises:
+            LeaseLostError: If the attempt's lease was taken over
+        """
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = 'succeeded', lease_expires_at = NULL, last_error = NULL, "
+            "updated_at = ? " + self._LEASED,
+            (time.time(), job_id, attempt)
+        )
+        if cursor.rowcount == 0:
+            raise LeaseLostError(f"Job {job_id} attempt {attempt} no longer holds its lease")
+
+    def fail(self, job_id: str, attempt: int, error: str, permanent: bool = False) -> bool:
+        """
+        Record a failed attempt and schedule a retry if any attempts remain.
+
+        Returns:
+            bool: True if the job will be retried, False if it is now failed
+
+        Raises:
+            LeaseLostError: If the attempt's lease was taken over
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs " + self._LEASED, (job_id, attempt)
+            ).fetchone()
+            if row is None:
+                raise LeaseLostError(f"Job {job_id} attempt {attempt} no longer holds its lease")
+            retry = not permanent and row['attempts'] < row['max_attempts']
+            if retry:
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (row['attempts'] - 1))
+                delay *= random.uniform(0.5, 1.0)  # Jitter so retries don't stampede
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', run_after = ?, lease_expires_at = NULL, "
+                    "last_error = ?, updated_at = ? " + self._LEASED,
+                    (now + delay, error, now, job_id, attempt)
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', lease_expires_at = NULL, last_error = ?, "
+                    "updated_at = ? " + self._LEASED,
+                    (error, now, job_id, attempt)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return retry
+
+    def _save_progress(self, job_id: str, attempt: int, progress: Dict) -> None:
+        cursor = self._connect().execute(
+            "UPDATE jobs SET progress = ?, updated_at = ? " + self._LEASED,
+            (json.dumps(progress), time.time(), job_id, attempt)
+        )
+        if cursor.rowcount == 0:
+            raise LeaseLostError(f"Job {job_id} attempt {attempt} no longer holds its lease")
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return the public status of a job, or None if it doesn't exist."""
+        row = self._connect().execute(
+            "SELECT id, kind, status, attempts, max_attempts, last_error, progress, created_at, updated_at "
+            "FROM jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['progress'] = json.loads(job['progress'])
+        return job
+
+    def wait_for_work(self, timeout: float) -> None:
+        """Block until a job is enqueued in this process or the timeout passes."""
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+
+class WorkerPool:
+    """
+    Local pool of threads draining a JobQueue.
+
+    Attributes:
+        queue (JobQueue): Queue to pull jobs from
+        handlers (dict): Job kind -> callable(JobContext)
+        on_give_up (dict): Job kind -> callable(JobContext, error) run once a job is marked failed
+    """
+
+    def __init__(self, queue: JobQueue, handlers: Dict[str, Callable],
+                 on_give_up: Optional[Dict[str, Callable]] = None,
+                 workers: int = 4, poll_interval: float = 1.0):
+        self.queue = queue
+        self.handlers = handlers
+        self.on_give_up = on_give_up or {}
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self) -> None:
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self.queue._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim()
+            except Exception as e:
+                logger.error(f"Could not claim job: {e}")
+                job = None
+            if job is None:
+                self.queue.wait_for_work(self.poll_interval)
+                continue
+            self.run_job(job)
+
+    def run_job(self, job: sqlite3.Row) -> None:
+        context = JobContext(
+            self.queue, job['id'], json.loads(job['payload']), json.loads(job['progress']), job['attempts']
+        )
+        handler = self.handlers.get(job['kind'])
+        try:
+            if handler is None:
+                raise PermanentJobError(f"No handler registered for job kind '{job['kind']}'")
+            handler(context)
+        except LeaseLostError as e:
+            logger.warning(f"Job {job['id']} ({job['kind']}) attempt {job['attempts']} abandoned: {e}")
+            return
+        except Exception as e:
+            permanent = isinstance(e, PermanentJobError)
+            logger.warning(f"Job {job['id']} ({job['kind']}) attempt {job['attempts']} failed: {e}")
+            try:
+                retry = self.queue.fail(job['id'], job['attempts'], str(e), permanent=permanent)
+            except LeaseLostError as lost:
+                logger.warning(f"Job {job['id']} ({job['kind']}): {lost}; leaving it to the new owner")
+                return
+            if not retry:
+                give_up = self.on_give_up.get(job['kind'])
+                if give_up is not None:
+                    try:
+                        give_up(context, e)
+                    except Exception as cleanup_error:
+                        logger.error(f"Cleanup for job {job['id']} failed: {cleanup_error}")
+            return
+        try:
+            self.queue.complete(job['id'], job['attempts'])
+        except LeaseLostError as e:
+            logger.warning(f"Job {job['id']} ({job['kind']}): {e}; leaving it to the new owner")
@@ -0,0 +1,97 @@
+import os
+import threading
+import logging
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; the only process there is always the leader
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    """
+    Picks the one process, among several web workers, that runs background services.
+
+    Every worker tries to take an exclusive lock on lock_path. The worker that
+    gets it runs on_elected once and keeps the lock for as long as it lives.
+    If on_elected raises, the lock is given up again so that this worker's
+    retries or another worker can take over.
+    The OS drops the lock when its holder exits or crashes, and a standby
+    worker then takes over within retry_seconds. The lock file holds the
+    leader's pid, for diagnostics only.
+
+    Attributes:
+        lock_path (str): File locked by the leader; every worker must see the same file
+        retry_seconds (float): How often a standby worker retries the lock
+        is_leader (bool): Whether this process holds the lock
+    """
+
+    def __init__(self, lock_path: str, on_elected: Callable[[], None], retry_seconds: float = 5):
+        self.lock_path = lock_path
+        self.on_elected = on_elected
+        self.retry_seconds = retry_seconds
+        self.is_leader = False
+        self._fd = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Try for the lock now, then keep retrying in the background until it is won."""
+        if self._elect():
+            return
+        self._thread = threading.Thread(target=self._run, name="leader-election", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop retrying and give up the lock if held."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._release()
+
+    def try_acquire(self) -> bool:
+        """Take the lock without blocking. Returns True if this process now holds it."""
+        if self._fd is not None:
+            return True
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode('ascii'))
+        self._fd = fd
+        return True
+
+    def _elect(self) -> bool:
+        try:
+            if not self.try_acquire():
+                return False
+        except OSError as e:
+            logger.error(f"Leader lock {self.lock_path} unavailable: {e}")
+            return False
+        self.is_leader = True
+        logger.info(f"Process {os.getpid()} elected to run background services")
+        try:
+            self.on_elected()
+        except Exception as e:
+            logger.error(f"Starting background services failed, giving up the leader lock: {e}")
+            self._release()
+            return False
+        return True
+
+    def _release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)  # Closing the descriptor releases the lock
+            self._fd = None
+        self.is_leader = False
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.retry_seconds):
+            if self._elect():
+                return
@@ -0,0 +1,345 @@
+import base64
+import hashlib
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.header import Header
+from email.utils import formatdate, make_msgid
+from typing import Dict, List, Optional, Tuple
+
+from mail_transport import RenderedMessage
+from slot_model import SLOT_TIMEZONE, slot_starts_at
+
+MESSAGE_DOMAIN = 'ibinterviewprep.com'  # Right-hand side of event UIDs and Message-IDs
+PRODUCT_ID = '-//IB Interview System//NONSGML v1.0//EN'
+SIGNATURE = "Best regards,\nIB Interview Prep Team\n"
+
+DETAILS_BODY = """
+Dear Candidate,
+
+Your interview has been scheduled:
+
+Date: {long_date}
+Time: {time} (Eastern Time)
+
+Zoom Details:
+Join URL: {url}
+Meeting ID: {meeting_id}
+Password: {password}
+
+Resume Feedback:
+{resume_feedback}
+
+Interview Topics to Prepare:
+{interview_topics}
+
+Need to Cancel or Reschedule?
+----------------------------
+To cancel your interview, please send an email to {mailbox} with:
+Subject: CANCEL INTERVIEW
+Date: {date}
+Time: {time}
+
+""" + SIGNATURE
+
+DETAILS_DESCRIPTION = ("IB Interview Prep Session\nBank: {bank}\nCoverage: {coverage}\nType: {interview_type}\n\n"
+                       "Zoom Meeting Details:\nJoin URL: {url}\nMeeting ID: {meeting_id}\nPassword: {password}\n\n"
+                       "Please join 5 minutes early.")
+
+CANCELLATION_BODY = """
+Dear Candidate,
+
+Your interview scheduled for {date} at {time} has been successfully cancelled.
+
+If you would like to reschedule, please visit our scheduling system again.
+
+""" + SIGNATURE
+
+INVALID_CANCELLATION_BODY = """
+Dear Candidate,
+
+We were unable to process your interview cancellation request.
+
+Reason: {reason}
+
+{details}
+If you need to cancel an interview, please ensure:
+1. The date format is YYYY-MM-DD
+2. The time includes "ET" (e.g., "9:00 AM ET")
+3. You are using the same email address used to schedule the interview
+
+""" + SIGNATURE
+
+INVALID_CANCELLATION_DETAILS = """
+Details provided:
+Date: {date}
+Time: {time}
+"""
+
+REMINDER_BODY = """
+Dear Candidate,
+
+This is a reminder of your upcoming {interview_type} interview ({bank} {coverage}):
+
+Date: {long_date}
+Time: {time} (Eastern Time)
+{zoom}
+If you can no longer attend, please send an email to {mailbox} with:
+Subject: CANCEL INTERVIEW
+Date: {date}
+Time: {time}
+
+""" + SIGNATURE
+
+REMINDER_ZOOM = """
+Join URL: {url}
+Meeting ID: {meeting_id}
+Password: {password}
+"""
+
+FOLLOW_UP_BODY = """
+Dear Candidate,
+
+Thank you for completing your {interview_type} interview ({bank} {coverage}) on {long_date}.
+
+We hope the session was useful. If you would like to practice again, please visit
+our scheduling system to book another interview.
+
+""" + SIGNATURE
+
+REMINDER_ALARM = ("BEGIN:VALARM", "ACTION:DISPLAY", "DESCRIPTION:Reminder: Interview in 30 minutes",
+                  "TRIGGER:-PT30M", "END:VALARM")
+
+# Each message gets its own boundary; this prefix makes a collision with content practically impossible
+_BOUNDARY_PREFIX = f"=_ibinterview_{uuid.uuid4().hex[:12]}_"
+_MIME_VERSION = b"MIME-Version: 1.0\r\n"
+_PLAIN_ASCII = b'Content-Type: text/plain; charset="us-ascii"\r\nContent-Transfer-Encoding: 7bit\r\n'
+_PLAIN_UTF8 = b'Content-Type: text/plain; charset="utf-8"\r\nContent-Transfer-Encoding: base64\r\n'
+_CALENDAR = ('Content-Type: text/calendar; charset="utf-8"; method={method}; name="{filename}"\r\n'
+             'Content-Class: urn:content-classes:calendarmessage\r\n'
+             'Content-Disposition: attachment; filename="{filename}"\r\n')
+
+
+def event_uid(date_str: str, time_str: str, email: str) -> str:
+    """
+    Calendar UID of one candidate's interview in a slot.
+
+    Invites and cancellations both derive it from the slot and the candidate,
+    so a cancellation always replaces the event its invite created and never
+    that of another candidate sharing the slot. The address is hashed so it
+    doesn't leak into the UID.
+    """
+    clock = time_str.replace(" ET", "").replace(" ", "").replace(":", "")
+    candidate = hashlib.sha1(email.strip().lower().encode('utf-8')).hexdigest()[:12]
+    return f"ibinterview-{date_str.replace('-', '')}-{clock}-{candidate}@{MESSAGE_DOMAIN}"
+
+
+def _ics_text(value: str) -> str:
+    """Escape a TEXT property value (RFC 5545 3.3.11)."""
+    return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets, never inside a UTF-8 sequence."""
+    if len(line) <= 75 and line.isascii():
+        return line
+    parts = []
+    current = ''
+    size = 0
+    for char in line:
+        width = len(char.encode('utf-8'))
+        if size + width > 75:
+            parts.append(current)
+            current, size = ' ', 1  # Continuation lines start with a space
+        current += char
+        size += width
+    parts.append(current)
+    return '\r\n'.join(parts)
+
+
+def _slot_start(date_str: str, time_str: str) -> datetime:
+    start = slot_starts_at(date_str, time_str)
+    if start is None:
+        raise ValueError(f"Invalid interview slot: {date_str} {time_str}")
+    return start
+
+
+def _ics_time(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def calendar_event(method: str, date_str: str, time_str: str, email: str, duration_minutes: int, summary: str,
+                   location: Optional[str] = None, description: Optional[str] = None,
+                   cancelled: bool = False, alarm: bool = False) -> str:
+    """
+    Build an iCalendar object for a candidate's interview in a slot.
+
+    Args:
+        method: REQUEST for an invite, CANCEL to withdraw one
+        date_str: Slot date (YYYY-MM-DD)
+        time_str: Slot time (HH:MM AM/PM ET)
+        email: Candidate's address, part of the event UID
+        duration_minutes: Interview length
+        summary: Event title
+        location: Event location, e.g. the Zoom URL
+        description: Event notes
+        cancelled: Mark the event cancelled (use with CANCEL)
+        alarm: Add a 30-minute reminder
+
+    Returns:
+        str: The calendar with CRLF line endings
+
+    Raises:
+        ValueError: If the slot can't be parsed
+    """
+    start = _slot_start(date_str, time_str)
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        f"METHOD:{method}",
+        "BEGIN:VEVENT",
+        f"UID:{event_uid(date_str, time_str, email)}",
+        f"DTSTAMP:{_ics_time(datetime.now(timezone.utc))}",
+        f"DTSTART:{_ics_time(start)}",
+        f"DTEND:{_ics_time(start + timedelta(minutes=duration_minutes))}",
+        f"SUMMARY:{_ics_text(summary)}",
+    ]
+    if location:
+        lines.append(f"LOCATION:{_ics_text(location)}")
+    if description:
+        lines.append(f"DESCRIPTION:{_ics_text(description)}")
+    if cancelled:
+        lines.append("STATUS:CANCELLED")
+    # A cancellation must carry a higher sequence than the invite it withdraws
+    lines.append(f"SEQUENCE:{1 if cancelled else 0}")
+    if alarm:
+        lines.extend(REMINDER_ALARM)
+    lines.extend(("END:VEVENT", "END:VCALENDAR", ""))
+    return '\r\n'.join(_fold(line) for line in lines)
+
+
+def _header(value: str) -> str:
+    if '\r' in value or '\n' in value:
+        raise ValueError("Line break in an email header")
+    return value if value.isascii() else Header(value, 'utf-8').encode(linesep='\r\n')
+
+
+def _text_part(text: str) -> bytes:
+    if text.isascii():
+        return _PLAIN_ASCII + b'\r\n' + text.replace('\r\n', '\n').replace('\n', '\r\n').encode('ascii')
+    return _PLAIN_UTF8 + b'\r\n' + base64.encodebytes(text.encode('utf-8')).replace(b'\n', b'\r\n')
+
+
+def _calendar_part(calendar: str, method: str, filename: str) -> bytes:
+    head = _CALENDAR.format(method=method, filename=filename).encode('ascii')
+    if calendar.isascii():
+        return head + b'Content-Transfer-Encoding: 7bit\r\n\r\n' + calendar.encode('ascii')
+    return head + b'Content-Transfer-Encoding: base64\r\n\r\n' + \
+        base64.encodebytes(calendar.encode('utf-8')).replace(b'\n', b'\r\n')
+
+
+class MessageRenderer:
+    """
+    Renders the system's outgoing emails straight to wire-format bytes.
+
+    Bodies come from the module's fixed templates and every message is
+    assembled as CRLF bytes without building an email.message tree, so the
+    transport sends the result as is. Invites and cancellations share
+    calendar_event(), so their event UIDs always match.
+
+    Attributes:
+        sender (str): From address of every message, also the cancellation mailbox
+        durations (callable): Interview length in minutes for an interview type
+    """
+
+    def __init__(self, sender: Optional[str], durations):
+        self.sender = sender or ''
+        self.durations = durations
+
+    def interview_details(self, recipient: str, bank: str, coverage: str, interview_type: str,
+                          resume_feedback: str, interview_topics: str, date_str: str, time_str: str,
+                          zoom_details: Dict) -> RenderedMessage:
+        """Confirmation with Zoom details, resume feedback, topics and a calendar invite."""
+        values = {
+            'bank': bank, 'coverage': coverage, 'interview_type': interview_type,
+            'date': date_str, 'time': time_str, 'mailbox': self.sender,
+            'long_date': _slot_start(date_str, time_str).astimezone(SLOT_TIMEZONE).strftime('%A, %B %d, %Y'),
+            'url': zoom_details['url'], 'meeting_id': zoom_details['meeting_id'],
+            'password': zoom_details['password'],
+            'resume_feedback': resume_feedback, 'interview_topics': interview_topics
+        }
+        calendar = calendar_event(
+            'REQUEST', date_str, time_str, recipient, self.durations(interview_type),
+            summary=f"IB {interview_type} Interview - {bank} {coverage}",
+            location=zoom_details['url'],
+            description=DETAILS_DESCRIPTION.format_map(values),
+            alarm=True
+        )
+        return self._render(recipient, f"Your {interview_type} Interview Details - {bank} {coverage}",
+                            [_text_part(DETAILS_BODY.format_map(values)),
+                             _calendar_part(calendar, 'REQUEST', 'invite.ics')])
+
+    def cancellation_confirmation(self, recipient: str, date_str: str, time_str: str,
+                                  interview_type: Optional[str] = None) -> RenderedMessage:
+        """Cancellation notice carrying a calendar CANCEL for the original invite."""
+        calendar = calendar_event('CANCEL', date_str, time_str, recipient, self.durations(interview_type),
+                                  summary="IB Interview Prep Session (CANCELLED)", cancelled=True)
+        return self._render(recipient, "Interview Cancellation Confirmation",
+                            [_text_part(CANCELLATION_BODY.format(date=date_str, time=time_str)),
+                             _calendar_part(calendar, 'CANCEL', 'cancel.ics')])
+
+    def invalid_cancellation(self, recipient: str, date_str: Optional[str], time_str: Optional[str],
+                             reason: str) -> RenderedMessage:
+        """Explain why a cancellation request could not be processed."""
+        details = INVALID_CANCELLATION_DETAILS.format(date=date_str, time=time_str) if date_str and time_str else ''
+        return self._render(recipient, "Unable to Process Interview Cancellation",
+                            [_text_part(INVALID_CANCELLATION_BODY.format(reason=reason, details=details))])
+
+    def reminder(self, recipient: str, date_str: str, time_str: str, booking: Dict) -> RenderedMessage:
+        """Reminder of an upcoming interview, repeating its Zoom details."""
+        values = self._booking_values(date_str, time_str, booking)
+        zoom = booking.get('zoom_link')
+        values['zoom'] = REMINDER_ZOOM.format_map(zoom) if zoom else ''
+        return self._render(recipient, f"Reminder: Your {values['interview_type']} Interview on {values['long_date']}",
+                            [_text_part(REMINDER_BODY.format_map(values))])
+
+    def follow_up(self, recipient: str, date_str: str, time_str: str, booking: Dict) -> RenderedMessage:
+        """Thank-you note sent after an interview has ended."""
+        values = self._booking_values(date_str, time_str, booking)
+        return self._render(recipient, f"Thank You for Your {values['interview_type']} Interview",
+                            [_text_part(FOLLOW_UP_BODY.format_map(values))])
+
+    def _booking_values(self, date_str: str, time_str: str, booking: Dict) -> Dict:
+        return {
+            'bank': booking.get('bank', ''), 'coverage': booking.get('coverage', ''),
+            'interview_type': booking.get('interview_type', 'Practice'),
+            'date': date_str, 'time': time_str, 'mailbox': self.sender,
+            'long_date': _slot_start(date_str, time_str).astimezone(SLOT_TIMEZONE).strftime('%A, %B %d, %Y')
+        }
+
+    def _render(self, recipient: str, subject: str, parts: List[bytes]) -> RenderedMessage:
+        headers = (f"From: {_header(self.sender)}\r\n"
+                   f"To: {_header(recipient)}\r\n"
+                   f"Subject: {_header(subject)}\r\n"
+                   f"Date: {formatdate()}\r\n"
+                   f"Message-ID: {make_msgid(domain=MESSAGE_DOMAIN)}\r\n").encode('ascii') + _MIME_VERSION
+        if len(parts) == 1:
+            return RenderedMessage(self.sender, recipient, subject, headers + parts[0])
+
+        boundary, delimiter = self._boundary(parts)
+        chunks = [headers, f'Content-Type: multipart/mixed; boundary="{boundary}"\r\n\r\n'.encode('ascii')]
+        for part in parts:
+            chunks.append(delimiter + b'\r\n')
+            chunks.append(part)
+            chunks.append(b'\r\n')
+        chunks.append(delimiter + b'--\r\n')
+        return RenderedMessage(self.sender, recipient, subject, b''.join(chunks))
+
+    @staticmethod
+    def _boundary(parts: List[bytes]) -> Tuple[str, bytes]:
+        while True:
+            boundary = _BOUNDARY_PREFIX + uuid.uuid4().hex[:8]
+            delimiter = b'--' + boundary.encode('ascii')
+            if not any(delimiter in part for part in parts):
+                return boundary, delimiter
@@ -0,0 +1,269 @@
+import queue
+import smtplib
+import ssl
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from email.message import Message
+from typing import Optional, List, Iterator, NamedTuple, Union
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Errors after which an SMTP session can't be reused
+STALE_SESSION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, OSError)
+
+# Seconds the background sender waits before each retry of a temporary failure
+QUEUED_RETRY_DELAYS = (1, 2, 4)
+
+
+def session_lost(error: Exception) -> bool:
+    """Whether error broke the session; smtplib's errors are OSErrors too, but a server reply leaves it usable."""
+    return (isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError))
+            or not isinstance(error, smtplib.SMTPException))
+
+
+def temporary_failure(error: Exception) -> bool:
+    """Whether a send may succeed if tried again: a 4xx reply (greylisting, throttling) or a lost session."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return session_lost(error)
+
+
+class RenderedMessage(NamedTuple):
+    """A message already serialized for the wire, sent without re-flattening."""
+    sender: str
+    recipient: str
+    subject: str
+    data: bytes  # Complete message with CRLF line endings
+
+
+Outgoing = Union[Message, RenderedMessage]
+
+
+def describe(msg: Outgoing) -> str:
+    if isinstance(msg, RenderedMessage):
+        return f"'{msg.subject}' to {msg.recipient}"
+    return f"'{msg['Subject']}' to {msg['To']}"
+
+
+class SMTPConnectionPool:
+    """
+    Pool of logged-in SMTP sessions that are kept alive between messages.
+
+    A session is opened (connect, STARTTLS, login) once and reused until the
+    server drops it. Sessions idle for longer than keepalive_after seconds are
+    checked with NOOP before use and replaced if they have gone stale.
+
+    Attributes:
+        host (str): SMTP server host
+        port (int): SMTP server port
+        size (int): Maximum number of concurrent sessions
+    """
+
+    def __init__(self, host: str, port: int, username: Optional[str] = None,
+                 password: Optional[str] = None, use_tls: bool = True, size: int = 2,
+                 timeout: float = 30, keepalive_after: float = 30, max_idle: float = 240):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = ''.join(password.split()) if password else password
+        self.use_tls = use_tls
+        self.size = size
+        self.timeout = timeout
+        self.keepalive_after = keepalive_after
+        self.max_idle = max_idle
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _open(self) -> smtplib.SMTP:
+        with metrics.external_call('smtp', 'connect'):
+            conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.use_tls:
+                    conn.starttls(context=ssl.create_default_context())
+                if self.username and self.password:
+                    conn.login(self.username, self.password)
+            except Exception:
+                self._close(conn)
+                raise
+        return conn
+
+    @staticmethod
+    def _close(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._open()
+
+            idle_for = time.monotonic() - last_used
+            if idle_for > self.max_idle:
+                self._close(conn)
+                continue
+            if idle_for > self.keepalive_after:
+                try:
+                    if conn.noop()[0] != 250:
+                        raise smtplib.SMTPServerDisconnected("NOOP rejected")
+                except STALE_SESSION_ERRORS:
+                    self._close(conn)
+                    continue
+            return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """Borrow a live session; it is discarded instead of returned if it broke."""
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            try:
+                yield conn
+            except Exception as e:
+                if session_lost(e):
+                    self._close(conn)
+                    raise
+                # Reset the SMTP dialogue so the session is clean for the next user
+                try:
+                    conn.rset()
+                except STALE_SESSION_ERRORS:
+                    self._close(conn)
+                    raise
+                self._idle.put((conn, time.monotonic()))
+                raise
+            else:
+                self._idle.put((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn)
+
+
+class MailTransport:
+    """
+    Outbound mail on top of an SMTPConnectionPool.
+
+    send() delivers one message right away and raises on failure. enqueue()
+    hands a message to a background sender that drains the outbound queue in
+    batches, sending up to batch_size messages per SMTP session; messages the
+    server turns away for now are retried after QUEUED_RETRY_DELAYS.
+
+    Attributes:
+        pool (SMTPConnectionPool): Sessions used for delivery
+        batch_size (int): Maximum messages sent per session by the background sender
+    """
+
+    def __init__(self, pool: SMTPConnectionPool, batch_size: int = 20):
+        self.pool = pool
+        self.batch_size = batch_size
+        self._outbox = queue.Queue()
+        self._sender = None
+        self._sender_lock = threading.Lock()
+
+    def send(self, msg: Outgoing) -> None:
+        """Deliver a single message, reconnecting once if the session went stale."""
+        failed = self.send_many([msg])
+        if failed:
+            raise failed[0][1]
+
+    def send_many(self, messages: List[Outgoing]) -> List[tuple]:
+        """
+        Deliver messages over as few sessions as possible.
+
+        A message whose session drops is retried once on a fresh session. If
+        that session drops too before anything goes through, the server is
+        taken to be down and the remaining messages fail with it.
+
+        Returns:
+            list: (message, exception) for every message that could not be sent
+        """
+        failed = []
+        pending = list(messages)
+        reconnects = 0
+        while pending:
+            try:
+                with self.pool.connection() as conn:
+                    while pending:
+                        try:
+                            msg = pending[0]
+                            with metrics.external_call('smtp', 'send'):
+                                if isinstance(msg, RenderedMessage):
+                                    conn.sendmail(msg.sender, [msg.recipient], msg.data)
+                                else:
+                                    conn.send_message(msg)
+                        except smtplib.SMTPRecipientsRefused as e:
+                            failed.append((pending[0], e))
+                        pending.pop(0)
+                        reconnects = 0  # The session works; the next message gets its own reconnect
+            except STALE_SESSION_ERRORS as e:
+                if not session_lost(e):
+                    # The server refused this message; the rest go out on the same session
+                    failed.append((pending.pop(0), e))
+                    continue
+                # The message in flight is retried on a fresh session, once
+                reconnects += 1
+                if reconnects > 1:
+                    failed.extend((msg, e) for msg in pending)
+                    break
+                logger.info(f"SMTP session dropped ({e}); reconnecting")
+        return failed
+
+    def enqueue(self, msg: Outgoing) -> None:
+        """Queue a message for batched background delivery."""
+        self._outbox.put(msg)
+        self._ensure_sender()
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every queued message has been handed to the server."""
+        if timeout is None:
+            self._outbox.join()
+            return
+        deadline = time.monotonic() + timeout
+        while self._outbox.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def _ensure_sender(self) -> None:
+        with self._sender_lock:
+            if self._sender is None or not self._sender.is_alive():
+                self._sender = threading.Thread(target=self._drain, name="mail-sender", daemon=True)
+                self._sender.start()
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._outbox.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._outbox.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                failed = self.send_many(batch)
+                for delay in QUEUED_RETRY_DELAYS:
+                    retry = [msg for msg, error in failed if temporary_failure(error)]
+                    if not retry:
+                        break
+                    time.sleep(delay)
+                    failed = [(msg, error) for msg, error in failed if not temporary_failure(error)]
+                    failed += self.send_many(retry)
+                for msg, error in failed:
+                    logger.error(f"Failed to send {describe(msg)}: {error}")
+            except Exception as e:
+                logger.error(f"Mail sender error: {e}")
+            finally:
+                for _ in batch:
+                    self._outbox.task_done()
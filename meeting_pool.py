@@ -0,0 +1,194 @@
+import sqlite3
+import threading
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Iterable, Tuple
+
+from slot_model import slot_starts_at
+
+logger = logging.getLogger(__name__)
+
+
+class MeetingPool:
+    """
+    Zoom meetings created ahead of time for upcoming open slots.
+
+    Each pooled meeting is filed under the slot it was created for and
+    already carries that slot's start time, so booking the slot needs no
+    Zoom call at all. A slot with several interviewers gets one meeting per
+    free interviewer. A claimed meeting leaves the pool atomically, so two
+    bookings can never receive the same meeting.
+
+    Attributes:
+        path (str): Path to the SQLite database file
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meeting_pool (
+            meeting_id TEXT PRIMARY KEY,
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            starts_at TEXT NOT NULL,
+            url TEXT NOT NULL,
+            password TEXT NOT NULL DEFAULT '',
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_meeting_pool_slot ON meeting_pool(date, time);
+        CREATE INDEX IF NOT EXISTS idx_meeting_pool_starts_at ON meeting_pool(starts_at);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect().executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _details(row: sqlite3.Row) -> Dict:
+        return {'url': row['url'], 'meeting_id': row['meeting_id'], 'password': row['password']}
+
+    def add(self, date: str, time_slot: str, starts_at: datetime, zoom_details: Dict) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO meeting_pool (meeting_id, date, time, starts_at, url, password, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (zoom_details['meeting_id'], date, time_slot, starts_at.astimezone(timezone.utc).isoformat(),
+             zoom_details['url'], zoom_details.get('password', ''), time.time())
+        )
+
+    def _take(self, query: str, params: Tuple) -> Optional[sqlite3.Row]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(query, params).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM meeting_pool WHERE meeting_id = ?", (row['meeting_id'],))
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def claim(self, date: str, time_slot: str) -> Optional[Dict]:
+        """Take the meeting pre-created for this slot, or None if there isn't one."""
+        row = self._take(
+            "SELECT * FROM meeting_pool WHERE date = ? AND time = ? ORDER BY created_at LIMIT 1",
+            (date, time_slot)
+        )
+        return self._details(row) if row is not None else None
+
+    def claim_spare(self, taken_slots: Iterable[Tuple[str, str]]) -> Optional[Dict]:
+        """
+        Take a future meeting whose own slot has been fully booked some other way.
+
+        The caller must move the meeting to the new start time.
+        """
+        taken = list(taken_slots)
+        if not taken:
+            return None
+        now = datetime.now(timezone.utc).isoformat()
+        # Candidates are few (one per pooled slot), so filter the taken set in Python
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT meeting_id, date, time FROM meeting_pool WHERE starts_at > ? ORDER BY starts_at", (now,)
+        ).fetchall()
+        taken = set(taken)
+        for candidate in rows:
+            if (candidate['date'], candidate['time']) not in taken:
+                continue
+            row = self._take("SELECT * FROM meeting_pool WHERE meeting_id = ?", (candidate['meeting_id'],))
+            if row is not None:
+                return self._details(row)
+        return None
+
+    def pooled_slots(self) -> Dict[Tuple[str, str], int]:
+        """Number of pooled meetings per (date, time) slot."""
+        rows = self._connect().execute("SELECT date, time, COUNT(*) FROM meeting_pool GROUP BY date, time").fetchall()
+        return {(row[0], row[1]): row[2] for row in rows}
+
+    def take_expired(self, now: Optional[datetime] = None) -> List[Dict]:
+        """Remove and return meetings whose slot has already started."""
+        cutoff = (now or datetime.now(timezone.utc)).isoformat()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute("SELECT * FROM meeting_pool WHERE starts_at <= ?", (cutoff,)).fetchall()
+            conn.execute("DELETE FROM meeting_pool WHERE starts_at <= ?", (cutoff,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return [self._details(row) for row in rows]
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM meeting_pool").fetchone()[0]
+
+
+class MeetingProvisioner:
+    """
+    Keeps the MeetingPool stocked; the elected worker's Scheduler runs a pass
+    every MEETING_POOL_REFILL_SECONDS.
+
+    Every pass deletes pooled meetings whose slot has passed, then tops up
+    each upcoming slot in the booking window to one meeting per interviewer
+    still free there. The interview type isn't known until a slot is booked,
+    so pooled meetings last as long as the longest type.
+
+    Attributes:
+        interview_system (InterviewSystem): Source of the slot availability, store and Zoom client
+        pool (MeetingPool): Pool being kept warm
+    """
+
+    def __init__(self, interview_system, pool: MeetingPool):
+        self.interview_system = interview_system
+        self.pool = pool
+
+    def upcoming_slots(self) -> List[Tuple[str, str, datetime, int]]:
+        """(date, time, start, free interviewers) for every future slot of the window."""
+        now = datetime.now(timezone.utc)
+        slots = []
+        for (date, time_slot), seats in sorted(self.interview_system.availability.open_seats().items()):
+            starts_at = slot_starts_at(date, time_slot)
+            if starts_at is not None and starts_at > now:
+                slots.append((date, time_slot, starts_at, seats))
+        return slots
+
+    def reclaim(self) -> int:
+        """Delete pooled meetings whose slot passed unbooked."""
+        expired = self.pool.take_expired()
+        for meeting in expired:
+            try:
+                self.interview_system.zoom_client.delete_meeting(meeting['meeting_id'])
+            except Exception as e:
+                logger.warning(f"Could not delete expired pooled meeting {meeting['meeting_id']}: {e}")
+        return len(expired)
+
+    def refill(self, stop_event: Optional[threading.Event] = None) -> int:
+        """Create meetings for free interviewers that have none, until stop_event is set. Returns the number created."""
+        stop_event = stop_event or threading.Event()
+        pooled = self.pool.pooled_slots()
+        created = 0
+        for date, time_slot, starts_at, seats in self.upcoming_slots():
+            for _ in range(seats - pooled.get((date, time_slot), 0)):
+                if stop_event.is_set():
+                    return created
+                zoom_details = self.interview_system.zoom_client.create_meeting(
+                    start_time=starts_at, duration=self.interview_system.slot_model.longest_duration)
+                self.pool.add(date, time_slot, starts_at, zoom_details)
+                created += 1
+        return created
+
+    def run_once(self, stop_event: Optional[threading.Event] = None) -> None:
+        reclaimed = self.reclaim()
+        created = self.refill(stop_event)
+        if reclaimed or created:
+            logger.info(f"Meeting pool: {created} created, {reclaimed} reclaimed, {self.pool.count()} ready")
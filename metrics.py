@@ -0,0 +1,337 @@
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+import logging
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # Tracing is optional; without the OpenTelemetry API spans cost nothing
+    propagate = trace = None
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, from a cache hit to a Zoom call sitting out its retries
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Counter:
+    """
+    Monotonic count per label combination.
+
+    Attributes:
+        name (str): Metric name in the exposition output
+        help (str): One-line description
+        labelnames (tuple): Label names every inc() must give
+    """
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            values = [[list(key), value] for key, value in self._values.items()]
+        return {'kind': self.kind, 'help': self.help, 'labelnames': list(self.labelnames), 'values': values}
+
+
+class Histogram(Counter):
+    """
+    Distribution of observed values per label combination, in fixed buckets.
+
+    An observation is a bisect and one locked list update, so timing every
+    request and external call is cheap enough to leave on.
+
+    Attributes:
+        buckets (tuple): Sorted upper bounds; a final +Inf bucket is implied
+    """
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DURATION_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            # Per-bucket counts (not cumulative), then the +Inf bucket, then the sum
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe how long the block took, whether or not it raised."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            values = [[list(key), list(counts)] for key, counts in self._values.items()]
+        return {'kind': self.kind, 'help': self.help, 'labelnames': list(self.labelnames),
+                'buckets': list(self.buckets), 'values': values}
+
+
+class MetricsRegistry:
+    """
+    The metrics of this process, rendered in the Prometheus text format.
+
+    Each gunicorn worker counts on its own. With a shared directory, every
+    worker also writes its snapshot there (see start_exporter) and render()
+    adds up the snapshots of all workers, so whichever worker answers a
+    scrape reports the same totals.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._snapshot_file = None
+
+    def _register(self, metric: Counter) -> Counter:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DURATION_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def write_snapshot(self, directory: str) -> None:
+        """Atomically replace this process's snapshot file in directory."""
+        if self._snapshot_file is None:
+            self._snapshot_file = os.path.join(directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump(self.snapshot(), file)
+            os.replace(tmp_path, self._snapshot_file)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def render(self, directory: Optional[str] = None) -> str:
+        """
+        Prometheus text exposition of this process's metrics.
+
+        Args:
+            directory: Snapshot directory of the other workers, whose values are added in
+
+        Returns:
+            str: Exposition text
+        """
+        merged = self.snapshot()
+        if directory:
+            for path in glob.glob(os.path.join(directory, '*.json')):
+                if path == self._snapshot_file:
+                    continue  # Stale copy of the live values above
+                try:
+                    with open(path) as file:
+                        _merge(merged, json.load(file))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping metrics snapshot {path}: {e}")
+
+        lines = []
+        for name, metric in sorted(merged.items()):
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['kind']}")
+            for label_values, value in sorted(metric['values']):
+                labels = list(zip(metric['labelnames'], label_values))
+                if metric['kind'] == 'counter':
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric['buckets'] + ['+Inf'], value):
+                    cumulative += count
+                    le = bound if bound == '+Inf' else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + [('le', le)])} {_number(cumulative)}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(labels)} {_number(cumulative)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _merge(into: Dict, snapshot: Dict) -> None:
+    for name, metric in snapshot.items():
+        target = into.setdefault(name, {**metric, 'values': []})
+        if target['kind'] != metric['kind'] or target.get('buckets') != metric.get('buckets'):
+            continue  # Written by a worker running other code; can't be added up
+        values = {tuple(labels): value for labels, value in target['values']}
+        for labels, value in metric['values']:
+            key = tuple(labels)
+            if key not in values:
+                values[key] = value
+            elif metric['kind'] == 'counter':
+                values[key] += value
+            else:
+                values[key] = [a + b for a, b in zip(values[key], value)]
+        target['values'] = [[list(key), value] for key, value in values.items()]
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'ib_stage_duration_seconds', "Time spent in each stage of booking, resume analysis and cancellation",
+    ('stage',))
+EXTERNAL_CALL_SECONDS = REGISTRY.histogram(
+    'ib_external_call_duration_seconds', "Duration of calls to Zoom, SMTP and IMAP, retries included",
+    ('service', 'operation'))
+EXTERNAL_CALL_ERRORS = REGISTRY.counter(
+    'ib_external_call_errors_total', "Calls to Zoom, SMTP and IMAP that failed", ('service', 'operation'))
+BOOKINGS = REGISTRY.counter(
+    'ib_bookings_total', "Booking attempts by outcome: held, rejected, confirmed, lost, abandoned", ('outcome',))
+CANCELLATIONS = REGISTRY.counter(
+    'ib_cancellations_total', "Cancellation emails by outcome", ('outcome',))
+RESUME_CACHE_REQUESTS = REGISTRY.counter(
+    'ib_resume_cache_requests_total', "Resume cache lookups: hit, miss, or stale (cached text rescanned)",
+    ('result',))
+HTTP_REQUESTS = REGISTRY.counter(
+    'ib_http_requests_total', "HTTP requests by endpoint and status", ('endpoint', 'method', 'status'))
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'ib_http_request_duration_seconds', "Time to build each HTTP response", ('endpoint',))
+
+_tracer = trace.get_tracer(__name__) if trace is not None else None
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+@contextmanager
+def span(name: str, parent: Optional[Dict] = None, **attributes) -> Iterator[None]:
+    """
+    Run the block in an OpenTelemetry span when the API is installed.
+
+    Args:
+        name: Span name
+        parent: Carrier from trace_context() of a span in another thread or
+            process, such as the request that queued a job; defaults to the
+            current span
+        attributes: Span attributes
+    """
+    if _tracer is None:
+        yield
+        return
+    context = propagate.extract(parent) if parent else None
+    with _tracer.start_as_current_span(name, context=context, attributes=attributes):
+        yield
+
+
+def trace_context() -> Dict[str, str]:
+    """The current span as W3C trace headers, for span(parent=...); empty without tracing."""
+    carrier = {}
+    if propagate is not None:
+        propagate.inject(carrier)
+    return carrier
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the block into ib_stage_duration_seconds, inside a span of the same name."""
+    started = time.perf_counter()
+    try:
+        with span(name):
+            yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage=name)
+
+
+@contextmanager
+def external_call(service: str, operation: str) -> Iterator[None]:
+    """Time a call to an outside server; an exception from the block counts as an error."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        EXTERNAL_CALL_ERRORS.inc(service=service, operation=operation)
+        raise
+    finally:
+        EXTERNAL_CALL_SECONDS.observe(time.perf_counter() - started, service=service, operation=operation)
+
+
+def render(directory: Optional[str] = None) -> str:
+    return REGISTRY.render(directory)
+
+
+def start_exporter(directory: str, interval: float) -> None:
+    """
+    Write this process's snapshot to directory every interval seconds and at
+    exit, so the /metrics of any worker can add it in. Safe to call more than once.
+    """
+    global _exporter
+    with _exporter_lock:
+        if _exporter is not None:
+            return
+        os.makedirs(directory, exist_ok=True)
+
+        def export() -> None:
+            try:
+                REGISTRY.write_snapshot(directory)
+            except OSError as e:
+                logger.warning(f"Could not write metrics snapshot: {e}")
+
+        def run() -> None:
+            while True:
+                time.sleep(interval)
+                export()
+
+        export()
+        atexit.register(export)
+        _exporter = threading.Thread(target=run, name="metrics-exporter", daemon=True)
+        _exporter.start()
+
+
+def clear_snapshots(directory: str) -> None:
+    """Delete the snapshots of a previous server run; gunicorn calls this before forking workers."""
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,203 @@
+import io
+import math
+import codecs
+import multiprocessing
+import signal
+import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Union
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; extraction then runs without OS limits
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class PDFExtractionError(Exception):
+    """Raised when a PDF is rejected or can't be processed within its limits."""
+
+
+class _LimitExceeded(BaseException):
+    # BaseException so PyPDF2's own "except Exception" recovery can't swallow it
+    pass
+
+
+def _raise_limit(signum, frame):
+    raise _LimitExceeded("CPU time" if signum == signal.SIGXCPU else "time")
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    """Load the PDF library, then cap the worker's address space at its current size plus memory_limit_mb."""
+    # Only the workers parse PDFs; the web and job processes never import PyPDF2
+    import PyPDF2  # noqa: F401
+    signal.signal(signal.SIGALRM, _raise_limit)
+    if resource is None:
+        return
+    signal.signal(signal.SIGXCPU, _raise_limit)
+    if not memory_limit_mb:
+        return
+    try:
+        with open('/proc/self/statm') as statm:
+            current = int(statm.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError):
+        current = 0
+    limit = current + memory_limit_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def decode_text(content: Union[bytes, memoryview]) -> str:
+    """Decode a UTF-8 text resume from a bytes-like buffer, normalizing newlines like text mode."""
+    text = codecs.decode(content, 'utf-8')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def extract_pages(content: Union[bytes, memoryview], max_pages: int, max_chars: int) -> str:
+    """
+    Extract text page by page, stopping at max_pages or once max_chars are collected.
+
+    Pages are parsed lazily, so the pages after the cut-off are never decoded.
+    """
+    import PyPDF2
+
+    # BytesIO shares a bytes object's buffer instead of copying it
+    if not isinstance(content, bytes):
+        content = bytes(content)
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    parts = []
+    collected = 0
+    for number, page in enumerate(reader.pages):
+        if number >= max_pages or collected >= max_chars:
+            break
+        text = page.extract_text()
+        parts.append(text)
+        collected += len(text) + 1
+    return ' '.join(parts)
+
+
+def _extract_limited(content: bytes, max_pages: int, max_chars: int,
+                     cpu_seconds: float, wall_seconds: float) -> str:
+    """Worker entry point: extract_pages under a CPU-time and wall-clock budget."""
+    cpu_limit = None
+    if resource is not None:
+        soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        used = resource.getrusage(resource.RUSAGE_SELF)
+        cpu_limit = math.ceil(used.ru_utime + used.ru_stime + cpu_seconds)
+        if hard != resource.RLIM_INFINITY:
+            cpu_limit = min(cpu_limit, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, hard))
+    signal.setitimer(signal.ITIMER_REAL, wall_seconds)
+    try:
+        return extract_pages(content, max_pages, max_chars)
+    except _LimitExceeded as e:
+        raise PDFExtractionError(f"PDF exceeded its {e} limit")
+    except MemoryError:
+        raise PDFExtractionError("PDF exceeded its memory limit")
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        if cpu_limit is not None:
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+class PDFExtractor:
+    """
+    Sandboxed PDF text extraction on a pool of worker processes.
+
+    Parsing happens outside the web and job worker processes, so a hostile or
+    bloated PDF can't hold the GIL or grow their memory. Every job runs under
+    a CPU-time and wall-clock budget and each worker has a capped address
+    space. A worker that dies or hangs is replaced by rebuilding the pool.
+
+    Attributes:
+        workers (int): Worker processes; 0 extracts in-process without limits
+        max_bytes (int): Largest PDF accepted for parsing
+        max_pages (int): Pages read before extraction stops
+        max_chars (int): Characters collected before extraction stops
+    """
+
+    def __init__(self, workers: int = 2, max_bytes: int = 5 * 1024 * 1024, max_pages: int = 10,
+                 max_chars: int = 100000, cpu_seconds: float = 5, timeout: float = 10,
+                 memory_limit_mb: int = 256):
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.cpu_seconds = cpu_seconds
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Fork the workers now.
+
+        Call this before the app starts its background threads: forking a
+        process that already runs threads can copy locks in a held state.
+        The fork happens on submit; the workers load PyPDF2 in the
+        background, so this returns without waiting for them.
+        """
+        if self.workers:
+            self._get_executor().submit(int)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('fork'),
+                    initializer=_init_worker,
+                    initargs=(self.memory_limit_mb,)
+                )
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        # A worker stuck outside Python code ignores its alarm; don't wait for it
+        for process in list(getattr(executor, '_processes', {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def extract(self, content: Union[bytes, memoryview]) -> str:
+        """
+        Extract the text of a PDF held in a bytes-like buffer.
+
+        Raises:
+            PDFExtractionError: If the PDF is too large or breaks a limit
+        """
+        if len(content) > self.max_bytes:
+            raise PDFExtractionError(f"PDF is larger than the {self.max_bytes // 1024} KB limit")
+        if not self.workers:
+            return extract_pages(content, self.max_pages, self.max_chars)
+
+        if not isinstance(content, bytes):
+            content = bytes(content)  # Memoryviews can't be pickled to a worker
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_extract_limited, content, self.max_pages, self.max_chars,
+                                     self.cpu_seconds, self.timeout)
+            # The worker enforces the timeout itself; this only catches a hung worker
+            return future.result(timeout=self.timeout + 5)
+        except FutureTimeoutError:
+            logger.error("PDF worker hung past its time limit; restarting the pool")
+            self._reset(executor)
+            raise PDFExtractionError("PDF exceeded its time limit")
+        except BrokenProcessPool:
+            logger.error("PDF worker died; restarting the pool")
+            self._reset(executor)
+            raise PDFExtractionError("PDF could not be processed")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
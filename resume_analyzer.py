@@ -0,0 +1,312 @@
+import hashlib
+import re
+from bisect import bisect_left
+from typing import Dict, List, Tuple, Iterable
+
+from config import COVERAGE_KEYWORDS
+
+SECTION_KEYWORDS = ["education", "experience", "skills", "technical skills"]
+EDUCATION_KEYWORDS = ["gpa", "major", "university", "college", "bachelor", "master", "mba"]
+COURSEWORK_KEYWORDS = ["finance", "accounting", "economics"]
+ACTION_VERBS = ["led", "managed", "developed", "created", "analyzed", "implemented"]
+BANKING_TERMS = {
+    "deal experience": ["transaction", "deal", "m&a", "merger", "acquisition"],
+    "financial modeling": ["model", "valuation", "dcf", "lbo", "comps"],
+    "market analysis": ["market research", "industry analysis", "competitor analysis"],
+    "technical skills": ["excel", "powerpoint", "bloomberg", "capital iq"]
+}
+ACHIEVEMENT_WORDS = ['increased', 'decreased', 'improved', 'reduced', 'grew',
+                     'raised', 'managed', 'led', 'oversaw', 'achieved', 'delivered']
+CONTACT_PATTERNS = ['@', 'phone', 'tel', '+1', 'linkedin', '.com', '.net', '.org']
+
+# Metrics such as "$2.5 million" or "increased revenue by 30%"
+QUANT_PATTERN = (
+    r'(?:(?:\$|USD|EUR)?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?(?:\s*(?:million|billion|k|m|b|%))|'
+    r'(?:increased|decreased|improved|reduced|grew|raised|managed|led|oversaw)(?:\s+\w+){0,5}\s+'
+    r'(?:by\s+)?(?:\$|USD|EUR)?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?(?:\s*(?:million|billion|k|m|b|%))?)'
+)
+QUANT_RE = re.compile(QUANT_PATTERN, re.IGNORECASE)
+# Same matches on already-lowercased text, without IGNORECASE and with a guard
+# that skips positions where no metric can start
+QUANT_LOWER_RE = re.compile(
+    r'(?=\s*[$\d]|usd|eur|increased|decreased|improved|reduced|grew|raised|managed|led|oversaw)'
+    + QUANT_PATTERN.replace('USD', 'usd').replace('EUR', 'eur')
+)
+# Lowercase characters IGNORECASE folds onto letters of QUANT_PATTERN ("ı" ~ "i", "ſ" ~ "s")
+CASE_FOLD_VARIANTS = ('ı', 'ſ')
+CONTACT_RE = re.compile('|'.join(re.escape(pattern) for pattern in CONTACT_PATTERNS))
+YEAR_RE = re.compile(r'\d{4}')
+EMAIL_RE = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}')
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Build an alternation shaped like a trie, so each position is tried once per prefix."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional: prefer the longest keyword ending below this node
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Finds every occurrence of a fixed set of keywords in one pass over a text.
+
+    Matching is plain substring matching, the same as `keyword in text`. At
+    each position the compiled trie reports the longest keyword starting
+    there; shorter keywords that are prefixes of it are filled in from a
+    table built with the matcher.
+
+    Attributes:
+        keywords (list): Keywords the matcher looks for
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted(set(keywords))
+        self._pattern = re.compile(_trie_regex(self.keywords))
+        self._prefixes = {
+            keyword: [other for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    def scan(self, text: str) -> Dict[str, List[int]]:
+        """
+        Returns:
+            dict: keyword -> ascending start positions, for keywords present in text
+        """
+        hits = {}
+        search = self._pattern.search
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                return hits
+            start = match.start()
+            for keyword in self._prefixes[match.group()]:
+                hits.setdefault(keyword, []).append(start)
+            pos = start + 1
+
+
+KEYWORDS = KeywordMatcher(
+    SECTION_KEYWORDS + EDUCATION_KEYWORDS + COURSEWORK_KEYWORDS + ACTION_VERBS + ACHIEVEMENT_WORDS
+    + [term for terms in BANKING_TERMS.values() for term in terms]
+    + [keyword.lower() for keywords in COVERAGE_KEYWORDS.values() for keyword in keywords]
+)
+
+# Changes whenever the keyword lists or patterns do, so stale cached scans are redone
+SCAN_FINGERPRINT = hashlib.sha256(repr((
+    KEYWORDS.keywords, sorted(COVERAGE_KEYWORDS.items()), QUANT_PATTERN, CONTACT_PATTERNS
+)).encode()).hexdigest()[:16]
+
+
+class ResumeScan:
+    """
+    Everything the feedback report needs from a resume, independent of the
+    bank and coverage area it is analyzed for.
+
+    Attributes:
+        word_count (int): Whitespace-separated words in the resume
+        found (set): Keywords present in the lowercased text
+        keyword_contexts (dict): Coverage keyword -> text around its first occurrence
+        metrics (list): Context of each quantified achievement, in text order
+        has_year (bool): Whether any four-digit number appears
+        has_email (bool): Whether an email address appears
+    """
+
+    def __init__(self, word_count: int, found: set, keyword_contexts: Dict[str, str],
+                 metrics: List[str], has_year: bool, has_email: bool):
+        self.word_count = word_count
+        self.found = found
+        self.keyword_contexts = keyword_contexts
+        self.metrics = metrics
+        self.has_year = has_year
+        self.has_email = has_email
+
+    def to_dict(self) -> Dict:
+        return {
+            'word_count': self.word_count,
+            'found': sorted(self.found),
+            'keyword_contexts': self.keyword_contexts,
+            'metrics': self.metrics,
+            'has_year': self.has_year,
+            'has_email': self.has_email
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ResumeScan':
+        return cls(
+            word_count=data['word_count'],
+            found=set(data['found']),
+            keyword_contexts=data['keyword_contexts'],
+            metrics=data['metrics'],
+            has_year=data['has_year'],
+            has_email=data['has_email']
+        )
+
+
+def _occurs_within(occurrences: List[Tuple[int, int]], starts: List[int], start: int, end: int) -> bool:
+    """True if any (start, end) occurrence lies entirely within text[start:end]."""
+    for i in range(bisect_left(starts, start), len(starts)):
+        occurrence_start, occurrence_end = occurrences[i]
+        if occurrence_start >= end:
+            return False
+        if occurrence_end <= end:
+            return True
+    return False
+
+
+def scan_resume(text: str) -> ResumeScan:
+    """Analyze raw resume text once; see build_feedback for the report."""
+    text = text.lower()
+    hits = KEYWORDS.scan(text)
+
+    keyword_contexts = {}
+    for keywords in COVERAGE_KEYWORDS.values():
+        for keyword in keywords:
+            positions = hits.get(keyword.lower())
+            if positions:
+                idx = positions[0]
+                keyword_contexts[keyword] = text[max(0, idx-50):min(len(text), idx+50)].strip()
+
+    achievements = sorted(
+        (position, position + len(word)) for word in ACHIEVEMENT_WORDS for position in hits.get(word, ())
+    )
+    achievement_starts = [position for position, _ in achievements]
+    quant_re = QUANT_RE if any(char in text for char in CASE_FOLD_VARIANTS) else QUANT_LOWER_RE
+    metrics = []
+    for match in quant_re.finditer(text):
+        # Skip if it looks like contact info (phone numbers, emails, etc.)
+        if CONTACT_RE.search(match.group()):
+            continue
+        start = max(0, match.start() - 30)
+        end = min(len(text), match.end() + 30)
+        # Skip if context suggests it's not an achievement
+        if not _occurs_within(achievements, achievement_starts, start, end):
+            continue
+        metrics.append(text[start:end].strip())
+
+    return ResumeScan(
+        word_count=len(text.split()),
+        found=set(hits),
+        keyword_contexts=keyword_contexts,
+        metrics=metrics,
+        has_year=YEAR_RE.search(text) is not None,
+        has_email=EMAIL_RE.search(text) is not None
+    )
+
+
+def build_feedback(scan: ResumeScan, bank: str, coverage: str) -> str:
+    """Render the feedback report for a scanned resume, tailored to bank and coverage."""
+    found = scan.found
+    feedback = []
+    improvements = []
+
+    # 1. Format and Presentation
+    feedback.append("Format and Presentation:")
+    if scan.word_count < 200:
+        feedback.append(f"- Resume is quite brief at approximately {scan.word_count} words. Consider adding more detail about your experiences.")
+    elif scan.word_count > 1000:
+        feedback.append(f"- Resume is lengthy at {scan.word_count} words. Consider condensing to highlight key achievements.")
+
+    sections_found = []
+    if "education" in found:
+        sections_found.append("Education")
+        missing_edu = [k for k in EDUCATION_KEYWORDS if k not in found]
+        if missing_edu:
+            feedback.append(f"- Consider adding these to your Education section: {', '.join(missing_edu)}")
+        if "gpa" not in found:
+            improvements.append("Add GPA if above 3.5")
+        if not any(course in found for course in COURSEWORK_KEYWORDS):
+            improvements.append("Include relevant coursework")
+
+    if "experience" in found:
+        sections_found.append("Experience")
+        if not any(verb in found for verb in ACTION_VERBS):
+            feedback.append("- Use more action verbs to describe your experiences")
+
+    if "skills" in found:
+        sections_found.append("Skills")
+
+    missing_sections = [s for s in ["Education", "Experience", "Skills"] if s not in sections_found]
+    if missing_sections:
+        feedback.append(f"- Add these key sections: {', '.join(missing_sections)}")
+
+    # 2. Technical Skills for Coverage Area
+    feedback.append(f"\nTechnical Skills (Relevant to {coverage}):")
+    industry_keywords = COVERAGE_KEYWORDS.get(coverage, [])
+    found_keywords = [word for word in industry_keywords if word.lower() in found]
+
+    if found_keywords:
+        feedback.append(f"- Strong alignment with {coverage}: {', '.join(found_keywords)}")
+        for keyword in found_keywords[:2]:  # Show context for top 2 matches
+            feedback.append(f"  • Context: \"...{scan.keyword_contexts[keyword]}...\"")
+    else:
+        feedback.append(f"- Limited {coverage}-specific experience shown")
+        feedback.append(f"- Consider adding these keywords: {', '.join(industry_keywords[:3])}")
+
+    # 3. Banking Experience
+    feedback.append("\nBanking Experience:")
+    for category, terms in BANKING_TERMS.items():
+        found_terms = [term for term in terms if term in found]
+        if found_terms:
+            feedback.append(f"- Strong {category}: {', '.join(found_terms)}")
+        else:
+            feedback.append(f"- Consider adding {category} examples")
+
+    # 4. Quantitative Achievements
+    feedback.append("\nQuantitative Achievements:")
+    if scan.metrics:
+        feedback.append("- Good use of metrics:")
+        for context in scan.metrics[:3]:  # Show top 3 metrics
+            feedback.append(f"  • \"{context}\"")
+    else:
+        feedback.append("- Add specific metrics to quantify your achievements")
+        feedback.append("- Example: deal sizes, percentage improvements, team size")
+
+    if not scan.has_year:
+        improvements.append("Add dates to experiences")
+    if not scan.has_email:
+        improvements.append("Include contact information")
+
+    if improvements:
+        feedback.append("Additional improvements:")
+        for improvement in improvements:
+            feedback.append(f"- {improvement}")
+
+    # 6. Bank-Specific Recommendations
+    feedback.append(f"\nRecommendations for {bank}'s {coverage} group:")
+    feedback.append(f"- Research recent {bank} deals in {coverage}")
+    feedback.append("- Network with alumni at the bank")
+    feedback.append(f"- Focus on {coverage}-specific technical skills")
+    feedback.append("- Prepare deal discussions relevant to the group")
+
+    # Create tailored summary
+    strengths = []
+    if found_keywords:
+        strengths.append(f"{coverage} experience")
+    if scan.metrics:
+        strengths.append("quantitative achievements")
+    if any(term in found for term in BANKING_TERMS["deal experience"]):
+        strengths.append("deal experience")
+
+    summary = f"Your profile shows {len(strengths)} key strengths for {bank}'s {coverage} group: "
+    summary += ", ".join(strengths) if strengths else "potential for development"
+    summary += ". Focus on " + (improvements[0].lower() if improvements else "gaining relevant experience") + "."
+
+    return f"Executive Summary:\n{summary}\n\nDetailed Feedback:\n" + "\n".join(feedback)
+
+
+def analyze_text(text: str, bank: str, coverage: str) -> str:
+    """Full feedback report for raw resume text."""
+    return build_feedback(scan_resume(text), bank, coverage)
@@ -0,0 +1,113 @@
+import json
+import os
+import tempfile
+import threading
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeCache:
+    """
+    Content-addressed cache of resume analysis, keyed by the SHA-256 of the file.
+
+    Entries hold the extracted text and the bank/coverage-independent scan
+    (see resume_analyzer.ResumeScan), so a resubmitted resume skips parsing
+    and scanning and only the per-booking report is rendered again. The
+    memory tier is an LRU of max_entries. With a directory set, entries are
+    also written there and survive restarts.
+
+    Attributes:
+        max_entries (int): Entries kept in memory
+        directory (str): On-disk tier, or None for memory only
+        hits (int): Lookups answered from memory
+        disk_hits (int): Lookups answered from disk
+        misses (int): Lookups that found nothing
+    """
+
+    def __init__(self, max_entries: int = 256, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def get(self, digest: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry
+
+        entry = self._read(digest) if self.directory else None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(digest, entry)
+        return entry
+
+    def put(self, digest: str, entry: Dict) -> None:
+        with self._lock:
+            self._remember(digest, entry)
+        if self.directory:
+            self._write(digest, entry)
+
+    def _remember(self, digest: str, entry: Dict) -> None:
+        self._entries[digest] = entry
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _read(self, digest: str) -> Optional[Dict]:
+        try:
+            with open(self._path(digest), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable resume cache entry {digest}: {e}")
+            return None
+
+    def _write(self, digest: str, entry: Dict) -> None:
+        path = self._path(digest)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                    json.dump(entry, file)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not write resume cache entry {digest}: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'evictions': self.evictions,
+                'disk_tier': bool(self.directory)
+            }
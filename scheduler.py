@@ -0,0 +1,271 @@
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledJob:
+    """
+    A periodic job and its run statistics in this process.
+
+    The job function takes no arguments. It may return a number of seconds
+    to use instead of `interval` before its next run.
+
+    Attributes:
+        name (str): Unique job name, also its lock row
+        func (callable): Work to run
+        interval (float): Seconds between the end of one run and the start of the next
+        jitter (float): Up to this many random seconds added to every delay
+        max_backoff (float): Longest delay after repeated failures
+        lease_seconds (float): How long a run may hold the job's lock before another process can take it
+        next_run_at (float): When the job is next due (epoch seconds)
+        failures (int): Consecutive failed runs
+    """
+
+    def __init__(self, name: str, func: Callable[[], Optional[float]], interval: float,
+                 jitter: float = 0, max_backoff: float = 900, lease_seconds: float = 600):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.lease_seconds = lease_seconds
+        self.next_run_at = 0.0
+        self.failures = 0
+        self.runs = 0
+        self.errors = 0
+        self.last_duration = None
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+        self.last_lag = None
+        self.max_lag = 0.0
+        self.last_error = None
+
+    def delay(self, result: Optional[float], failed: bool) -> float:
+        if failed:
+            # Double the wait per consecutive failure instead of hammering a broken dependency
+            base = min(max(self.interval, 1) * 2 ** self.failures, self.max_backoff)
+        else:
+            base = self.interval if result is None else result
+        return base + random.uniform(0, self.jitter)
+
+
+class Scheduler:
+    """
+    In-process runner for periodic background jobs.
+
+    A dispatcher thread starts each job when it falls due and runs it on a
+    thread of its own, so a slow job never delays the others. A failed run
+    is retried with exponential backoff up to the job's max_backoff. Every
+    delay gets the job's jitter added, so processes started together drift
+    apart.
+
+    Before running a job the scheduler takes a lease on the job's row in
+    SQLite. Only one process sharing the database can hold it, so each job
+    runs in one place at a time. The next due time is stored in the same
+    row, so restarts and failover keep the schedule. A lease left by a
+    crashed process runs out after the job's lease_seconds.
+
+    Duration and lag are tracked per job; lag is how late a run started
+    against its due time.
+
+    Attributes:
+        path (str): Path to the SQLite database holding the job rows
+        owner (str): Identifies this process in the lease rows
+        tick (float): Longest sleep of the dispatcher, which also bounds how
+            quickly it notices changes made by other processes
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scheduled_jobs (
+            name TEXT PRIMARY KEY,
+            next_run_at REAL NOT NULL,
+            lease_owner TEXT,
+            lease_until REAL,
+            last_finished_at REAL,
+            last_duration REAL,
+            last_error TEXT
+        );
+    """
+
+    def __init__(self, path: str, tick: float = 5):
+        self.path = path
+        self.tick = tick
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._jobs = {}
+        self._running = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._executor = None
+        self._connect().executescript(self.SCHEMA)
+
+    @property
+    def stop_event(self) -> threading.Event:
+        """Set when the scheduler stops; long-running jobs should return once it is."""
+        return self._stop
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def add(self, name: str, func: Callable[[], Optional[float]], interval: float, jitter: float = 0,
+            max_backoff: float = 900, lease_seconds: Optional[float] = None) -> ScheduledJob:
+        """
+        Register a periodic job. Call before start().
+
+        Args:
+            name: Unique job name
+            func: Work to run; may return seconds until its next run
+            interval: Seconds between runs
+            jitter: Up to this many random seconds added to each delay
+            max_backoff: Longest delay after repeated failures
+            lease_seconds: Longest expected run; defaults to twice the interval, at least 60 seconds
+
+        Returns:
+            ScheduledJob: The registered job, also holding its statistics
+        """
+        job = ScheduledJob(name, func, interval, jitter, max_backoff,
+                           lease_seconds if lease_seconds is not None else max(interval * 2, 60))
+        conn = self._connect()
+        # A job seen before keeps its stored schedule
+        conn.execute("INSERT OR IGNORE INTO scheduled_jobs (name, next_run_at) VALUES (?, ?)",
+                     (name, time.time() + random.uniform(0, jitter)))
+        job.next_run_at = conn.execute("SELECT next_run_at FROM scheduled_jobs WHERE name = ?",
+                                       (name,)).fetchone()['next_run_at']
+        with self._lock:
+            self._jobs[name] = job
+        return job
+
+    def start(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self._jobs), 1), thread_name_prefix='scheduled-job')
+        self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def run_pending(self) -> int:
+        """Start every due job whose lease this process wins. Returns the number started."""
+        now = time.time()
+        started = 0
+        with self._lock:
+            due = [job for job in self._jobs.values() if job.name not in self._running and job.next_run_at <= now]
+        for job in due:
+            if not self._claim(job, now):
+                continue
+            with self._lock:
+                self._running.add(job.name)
+            self._executor.submit(self._execute, job, job.next_run_at)
+            started += 1
+        return started
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Run counts, durations, lag and errors per job, as seen by this process."""
+        now = time.time()
+        with self._lock:
+            return {
+                job.name: {
+                    'running': job.name in self._running,
+                    'runs': job.runs,
+                    'errors': job.errors,
+                    'consecutive_failures': job.failures,
+                    'last_duration': job.last_duration,
+                    'max_duration': round(job.max_duration, 3),
+                    'avg_duration': round(job.total_duration / job.runs, 3) if job.runs else None,
+                    'last_lag': job.last_lag,
+                    'max_lag': round(job.max_lag, 3),
+                    'last_error': job.last_error,
+                    'next_run_in': round(max(job.next_run_at - now, 0), 1)
+                }
+                for job in self._jobs.values()
+            }
+
+    def _claim(self, job: ScheduledJob, now: float) -> bool:
+        conn = self._connect()
+        cursor = conn.execute(
+            "UPDATE scheduled_jobs SET lease_owner = ?, lease_until = ? "
+            "WHERE name = ? AND next_run_at <= ? AND (lease_until IS NULL OR lease_until < ?)",
+            (self.owner, now + job.lease_seconds, job.name, now, now)
+        )
+        if cursor.rowcount == 1:
+            return True
+        # Another process ran it or is running it; look again when that settles
+        row = conn.execute("SELECT next_run_at, lease_until FROM scheduled_jobs WHERE name = ?",
+                           (job.name,)).fetchone()
+        job.next_run_at = max(row['next_run_at'], row['lease_until'] or 0)
+        return False
+
+    def _execute(self, job: ScheduledJob, due_at: float) -> None:
+        started_at = time.time()
+        result, error = None, None
+        try:
+            result = job.func()
+        except Exception as e:
+            error = e
+            logger.error(f"Scheduled job {job.name} failed: {e}")
+        finished_at = time.time()
+        duration = finished_at - started_at
+
+        with self._lock:
+            job.runs += 1
+            job.last_duration = round(duration, 3)
+            job.max_duration = max(job.max_duration, duration)
+            job.total_duration += duration
+            job.last_lag = round(max(started_at - due_at, 0), 3)
+            job.max_lag = max(job.max_lag, job.last_lag)
+            job.last_error = str(error) if error else None
+            if error:
+                job.errors += 1
+                job.failures += 1
+            else:
+                job.failures = 0
+            job.next_run_at = finished_at + job.delay(result, error is not None)
+
+        try:
+            self._connect().execute(
+                "UPDATE scheduled_jobs SET next_run_at = ?, lease_owner = NULL, lease_until = NULL, "
+                "last_finished_at = ?, last_duration = ?, last_error = ? WHERE name = ? AND lease_owner = ?",
+                (job.next_run_at, finished_at, duration, job.last_error, job.name, self.owner)
+            )
+        except sqlite3.Error as e:
+            # The lease runs out on its own; the job just waits for it
+            logger.error(f"Could not release scheduled job {job.name}: {e}")
+        finally:
+            with self._lock:
+                self._running.discard(job.name)
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                self.run_pending()
+            except Exception as e:
+                logger.error(f"Scheduler pass failed: {e}")
+            with self._lock:
+                waiting = [job.next_run_at for job in self._jobs.values() if job.name not in self._running]
+            timeout = min([self.tick, *(due - time.time() for due in waiting)])
+            self._wakeup.wait(max(timeout, 0.05))
@@ -25,7 +25,7 @@ setup(
     ],
     entry_points={
         'console_scripts': [
-            'ib-interview=app:app.run',
+            'ib-interview=app:main',
         ],
     },
 ) 
\ No newline at end of file
@@ -0,0 +1,308 @@
+import asyncio
+import itertools
+import json
+import queue
+import threading
+import logging
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BOOKED = 'booked'
+RELEASED = 'released'
+RESYNC = 'resync'  # Tells a client to refetch /get_booked_slots instead of replaying events
+
+
+class SlotEventBroker:
+    """
+    In-process fan-out of slot changes to Server-Sent Event streams.
+
+    Every event gets an increasing id and the last history events are kept,
+    so a client that reconnects with Last-Event-ID is sent what it missed.
+    A client that fell further behind than the history is told to resync.
+
+    Attributes:
+        history (int): Events kept for replay
+    """
+
+    def __init__(self, history: int = 256):
+        self.history = history
+        self._events = deque(maxlen=history)
+        self._ids = itertools.count(1)
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def publish(self, kind: str, date: Optional[str] = None, time_slot: Optional[str] = None,
+                event_id: Optional[int] = None) -> Dict:
+        """Send an event to every listener; event_id, if given, must exceed every earlier one."""
+        with self._lock:
+            event = {'id': next(self._ids) if event_id is None else event_id,
+                     'type': kind, 'date': date, 'time': time_slot}
+            self._events.append(event)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"Slot event listener failed: {e}")
+        return event
+
+    def listen(self, listener: Callable[[Dict], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unlisten(self, listener: Callable[[Dict], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def since(self, last_event_id: Optional[str]) -> List[Dict]:
+        """Events after last_event_id, or a single resync event if some were already dropped."""
+        try:
+            last = int(last_event_id)
+        except (TypeError, ValueError):
+            return []
+        with self._lock:
+            if not self._events:
+                return []
+            if last < self._events[0]['id'] - 1:
+                return [{'id': self._events[-1]['id'], 'type': RESYNC, 'date': None, 'time': None}]
+            return [event for event in self._events if event['id'] > last]
+
+    def stream(self, last_event_id: Optional[str] = None, heartbeat: float = 15) -> Iterator[bytes]:
+        """
+        SSE byte stream for one client, ending when the consumer closes it.
+
+        Holds its caller's thread for the life of the connection; SlotStreamServer
+        serves many clients without that cost.
+        """
+        pending = queue.SimpleQueue()
+        self.listen(pending.put)
+        try:
+            yield format_event(None)
+            for event in self.since(last_event_id):
+                yield format_event(event)
+            while True:
+                try:
+                    yield format_event(pending.get(timeout=heartbeat))
+                except queue.Empty:
+                    yield b': ping\n\n'
+        finally:
+            self.unlisten(pending.put)
+
+
+class SlotEventRelay:
+    """
+    Feeds a SlotEventBroker from the slot event log shared by every worker.
+
+    Each worker records the slot changes it makes in the booking database
+    (BookingStore.record_slot_event), so a booking reaches open pages
+    whichever worker took it. The elected worker runs the relay, which tails
+    the log every poll_seconds and publishes each entry under its log id;
+    Last-Event-ID therefore stays valid when another worker takes over.
+    Several workers may log the same change as they each notice it, so an
+    event repeating the last one relayed for its slot is skipped.
+
+    Attributes:
+        store (BookingStore): Holder of the shared event log
+        broker (SlotEventBroker): Broker the events are published to
+        poll_seconds (float): Seconds between reads of the log
+    """
+
+    def __init__(self, store, broker: SlotEventBroker, poll_seconds: float = 0.5, batch_size: int = 500):
+        self.store = store
+        self.broker = broker
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self._last_id = 0
+        self._states = {}  # (date, time) -> last event type relayed
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        # Refill the broker's replay history first, so reconnecting clients catch up after a failover
+        self._last_id = max(self.store.last_slot_event_id() - self.broker.history, 0)
+        while self.run_once() == self.batch_size:
+            pass
+        self._thread = threading.Thread(target=self._run, name="slot-event-relay", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_once(self) -> int:
+        """Publish the log entries added since the last pass. Returns the number read."""
+        events = self.store.slot_events_after(self._last_id, self.batch_size)
+        for event in events:
+            self._last_id = event['id']
+            if event['type'] == RESYNC:
+                self._states.clear()
+            else:
+                slot = (event['date'], event['time'])
+                if self._states.get(slot) == event['type']:
+                    continue
+                self._states[slot] = event['type']
+            self.broker.publish(event['type'], event['date'], event['time'], event_id=event['id'])
+        return len(events)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                while self.run_once() == self.batch_size:
+                    pass
+            except Exception as e:
+                logger.warning(f"Could not read slot events: {e}")
+
+
+def format_event(event: Optional[Dict], retry_ms: int = 5000) -> bytes:
+    """Encode an event in SSE wire format; None gives the stream preamble."""
+    if event is None:
+        return f'retry: {retry_ms}\n\n'.encode('ascii')
+    data = json.dumps({'date': event['date'], 'time': event['time']})
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n".encode('utf-8')
+
+
+class SlotStreamServer:
+    """
+    Minimal asyncio HTTP server for /slots/stream.
+
+    Each connection is a coroutine and a socket buffer rather than a WSGI
+    thread, so thousands of idle browsers cost little. One broker listener
+    hands each event to the event loop, which writes it to every client.
+    Clients whose send buffer backs up past max_buffer are dropped; the
+    browser reconnects and catches up through Last-Event-ID.
+
+    Attributes:
+        broker (SlotEventBroker): Source of slot events
+        host (str): Interface to listen on
+        port (int): Port to listen on
+        allow_origin (str): Access-Control-Allow-Origin value, or None to omit it
+        heartbeat (float): Seconds between keep-alive comments
+        max_clients (int): Connections accepted before new ones are refused
+    """
+
+    PATH = '/slots/stream'
+
+    def __init__(self, broker: SlotEventBroker, host: str = '0.0.0.0', port: int = 5002,
+                 allow_origin: Optional[str] = '*', heartbeat: float = 15, max_clients: int = 10000,
+                 max_buffer: int = 64 * 1024):
+        self.broker = broker
+        self.host = host
+        self.port = port
+        self.allow_origin = allow_origin
+        self.heartbeat = heartbeat
+        self.max_clients = max_clients
+        self.max_buffer = max_buffer
+        self._clients = set()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="slot-stream", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        self.broker.listen(self._on_event)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self.broker.unlisten(self._on_event)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+            )
+        except Exception as e:
+            self._error = e
+            self._loop.close()
+            return
+        finally:
+            self._ready.set()
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Slot stream listening on {self.host}:{self.port}")
+        self._loop.create_task(self._heartbeat())
+        self._loop.run_forever()
+        self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        self._loop.close()
+
+    def _on_event(self, event: Dict) -> None:
+        # Called from whichever thread published the event
+        self._loop.call_soon_threadsafe(self._broadcast, format_event(event))
+
+    def _broadcast(self, payload: bytes) -> None:
+        for writer in list(self._clients):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self._drop(writer)
+            else:
+                writer.write(payload)
+
+    def _drop(self, writer: asyncio.StreamWriter) -> None:
+        self._clients.discard(writer)
+        writer.close()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            self._broadcast(b': ping\n\n')
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout=10)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            writer.close()
+            return
+
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if len(parts) < 2 or parts[0] != 'GET' or parts[1].split('?')[0] != self.PATH:
+            writer.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            writer.close()
+            return
+        if len(self._clients) >= self.max_clients:
+            writer.write(b'HTTP/1.1 503 Service Unavailable\r\nRetry-After: 30\r\n'
+                         b'Content-Length: 0\r\nConnection: close\r\n\r\n')
+            writer.close()
+            return
+
+        response = ['HTTP/1.1 200 OK', 'Content-Type: text/event-stream', 'Cache-Control: no-cache',
+                    'Connection: keep-alive', 'X-Accel-Buffering: no']
+        if self.allow_origin:
+            response.append(f'Access-Control-Allow-Origin: {self.allow_origin}')
+        writer.write(('\r\n'.join(response) + '\r\n\r\n').encode('latin-1'))
+        writer.write(format_event(None))
+        for event in self.broker.since(headers.get('last-event-id')):
+            writer.write(format_event(event))
+        self._clients.add(writer)
+
+        try:
+            # Clients never send anything else; reading only notices the disconnect
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self._drop(writer)
@@ -0,0 +1,157 @@
+from bisect import bisect_left
+from functools import lru_cache
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from typing import Optional, Dict, List, Iterable, Tuple
+
+SLOT_TIMEZONE = ZoneInfo('America/New_York')
+SLOT_TIME_FORMAT = "%I:%M %p ET"  # Format for "9:00 AM ET"
+DEFAULT_DURATION_MINUTES = 60  # Length assumed for bookings stored without an end time
+
+
+@lru_cache(maxsize=4096)
+def slot_starts_at(date_str: str, time_str: str) -> Optional[datetime]:
+    """
+    Convert a (date, time) slot key into an aware UTC datetime.
+
+    Results are cached: the same few hundred slot keys are parsed over and over.
+
+    Args:
+        date_str: Slot date (YYYY-MM-DD)
+        time_str: Slot time (HH:MM AM/PM ET)
+
+    Returns:
+        Optional[datetime]: Slot start in UTC, or None if the key can't be parsed
+    """
+    try:
+        day = datetime.strptime(date_str, '%Y-%m-%d').date()
+        clock = datetime.strptime(time_str, SLOT_TIME_FORMAT).time()
+    except (TypeError, ValueError):
+        return None
+    return datetime.combine(day, clock, tzinfo=SLOT_TIMEZONE).astimezone(timezone.utc)
+
+
+class IntervalIndex:
+    """
+    Booked intervals of one day, per interviewer.
+
+    Each interviewer's intervals are kept sorted by start, so checking a new
+    interval against them is two neighbour lookups by binary search instead
+    of a scan of the whole day.
+
+    Attributes:
+        capacity (int): Interviewers (seats 0..capacity-1) that can take bookings
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._starts = {}  # seat -> sorted interval starts
+        self._ends = {}    # seat -> interval ends, in the same order
+
+    def add(self, seat: int, start: datetime, end: datetime) -> None:
+        starts = self._starts.setdefault(seat, [])
+        ends = self._ends.setdefault(seat, [])
+        i = bisect_left(starts, start)
+        starts.insert(i, start)
+        ends.insert(i, end)
+
+    def is_free(self, seat: int, start: datetime, end: datetime) -> bool:
+        """True if [start, end) overlaps none of the seat's intervals."""
+        starts = self._starts.get(seat)
+        if not starts:
+            return True
+        i = bisect_left(starts, start)
+        # Intervals never overlap on one seat, so only the neighbours can collide
+        if i > 0 and self._ends[seat][i - 1] > start:
+            return False
+        return i == len(starts) or starts[i] >= end
+
+    def free_seat(self, start: datetime, end: datetime) -> Optional[int]:
+        """Lowest-numbered interviewer free for [start, end), or None if all are busy."""
+        for seat in range(self.capacity):
+            if self.is_free(seat, start, end):
+                return seat
+        return None
+
+    def free_seats(self, start: datetime, end: datetime) -> int:
+        return sum(1 for seat in range(self.capacity) if self.is_free(seat, start, end))
+
+
+class SlotModel:
+    """
+    The bookable slot grid.
+
+    Each bookable day offers the same start times. Every start time can be
+    booked by up to `capacity` candidates at once, one per interviewer. An
+    interview occupies its interviewer for its type's duration, so a long
+    interview can block that interviewer's next start time too.
+
+    Attributes:
+        time_slots (list): Start times offered each day (HH:MM AM/PM ET), in display order
+        capacity (int): Interviewers available per slot
+        durations (dict): Interview length in minutes per interview type
+        default_duration (int): Length of interview types missing from durations
+        blackout_dates (set): Dates (YYYY-MM-DD) with no interviews
+        horizon_days (int): Bookable weekdays offered, starting tomorrow
+    """
+
+    def __init__(self, time_slots: List[str], capacity: int = 1, durations: Optional[Dict[str, int]] = None,
+                 default_duration: int = DEFAULT_DURATION_MINUTES, blackout_dates: Iterable[str] = (),
+                 horizon_days: int = 5):
+        self.time_slots = list(time_slots)
+        self.capacity = capacity
+        self.durations = dict(durations or {})
+        self.default_duration = default_duration
+        self.blackout_dates = set(blackout_dates)
+        self.horizon_days = horizon_days
+
+    def duration(self, interview_type: Optional[str]) -> int:
+        return self.durations.get(interview_type, self.default_duration)
+
+    @property
+    def shortest_duration(self) -> int:
+        return min([self.default_duration, *self.durations.values()])
+
+    @property
+    def longest_duration(self) -> int:
+        return max([self.default_duration, *self.durations.values()])
+
+    def bookable_dates(self, today: Optional[date] = None) -> List[date]:
+        """The next horizon_days weekdays after today, skipping blackout dates."""
+        day = today or datetime.now(SLOT_TIMEZONE).date()
+        dates = []
+        # Bounded so a long blackout list can't loop forever
+        for _ in range(self.horizon_days * 7 + len(self.blackout_dates)):
+            if len(dates) >= self.horizon_days:
+                break
+            day += timedelta(days=1)
+            if day.weekday() < 5 and day.isoformat() not in self.blackout_dates:
+                dates.append(day)
+        return dates
+
+    def is_bookable(self, date_str: str, time_str: str, today: Optional[date] = None) -> bool:
+        """True if the slot can be booked now: an offered time on one of bookable_dates(), so never a past day."""
+        if time_str not in self.time_slots or slot_starts_at(date_str, time_str) is None:
+            return False
+        return date.fromisoformat(date_str) in self.bookable_dates(today)
+
+    def open_seats(self, date_str: str, intervals: IntervalIndex) -> Dict[str, int]:
+        """Interviewers still free at each start time of a day, for the shortest interview type."""
+        length = timedelta(minutes=self.shortest_duration)
+        seats = {}
+        for time_str in self.time_slots:
+            start = slot_starts_at(date_str, time_str)
+            seats[time_str] = intervals.free_seats(start, start + length) if start else 0
+        return seats
+
+
+def day_intervals(uses: Iterable[Tuple[int, Optional[str], Optional[str]]], capacity: int) -> IntervalIndex:
+    """Build a day's IntervalIndex from (interviewer, starts_at, ends_at) rows with ISO timestamps."""
+    intervals = IntervalIndex(capacity)
+    for seat, starts_at, ends_at in uses:
+        if not starts_at:
+            continue
+        start = datetime.fromisoformat(starts_at)
+        end = datetime.fromisoformat(ends_at) if ends_at else start + timedelta(minutes=DEFAULT_DURATION_MINUTES)
+        intervals.add(seat, start, end)
+    return intervals
@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The app's modules are top-level, and the tests share their checks with the benchmark scripts
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'benchmarks')]
@@ -0,0 +1,60 @@
+import smtplib
+from datetime import timedelta
+
+from campaigns import Campaign, CampaignEngine
+from mail_transport import RenderedMessage
+
+# Recipient -> error the server answers with; everyone else is delivered
+FAILURES = {
+    'bounced@example.com': smtplib.SMTPDataError(554, b'Message rejected'),
+    'greylisted@example.com': smtplib.SMTPDataError(451, b'Try again later'),
+    'unknown@example.com': smtplib.SMTPRecipientsRefused({'unknown@example.com': (550, b'No such user')}),
+}
+
+
+class SentLogStore:
+    """The campaign half of a BookingStore, in memory."""
+
+    def __init__(self, emails):
+        self.bookings = [(n, '2026-11-03', '2:00 PM ET', {'email': email}) for n, email in enumerate(emails)]
+        self.sent = set()
+
+    def campaign_due(self, campaign, field, after, until, limit=100):
+        return [row for row in self.bookings if (campaign, row[0]) not in self.sent][:limit]
+
+    def claim_sends(self, campaign, booking_ids):
+        claimed = [booking_id for booking_id in booking_ids if (campaign, booking_id) not in self.sent]
+        self.sent.update((campaign, booking_id) for booking_id in claimed)
+        return claimed
+
+    def release_sends(self, campaign, booking_ids):
+        self.sent.difference_update((campaign, booking_id) for booking_id in booking_ids)
+
+
+class ScriptedMail:
+    def __init__(self):
+        self.attempts = []
+
+    def send_many(self, messages):
+        self.attempts.extend(msg.recipient for msg in messages)
+        return [(msg, FAILURES[msg.recipient]) for msg in messages if msg.recipient in FAILURES]
+
+
+def render(recipient, date, time_slot, booking):
+    return RenderedMessage('noreply@example.com', recipient, 'Reminder', recipient.encode())
+
+
+def test_only_temporary_failures_are_retried():
+    store = SentLogStore(['ok@example.com', *FAILURES])
+    mail = ScriptedMail()
+    campaign = Campaign('reminder', 'starts_at', timedelta(0), timedelta(hours=24), render)
+    engine = CampaignEngine(store, mail, [campaign], per_minute=0)
+
+    engine.run_once()
+    assert engine.last_sent == {'reminder': 1}
+    assert sorted(mail.attempts) == sorted(['ok@example.com', *FAILURES])
+
+    # Bounces stay in the sent log; only the greylisted message goes out again
+    mail.attempts = []
+    engine.run_once()
+    assert mail.attempts == ['greylisted@example.com']
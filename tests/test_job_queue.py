@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+from job_queue import JobQueue, LeaseLostError, WorkerPool
+
+LEASE_SECONDS = 0.2
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / 'jobs.db'), lease_seconds=LEASE_SECONDS, backoff_base=10, backoff_max=40)
+
+
+def test_expired_lease_moves_to_the_next_claim(queue):
+    job_id = queue.enqueue('work', {})
+    first = queue.claim()
+    assert queue.claim() is None  # Still leased
+
+    time.sleep(LEASE_SECONDS * 1.5)
+    second = queue.claim()
+    assert second['id'] == job_id
+    assert second['attempts'] == first['attempts'] + 1
+
+    # The first worker's late results are refused; the job stays with the second
+    with pytest.raises(LeaseLostError):
+        queue.fail(job_id, first['attempts'], 'late failure')
+    with pytest.raises(LeaseLostError):
+        queue.complete(job_id, first['attempts'])
+    with pytest.raises(LeaseLostError):
+        queue._save_progress(job_id, first['attempts'], {'step': 'late'})
+    job = queue.get(job_id)
+    assert job['status'] == 'running'
+    assert job['progress'] == {}
+
+    queue.complete(job_id, second['attempts'])
+    assert queue.get(job_id)['status'] == 'succeeded'
+
+
+def test_missing_job_is_a_lost_lease(queue):
+    with pytest.raises(LeaseLostError):
+        queue.fail('no-such-job', 1, 'boom')
+
+
+def test_stale_worker_neither_fails_nor_gives_up(queue):
+    gave_up = []
+    job_id = queue.enqueue('work', {}, max_attempts=1)
+    stale = queue.claim()
+    time.sleep(LEASE_SECONDS * 1.5)
+    current = queue.claim()
+
+    def handler(job):
+        raise RuntimeError('boom')
+
+    pool = WorkerPool(queue, {'work': handler}, on_give_up={'work': lambda job, e: gave_up.append(e)})
+    pool.run_job(stale)
+    assert gave_up == []
+    assert queue.get(job_id)['status'] == 'running'
+
+    pool.run_job(current)
+    assert len(gave_up) == 1
+    assert queue.get(job_id)['status'] == 'failed'
+
+
+def test_backoff_until_max_attempts(queue):
+    job_id = queue.enqueue('work', {}, max_attempts=3)
+    for attempt in (1, 2):
+        job = queue.claim()
+        assert job['attempts'] == attempt
+        before = time.time()
+        assert queue.fail(job_id, attempt, f'failure {attempt}') is True
+
+        # Exponential backoff with jitter between half and all of the delay
+        delay = min(queue.backoff_max, queue.backoff_base * 2 ** (attempt - 1))
+        row = queue._connect().execute("SELECT status, run_after FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        assert row['status'] == 'queued'
+        assert before + delay * 0.5 <= row['run_after'] <= time.time() + delay
+        assert queue.claim() is None
+        queue._connect().execute("UPDATE jobs SET run_after = 0 WHERE id = ?", (job_id,))
+
+    job = queue.claim()
+    assert queue.fail(job_id, job['attempts'], 'final failure') is False
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts'], job['last_error']) == ('failed', 3, 'final failure')
+    assert queue.claim() is None
+
+
+def test_permanent_failure_skips_retries(queue):
+    job_id = queue.enqueue('work', {}, max_attempts=5)
+    job = queue.claim()
+    assert queue.fail(job_id, job['attempts'], 'bad input', permanent=True) is False
+    assert queue.get(job_id)['status'] == 'failed'
+
+
+def test_idempotency_key_dedup(queue):
+    first = queue.enqueue('work', {'n': 1}, idempotency_key='booking:abc')
+    assert queue.enqueue('work', {'n': 2}, idempotency_key='booking:abc') == first
+    job = queue.claim()
+    queue.complete(first, job['attempts'])
+
+    # A finished job keeps its key...
+    assert queue.enqueue('work', {'n': 3}, idempotency_key='booking:abc') == first
+    # ...unless the key only holds while the job is pending
+    pending = queue.enqueue('sweep', {}, idempotency_key='sweep', only_while_pending=True)
+    assert queue.enqueue('sweep', {}, idempotency_key='sweep', only_while_pending=True) == pending
+    job = queue.claim()
+    assert queue.enqueue('sweep', {}, idempotency_key='sweep', only_while_pending=True) == pending
+    queue.complete(pending, job['attempts'])
+    assert queue.enqueue('sweep', {}, idempotency_key='sweep', only_while_pending=True) != pending
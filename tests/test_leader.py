@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+from leader import LeaderElection, fcntl
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    return str(tmp_path / 'leader.lock')
+
+
+def failing_start():
+    raise RuntimeError('scheduler database unavailable')
+
+
+@pytest.mark.skipif(fcntl is None, reason="the lock is process-wide without fcntl")
+def test_failed_start_hands_the_lock_on(lock_path):
+    broken = LeaderElection(lock_path, failing_start, retry_seconds=60)
+    standby_started = threading.Event()
+    standby = LeaderElection(lock_path, standby_started.set, retry_seconds=60)
+    try:
+        assert broken._elect() is False
+        assert not broken.is_leader
+
+        assert standby._elect() is True
+        assert standby.is_leader and standby_started.is_set()
+        assert broken.try_acquire() is False
+    finally:
+        broken.stop()
+        standby.stop()
+
+
+def test_failed_start_is_retried(lock_path):
+    attempts = []
+    started = threading.Event()
+
+    def start_services():
+        attempts.append(1)
+        if len(attempts) == 1:
+            failing_start()
+        started.set()
+
+    election = LeaderElection(lock_path, start_services, retry_seconds=0.05)
+    try:
+        election.start()
+        assert started.wait(5)
+        assert election.is_leader and len(attempts) == 2
+    finally:
+        election.stop()
@@ -0,0 +1,49 @@
+import smtplib
+from contextlib import contextmanager
+
+from mail_transport import MailTransport, RenderedMessage
+
+
+class ScriptedPool:
+    """Pool whose sessions fail the sends listed in drops (0-based send attempts) with a disconnect."""
+
+    def __init__(self, drops):
+        self.drops = set(drops)
+        self.attempts = 0
+        self.sessions = 0
+        self.delivered = []
+
+    @contextmanager
+    def connection(self):
+        self.sessions += 1
+        yield self
+
+    def sendmail(self, sender, recipients, data):
+        attempt = self.attempts
+        self.attempts += 1
+        if attempt in self.drops:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.delivered.append(data)
+
+
+def messages(count):
+    return [RenderedMessage('noreply@example.com', f'c{n}@example.com', 'Reminder', f'message {n}'.encode())
+            for n in range(count)]
+
+
+def test_each_message_gets_its_own_reconnect():
+    # Messages 1 and 3 each lose their session once
+    pool = ScriptedPool(drops=[1, 4])
+    batch = messages(6)
+    assert MailTransport(pool).send_many(batch) == []
+    assert pool.delivered == [msg.data for msg in batch]
+    assert pool.sessions == 3
+
+
+def test_session_dropping_twice_in_a_row_fails_the_rest():
+    pool = ScriptedPool(drops=[2, 3])
+    batch = messages(5)
+    failed = MailTransport(pool).send_many(batch)
+    assert [msg for msg, _ in failed] == batch[2:]
+    assert all(isinstance(error, smtplib.SMTPServerDisconnected) for _, error in failed)
+    assert pool.delivered == [msg.data for msg in batch[:2]]
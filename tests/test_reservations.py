@@ -0,0 +1,83 @@
+import multiprocessing
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from booking_store import SQLiteBookingStore
+from config import INTERVIEW_DURATIONS, TIME_SLOTS
+from interview_system import InterviewSystem
+from slot_model import SlotModel
+
+CANDIDATES = 16
+PROCESSES = 4
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # InterviewSystem looks for the legacy bookings.json in the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def make_system(db_path: str, capacity: int = 1) -> InterviewSystem:
+    slot_model = SlotModel(TIME_SLOTS, capacity=capacity, durations=INTERVIEW_DURATIONS, horizon_days=2)
+    return InterviewSystem(store=SQLiteBookingStore(db_path), slot_model=slot_model)
+
+
+def open_slots(system: InterviewSystem):
+    return [(day.isoformat(), slot_time) for day in system.slot_model.bookable_dates()
+            for slot_time in system.slot_model.time_slots]
+
+
+def try_slots(system: InterviewSystem, candidate: int, slots) -> dict:
+    """Try to reserve every slot, in random order. Returns {slot: hold token} for the holds won."""
+    order = list(slots)
+    random.shuffle(order)
+    won = {}
+    for date, slot_time in order:
+        try:
+            won[(date, slot_time)] = system.reserve_slot(f"candidate{candidate}@example.com", date, slot_time,
+                                                         "Goldman Sachs", "Technology", "First Round")
+        except Exception as e:
+            if "already booked" not in str(e):
+                raise
+    return won
+
+
+def _process_candidate(args) -> dict:
+    db_path, candidate, slots = args
+    return try_slots(make_system(db_path), candidate, slots)
+
+
+def assert_one_winner_per_seat(system: InterviewSystem, results, slots, capacity: int) -> None:
+    wins = Counter(slot for won in results for slot in won)
+    assert {slot: wins[slot] for slot in slots} == {slot: capacity for slot in slots}
+
+    # Every winning hold survived the race: it confirms, and losers left nothing behind
+    for won in results:
+        for token in won.values():
+            system.confirm_slot(token, {'meeting_id': token})
+    assert Counter(system.store.booked_slots()) == Counter({slot: capacity for slot in slots})
+    seats = Counter((date, slot_time, booking['interviewer'])
+                    for date, slot_time, booking in system.store.iter_bookings())
+    assert set(seats.values()) == {1}
+
+
+@pytest.mark.parametrize('capacity', [1, 2])
+def test_threads_race_for_slots(workdir, capacity):
+    system = make_system(str(workdir / 'bookings.db'), capacity)
+    slots = open_slots(system)
+    with ThreadPoolExecutor(max_workers=CANDIDATES) as pool:
+        results = list(pool.map(lambda n: try_slots(system, n, slots), range(CANDIDATES)))
+    assert_one_winner_per_seat(system, results, slots, capacity)
+
+
+def test_processes_race_for_slots(workdir):
+    db_path = str(workdir / 'bookings.db')
+    system = make_system(db_path)
+    slots = open_slots(system)
+    with multiprocessing.Pool(PROCESSES) as pool:
+        results = pool.map(_process_candidate, [(db_path, n, slots) for n in range(PROCESSES)])
+    assert_one_winner_per_seat(system, results, slots, 1)
@@ -0,0 +1,58 @@
+import pytest
+
+from booking_store import SQLiteBookingStore
+from config import INTERVIEW_DURATIONS, TIME_SLOTS
+from interview_system import InterviewSystem
+from slot_events import BOOKED, RELEASED, SlotEventBroker, SlotEventRelay
+from slot_model import SlotModel
+
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    """Two interview systems sharing one database, like two gunicorn workers."""
+    monkeypatch.chdir(tmp_path)
+    db_path = str(tmp_path / 'bookings.db')
+    slot_model = SlotModel(TIME_SLOTS, capacity=1, durations=INTERVIEW_DURATIONS, horizon_days=2)
+    return [InterviewSystem(store=SQLiteBookingStore(db_path), slot_model=slot_model) for _ in range(2)]
+
+
+def first_slot(system: InterviewSystem):
+    return system.slot_model.bookable_dates()[0].isoformat(), system.slot_model.time_slots[0]
+
+
+def test_other_workers_changes_reach_the_leader(workers):
+    leader, worker = workers
+    relay = SlotEventRelay(leader.store, leader.slot_events)
+    received = []
+    leader.slot_events.listen(received.append)
+    date, slot_time = first_slot(worker)
+
+    token = worker.reserve_slot('a@example.com', date, slot_time, 'Goldman Sachs', 'Technology', 'First Round')
+    relay.run_once()
+    assert [(e['type'], e['date'], e['time']) for e in received] == [(BOOKED, date, slot_time)]
+
+    # The leader noticing the same booking on its own resync doesn't repeat the event
+    leader.availability.refresh()
+    relay.run_once()
+    assert len(received) == 1
+
+    # A hold released by a process that never loaded its date is still reported
+    leader.release_slot(token, date)
+    relay.run_once()
+    assert [(e['type'], e['date'], e['time']) for e in received[1:]] == [(RELEASED, date, slot_time)]
+    assert [e['id'] for e in received] == sorted({e['id'] for e in received})
+
+
+def test_new_leader_replays_recent_events(workers):
+    leader, worker = workers
+    date, slot_time = first_slot(worker)
+    worker.reserve_slot('a@example.com', date, slot_time, 'Goldman Sachs', 'Technology', 'First Round')
+    last_id = worker.store.last_slot_event_id()
+
+    broker = SlotEventBroker(history=16)
+    relay = SlotEventRelay(leader.store, broker, poll_seconds=60)
+    relay.start()
+    relay.stop()
+    # Ids come from the shared log, so a client's Last-Event-ID from the old leader still applies
+    assert [e['id'] for e in broker.since('0')] == [last_id]
+    assert broker.since(str(last_id)) == []
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from bench_startup import DEFERRED_MODULES, IMPORT_BUDGETS_MS, first_request, import_times
+
+RUNS = 3
+# Slow CI machines can stretch the budgets, as bench_startup.py --scale does
+SCALE = float(os.getenv('IMPORT_BUDGET_SCALE', 1))
+
+
+@pytest.fixture(scope='module')
+def best_import_times(tmp_path_factory):
+    """Best cumulative import time in ms per module over RUNS runs of `python -X importtime -c "import app"`."""
+    workdir = str(tmp_path_factory.mktemp('importtime'))
+    best = {}
+    for _ in range(RUNS):
+        for module, ms in import_times(workdir).items():
+            best[module] = min(ms, best.get(module, ms))
+    return best
+
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+def test_import_budget(best_import_times, module):
+    budget = IMPORT_BUDGETS_MS[module] * SCALE
+    assert best_import_times[module] <= budget, f"importing {module} took {best_import_times[module]:.1f}ms"
+
+
+@pytest.mark.parametrize('module', DEFERRED_MODULES)
+def test_import_app_defers(best_import_times, module):
+    assert module not in best_import_times, f"`import app` loads {module}"
+
+
+def test_first_request_defers_heavy_modules(tmp_path):
+    # Serving a page doesn't need PDF parsing, Zoom or IMAP either
+    run = first_request(str(tmp_path), serving=False)
+    assert run['status'] == 200
+    assert run['deferred_loaded'] == []
@@ -0,0 +1,281 @@
+import os
+import random
+import threading
+import time
+import logging
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from config import (ZOOM_USER_ID, ZOOM_API_BASE_URL, ZOOM_OAUTH_URL, ZOOM_TIMEOUT_SECONDS,
+                    ZOOM_MAX_RETRIES, ZOOM_POOL_SIZE, ZOOM_REQUESTS_PER_SECOND)
+
+logger = logging.getLogger(__name__)
+
+# Methods that are safe to repeat after a server error or an ambiguous timeout
+IDEMPOTENT_METHODS = {'GET', 'PUT', 'PATCH', 'DELETE'}
+
+
+class RateLimiter:
+    """Spaces calls evenly so no more than `rate` start per second (0 disables)."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + 1.0 / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+class CustomZoomClient:
+    """
+    Zoom REST API client built on a pooled requests.Session.
+
+    Requests reuse keep-alive connections, carry explicit timeouts and are
+    retried with jittered exponential backoff. Outgoing calls are paced by a
+    shared RateLimiter, and 429 responses are retried after
+    the server's Retry-After, and that pause applies to every thread sharing
+    the client. The OAuth token is refreshed under a lock so concurrent
+    callers trigger a single token request.
+
+    Attributes:
+        base_url (str): Zoom REST API root
+        oauth_url (str): Zoom OAuth token endpoint
+        session (requests.Session): Pooled HTTP session
+    """
+
+    def __init__(self, account_id, client_id, client_secret, base_url: str = ZOOM_API_BASE_URL,
+                 oauth_url: str = ZOOM_OAUTH_URL, timeout: float = ZOOM_TIMEOUT_SECONDS,
+                 max_retries: int = ZOOM_MAX_RETRIES, pool_size: int = ZOOM_POOL_SIZE,
+                 requests_per_second: float = ZOOM_REQUESTS_PER_SECOND, backoff_base: float = 0.5, backoff_max: float = 30.0):
+        self.account_id = account_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.secret_token = os.getenv('ZOOM_SECRET_TOKEN')
+        self.verification_token = os.getenv('ZOOM_VERIFICATION_TOKEN')
+        self.base_url = base_url
+        self.oauth_url = oauth_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.access_token = None
+        self.token_expiry = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._token_lock = threading.Lock()
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self._rate_limit_lock = threading.Lock()
+        self._blocked_until = 0.0
+
+    def _token_usable(self, rejected_token: Optional[str]) -> bool:
+        return (self.access_token is not None and self.access_token != rejected_token
+                and time.time() < self.token_expiry)
+
+    def _get_access_token(self, rejected_token: Optional[str] = None) -> str:
+        """
+        Return a valid OAuth token, fetching a new one if needed.
+
+        Args:
+            rejected_token: Token the API just refused with 401; forces a refresh
+                unless another thread has already replaced it
+        """
+        if self._token_usable(rejected_token):
+            return self.access_token
+
+        with self._token_lock:
+            # Another thread may have refreshed the token while we waited
+            if self._token_usable(rejected_token):
+                return self.access_token
+
+            logger.info("Getting new Zoom access token")
+            response = self._send(
+                'POST',
+                self.oauth_url,
+                operation='oauth_token',
+                headers={'Content-Type': 'application/x-www-form-urlencoded'},
+                params={'grant_type': 'account_credentials', 'account_id': self.account_id},
+                auth=(self.client_id, self.client_secret)
+            )
+            if not response.ok:
+                raise Exception(f"Failed to get access token: {response.text}")
+
+            token_data = response.json()
+            self.access_token = token_data['access_token']
+            self.token_expiry = time.time() + token_data['expires_in'] - 300
+            return self.access_token
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: spread concurrent retries across the whole window
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Seconds the server asked us to wait, from Retry-After or Zoom's rate-limit headers."""
+        value = response.headers.get('Retry-After')
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(value)
+                    return max(0.0, retry_at.astimezone(timezone.utc).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            return 1.0  # Zoom's per-second buckets refill within a second
+        return None
+
+    def _wait_for_rate_limit(self) -> None:
+        with self._rate_limit_lock:
+            delay = self._blocked_until - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _block_for(self, seconds: float) -> None:
+        with self._rate_limit_lock:
+            self._blocked_until = max(self._blocked_until, time.time() + seconds)
+
+    def _send(self, method: str, url: str, operation: str = 'request', **kwargs) -> requests.Response:
+        """
+        Send a request with timeouts, retrying transient failures.
+
+        The whole exchange, retries included, is timed as one Zoom call named
+        by operation; transport failures and a final 429 or 5xx count as errors.
+        """
+        with metrics.external_call('zoom', operation):
+            response = self._send_with_retries(method, url, **kwargs)
+        if response.status_code == 429 or response.status_code >= 500:
+            metrics.EXTERNAL_CALL_ERRORS.inc(service='zoom', operation=operation)
+        return response
+
+    def _send_with_retries(self, method: str, url: str, **kwargs) -> requests.Response:
+        idempotent = method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            self._wait_for_rate_limit()
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A POST that timed out may already have created the meeting, so only
+                # connection failures are retried for non-idempotent calls
+                retriable = idempotent or isinstance(e, requests.ConnectionError)
+                if not retriable or attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code == 429 or (response.status_code >= 500 and idempotent):
+                if attempt >= self.max_retries:
+                    return response
+                retry_after = self._retry_after(response)
+                if retry_after is not None and retry_after > self.backoff_max:
+                    # e.g. the daily quota: waiting it out would hang the caller
+                    return response
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                if response.status_code == 429:
+                    self._block_for(delay)
+                logger.warning(f"Zoom {method} {url} returned {response.status_code}; retrying in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            remaining = response.headers.get('X-RateLimit-Remaining')
+            if remaining == '0':
+                self._block_for(self._retry_after(response) or 1.0)
+            return response
+
+    def _api(self, method: str, path: str, operation: str, **kwargs) -> requests.Response:
+        """Call the Zoom API, refreshing the token once if it was rejected."""
+        token = self._get_access_token()
+        for _ in range(2):
+            headers = {
+                'Authorization': f'Bearer {token}',
+                'Content-Type': 'application/json'
+            }
+            response = self._send(method, f"{self.base_url}{path}", operation=operation, headers=headers, **kwargs)
+            if response.status_code != 401:
+                break
+            token = self._get_access_token(rejected_token=token)
+        return response
+
+    def create_meeting(self, start_time=None, duration: int = 60) -> Dict:
+        """Create a scheduled meeting lasting duration minutes."""
+        # Format start_time to UTC ISO format
+        if start_time:
+            start_time = start_time.astimezone(timezone.utc)
+
+        data = {
+            'topic': 'IB Interview Prep Session',
+            'type': 2,  # Scheduled meeting
+            'start_time': start_time.strftime('%Y-%m-%dT%H:%M:%SZ') if start_time else None,
+            'duration': duration,
+            'settings': {
+                'host_video': True,
+                'participant_video': True,
+                'join_before_host': False,
+                'mute_upon_entry': True,
+                'waiting_room': True,
+                'auto_recording': 'none',
+                'use_pmi': False,
+                'timezone': 'America/New_York'
+            }
+        }
+
+        try:
+            response = self._api('POST', f"/users/{ZOOM_USER_ID}/meetings", 'create_meeting', json=data)
+
+            if response.ok:
+                meeting_data = response.json()
+                return {
+                    'url': meeting_data.get('join_url'),
+                    'meeting_id': str(meeting_data.get('id')),
+                    'password': meeting_data.get('password', '')
+                }
+            else:
+                logger.error(f"Zoom API Error Response: {response.text}")
+                raise Exception(f"Failed to create meeting: {response.text}")
+        except Exception as e:
+            logger.error(f"Error in create_meeting: {e}")
+            raise
+
+    def update_meeting(self, meeting_id, start_time, duration: Optional[int] = None) -> None:
+        """Move an existing meeting to a new start time, and to a new length in minutes if given."""
+        data = {'start_time': start_time.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}
+        if duration is not None:
+            data['duration'] = duration
+        response = self._api('PATCH', f"/meetings/{meeting_id}", 'update_meeting', json=data)
+        if not response.ok:
+            logger.error(f"Zoom API Error Response: {response.text}")
+            raise Exception(f"Failed to update meeting: {response.text}")
+
+    def delete_meeting(self, meeting_id):
+        try:
+            response = self._api('DELETE', f"/meetings/{meeting_id}", 'delete_meeting')
+
+            if response.status_code == 404:
+                logger.info(f"Zoom meeting {meeting_id} was already deleted")
+                return
+            if not response.ok:
+                raise Exception(f"Failed to delete meeting: {response.text}")
+        except Exception as e:
+            logger.error(f"Error in delete_meeting: {e}")
+            raise